@@ -0,0 +1,335 @@
+"""
+Administrative commands for maintaining the database of the bot.
+
+Run ``python admin.py --help`` for a list of commands.
+"""
+
+import asyncio
+import gzip
+import io
+import json
+import os
+import struct
+
+import click
+
+import senko
+
+# The first bytes of an export file.
+MAGIC = b"SENKODB1"
+
+# Frame header: payload length, last key of the chunk, number of rows.
+FRAME = struct.Struct("<IqI")
+
+# The key before the first key of a table.
+FIRST_KEY = -(2**63)
+
+
+def write_frame(file, payload, last=0, rows=0):
+    """
+    Append a frame to an export file as a separate gzip member.
+
+    Every frame is compressed as its own gzip member, so a file can be
+    truncated after any frame and still be read.
+
+    Parameters
+    ----------
+    file: io.BufferedIOBase
+        The file to write to, opened in binary append mode.
+    payload: bytes
+        The data of the frame.
+    last: Optional[int]
+        The last key of the rows in the frame.
+    rows: Optional[int]
+        The number of rows in the frame.
+
+    Returns
+    -------
+    int
+        The position of the file after the frame.
+    """
+    file.write(gzip.compress(FRAME.pack(len(payload), last, rows) + payload, 6))
+    file.flush()
+    os.fsync(file.fileno())
+    return file.tell()
+
+
+def read_frames(file):
+    """
+    Read the frames of an export file.
+
+    Parameters
+    ----------
+    file: gzip.GzipFile
+        The decompressed file to read from.
+
+    Yields
+    ------
+    Tuple[int, int, int, bytes]
+        The position of the decompressed file after the frame, the last key,
+        the number of rows and the payload of each frame.
+
+    Raises
+    ------
+    click.ClickException
+        When the file ends within a frame.
+    """
+    while True:
+        header = file.read(FRAME.size)
+        if not header:
+            return
+        if len(header) < FRAME.size:
+            raise click.ClickException("Export file ends within a frame header!")
+
+        length, last, rows = FRAME.unpack(header)
+        payload = file.read(length)
+        if len(payload) < length:
+            raise click.ClickException("Export file ends within a frame!")
+
+        yield file.tell(), last, rows, payload
+
+
+def load_state(path):
+    """
+    Load the progress of an interrupted export or import.
+
+    Parameters
+    ----------
+    path: str
+        The path of the state file.
+
+    Returns
+    -------
+    Optional[Dict[str, Any]]
+        The saved state, or ``None`` if there is none.
+    """
+    try:
+        with open(path, "r") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+
+
+def save_state(path, **state):
+    r"""
+    Atomically save the progress of an export or import.
+
+    Parameters
+    ----------
+    path: str
+        The path of the state file.
+    \*\*state
+        The state to save.
+    """
+    temp = f"{path}.tmp"
+    with open(temp, "w") as file:
+        json.dump(state, file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp, path)
+
+
+async def connect():
+    """
+    Create a database connection pool from the configuration.
+    """
+    import config
+
+    # Exports and imports only use the primary.
+    options = dict(getattr(config, "database_pool", None) or ())
+    options.pop("replicas", None)
+    return await senko.init_db(**config.database_credentials, **options)
+
+
+async def get_columns(conn, table):
+    """
+    Get the column names of a table in their order.
+    """
+    query = """
+    SELECT "column_name" FROM "information_schema"."columns"
+    WHERE "table_name"=$1 ORDER BY "ordinal_position";
+    """
+    return [row[0] for row in await conn.fetch(query, table)]
+
+
+async def export_table(path, table, key, chunk_size, resume):
+    """
+    Export a table to a file in chunks of binary ``COPY`` data.
+    """
+    state_path = f"{path}.export-state"
+    state = load_state(state_path) if resume else None
+
+    pool = await connect()
+    try:
+        async with pool.acquire() as conn:
+            columns = await get_columns(conn, table)
+            if not columns:
+                raise click.ClickException(f"Table {table!r} does not exist!")
+
+            if state is None:
+                with open(path, "wb") as file:
+                    header = json.dumps(dict(table=table, key=key, columns=columns))
+                    offset = write_frame(file, MAGIC + header.encode("utf-8"))
+                last, total = FIRST_KEY, 0
+            else:
+                offset, last, total = state["offset"], state["last"], state["rows"]
+                click.echo(f"Resuming after {total} row(s).")
+
+            names = ", ".join(f'"{column}"' for column in columns)
+            bounds = f"""
+            SELECT MAX("{key}") FROM (
+                SELECT "{key}" FROM "{table}"
+                WHERE "{key}">$1
+                ORDER BY "{key}" LIMIT $2
+            ) AS "chunk";
+            """
+
+            with open(path, "r+b") as file:
+                # Drop everything written after the last completed chunk.
+                file.truncate(offset)
+                file.seek(offset)
+
+                while True:
+                    upper = await conn.fetchval(bounds, last, chunk_size)
+                    if upper is None:
+                        break
+
+                    buffer = io.BytesIO()
+                    query = f"""
+                    SELECT {names} FROM "{table}"
+                    WHERE "{key}">$1 AND "{key}"<=$2
+                    """
+                    status = await conn.copy_from_query(
+                        query, last, upper, output=buffer, format="binary"
+                    )
+                    rows = int(status.split()[-1])
+
+                    offset = write_frame(file, buffer.getvalue(), upper, rows)
+                    last, total = upper, total + rows
+                    save_state(state_path, offset=offset, last=last, rows=total)
+                    click.echo(f"Exported {total} row(s).")
+    finally:
+        await pool.close()
+
+    if os.path.exists(state_path):
+        os.remove(state_path)
+    click.echo(f"Export of {total} row(s) complete.")
+
+
+async def import_table(path, table, merge, resume):
+    """
+    Import a table from an export file through a staging table.
+    """
+    state_path = f"{path}.import-state"
+    state = load_state(state_path) if resume else None
+
+    pool = await connect()
+    try:
+        async with pool.acquire() as conn:
+            with gzip.open(path, "rb") as file:
+                frames = read_frames(file)
+                try:
+                    _, _, _, header = next(frames)
+                except StopIteration:
+                    header = b""
+                if not header.startswith(MAGIC):
+                    raise click.ClickException("Not an export file!")
+
+                header = json.loads(header[len(MAGIC) :].decode("utf-8"))
+                table = table or header["table"]
+                key, columns = header["key"], header["columns"]
+
+                total = 0
+                if state is not None:
+                    file.seek(state["offset"])
+                    total = state["rows"]
+                    click.echo(f"Resuming after {total} row(s).")
+
+                staging = f"{table}_staging"
+                names = ", ".join(f'"{column}"' for column in columns)
+                if merge:
+                    updates = ", ".join(
+                        f'"{column}"=EXCLUDED."{column}"'
+                        for column in columns
+                        if column != key
+                    )
+                    conflict = f'ON CONFLICT ("{key}") DO UPDATE SET {updates}'
+                else:
+                    conflict = f'ON CONFLICT ("{key}") DO NOTHING'
+
+                await conn.execute(f"""
+                    CREATE TEMPORARY TABLE IF NOT EXISTS "{staging}"
+                    (LIKE "{table}" INCLUDING DEFAULTS) ON COMMIT DELETE ROWS;
+                    """)
+
+                for offset, _, rows, payload in read_frames(file):
+                    async with conn.transaction():
+                        await conn.copy_to_table(
+                            staging,
+                            source=io.BytesIO(payload),
+                            columns=columns,
+                            format="binary",
+                        )
+                        await conn.execute(f"""
+                            INSERT INTO "{table}" ({names})
+                            SELECT {names} FROM "{staging}" {conflict};
+                            """)
+
+                    total += rows
+                    save_state(state_path, offset=offset, rows=total)
+                    click.echo(f"Imported {total} row(s).")
+    finally:
+        await pool.close()
+
+    if os.path.exists(state_path):
+        os.remove(state_path)
+    click.echo(f"Import of {total} row(s) complete.")
+
+
+@click.group()
+def cli():
+    """
+    Administrative commands for Senko.
+    """
+
+
+@cli.command("export")
+@click.argument("path", type=click.Path(dir_okay=False))
+@click.option(
+    "--table", default="guild_settings", show_default=True, help="The table to export."
+)
+@click.option(
+    "--key", default="guild", show_default=True, help="The BIGINT primary key column."
+)
+@click.option("--chunk-size", default=50000, show_default=True, help="Rows per chunk.")
+@click.option("--resume", is_flag=True, help="Continue an interrupted export.")
+def export_command(path, table, key, chunk_size, resume):
+    """
+    Export a table to a compressed file.
+    """
+    asyncio.run(export_table(path, table, key, chunk_size, resume))
+
+
+@cli.command("import")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--table",
+    default=None,
+    help="The table to import into. Defaults to the exported table.",
+)
+@click.option(
+    "--merge/--skip-existing",
+    default=True,
+    show_default=True,
+    help="Whether to overwrite existing rows or keep them.",
+)
+@click.option("--resume", is_flag=True, help="Continue an interrupted import.")
+def import_command(path, table, merge, resume):
+    """
+    Import a table from a compressed file.
+    """
+    asyncio.run(import_table(path, table, merge, resume))
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,58 @@
+"""
+Benchmark for the key functions of :mod:`utils.caching`.
+
+Compares the cost of building a key and looking it up in a dictionary with
+:func:`utils.caching.hash_key` and :func:`utils.caching.make_key` for common
+argument combinations.
+
+Usage: ``python benchmarks/bench_cache_keys.py``
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import senko  # noqa: E402,F401 (utils must be imported through senko)
+from utils.caching import hash_key, make_key, normalized_key  # noqa: E402
+
+NUMBER = 500_000
+
+
+class Instance:
+    pass
+
+
+CASES = dict(
+    single=((123456789,), {}),
+    method=((Instance(), 123456789), {}),
+    three=((1, "two", 3.0), {}),
+    kwargs=((1,), dict(b=2, a=1)),
+)
+
+
+def bench(key, args, kwargs):
+    data = {key(*args, **kwargs): None}
+
+    def run():
+        data.get(key(*args, **kwargs))
+
+    return min(timeit.repeat(run, number=NUMBER, repeat=3)) / NUMBER
+
+
+def main():
+    print(
+        f"{'case':>8} {'hash_key (ns)':>14} {'make_key (ns)':>14} {'normalized (ns)':>16}"
+    )
+    for name, (args, kwargs) in CASES.items():
+        old = bench(hash_key, args, kwargs)
+        new = bench(make_key, args, kwargs)
+        normalized = bench(normalized_key, args, kwargs)
+        print(
+            f"{name:>8} {old * 1e9:>14.0f} {new * 1e9:>14.0f} {normalized * 1e9:>16.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Trace-driven hit ratio comparison of :class:`utils.caching.LRUCache` and
+:class:`utils.caching.TinyLFUCache`.
+
+Replays synthetic access traces through each cache, fetching and adding
+missing keys like :meth:`cogs.settings.SettingsCog.get_guild_settings` does:
+
+* ``zipf``: keys drawn from a Zipf distribution, where few guilds make up
+  most of the traffic.
+* ``scan``: the same Zipf traffic, interrupted by bursts of one-off keys,
+  such as a raid or a burst of commands from many small guilds.
+
+Usage: ``python benchmarks/bench_hit_ratio.py [--accesses 200000]``
+"""
+
+import argparse
+import itertools
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import senko  # noqa: E402,F401 (utils must be imported through senko)
+from utils.caching import LRUCache, TinyLFUCache  # noqa: E402
+
+KEYS = 50_000
+
+
+def zipf_trace(accesses, skew, rng):
+    weights = [1 / (rank**skew) for rank in range(1, KEYS + 1)]
+    cumulative = list(itertools.accumulate(weights))
+    return rng.choices(range(KEYS), cum_weights=cumulative, k=accesses)
+
+
+def scan_trace(accesses, skew, rng):
+    trace = zipf_trace(accesses, skew, rng)
+    unique = itertools.count(KEYS)
+    result = []
+
+    # Every 10000 accesses, 2000 one-off keys are requested.
+    for i in range(0, len(trace), 10_000):
+        result.extend(trace[i : i + 10_000])
+        result.extend(next(unique) for _ in range(2_000))
+
+    return result
+
+
+def replay(cache, trace):
+    hits = 0
+    for key in trace:
+        if cache.get(key) is not None:
+            hits += 1
+        else:
+            cache.put(key, key)
+
+    return hits / len(trace)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--accesses", type=int, default=200_000, help="accesses per trace"
+    )
+    parser.add_argument("--skew", type=float, default=0.9, help="zipf skew")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    traces = dict(
+        zipf=zipf_trace(args.accesses, args.skew, rng),
+        scan=scan_trace(args.accesses, args.skew, rng),
+    )
+
+    print(f"{'trace':>6} {'size':>6} {'LRU':>8} {'TinyLFU':>8}")
+    for name, trace in traces.items():
+        for size in (128, 512, 2048):
+            lru = replay(LRUCache(size), trace)
+            tinylfu = replay(TinyLFUCache(size), trace)
+            print(f"{name:>6} {size:>6} {lru:>8.2%} {tinylfu:>8.2%}")
+
+
+if __name__ == "__main__":
+    main()
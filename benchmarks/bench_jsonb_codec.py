@@ -0,0 +1,96 @@
+"""
+Benchmark for :class:`senko.db.JSONCodec`.
+
+Measures the average time to encode and decode ``JSONB`` values of increasing
+size with each available serializer, compared to the former text codec that
+used :func:`json.dumps` and :func:`json.loads`. Payloads range from a small
+settings document to a large document with thousands of nested records.
+
+Usage: ``python benchmarks/bench_jsonb_codec.py [--repeat 5]``
+"""
+
+import argparse
+import json
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from senko import db  # noqa: E402
+
+# Number of records per payload, from a settings document to a large export.
+SIZES = (1, 10, 100, 1_000, 10_000)
+
+
+def make_record(rng):
+    name = "".join(rng.choices(string.ascii_letters, k=12))
+    return dict(
+        id=rng.getrandbits(63),
+        name=name,
+        enabled=rng.random() < 0.5,
+        score=rng.random() * 100,
+        tags=[rng.choice(("admin", "mod", "member", "bot")) for _ in range(3)],
+        options=dict(prefix="sen!", locale="en_GB", timezone="Europe/Berlin"),
+    )
+
+
+def make_payload(records, seed=0):
+    rng = random.Random(seed)
+    return dict(version=1, records=[make_record(rng) for _ in range(records)])
+
+
+def timeit(function, value, size, repeat):
+    # Run often enough for small payloads to be measurable.
+    number = max(1, 2_000 // max(1, size // 1_000))
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function(value)
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def bench(payload, repeat):
+    results = dict()
+
+    text = json.dumps(payload)
+    size = len(text)
+    results["text/json"] = (
+        timeit(json.dumps, payload, size, repeat),
+        timeit(json.loads, text, size, repeat),
+    )
+
+    for name in db.SERIALIZERS:
+        codec = db.JSONCodec(name)
+        data = codec.encode(payload)
+        results[f"binary/{name}"] = (
+            timeit(codec.encode, payload, size, repeat),
+            timeit(codec.decode, data, size, repeat),
+        )
+
+    return size, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="repetitions per measurement"
+    )
+    args = parser.parse_args()
+
+    if "orjson" not in db.SERIALIZERS:
+        print("orjson is not installed, only the json serializer is measured.\n")
+
+    print(f"{'size':>10} {'codec':>14} {'encode (us)':>12} {'decode (us)':>12}")
+    for records in SIZES:
+        size, results = bench(make_payload(records), args.repeat)
+        for codec, (encode, decode) in results.items():
+            print(f"{size:>10} {codec:>14} {encode * 1e6:>12.1f} {decode * 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
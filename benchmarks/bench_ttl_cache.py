@@ -0,0 +1,73 @@
+"""
+Benchmark for :class:`utils.caching.TTLCache`.
+
+Measures the average latency of ``get``, ``put`` and ``cache[key]`` for caches
+of increasing size. With expiry bound to stale items only, per-operation
+latency should stay flat from small to very large caches.
+
+Usage: ``python benchmarks/bench_ttl_cache.py [--max 1000000]``
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import senko  # noqa: E402,F401 (utils must be imported through senko)
+from utils.caching import TTLCache  # noqa: E402
+
+OPERATIONS = 100_000
+
+
+def bench(size):
+    cache = TTLCache(size, ttl=3600)
+    for i in range(size):
+        cache.put(i, i)
+
+    keys = [random.randrange(size) for _ in range(OPERATIONS)]
+
+    start = time.perf_counter()
+    for k in keys:
+        cache.get(k)
+    get = (time.perf_counter() - start) / OPERATIONS
+
+    start = time.perf_counter()
+    for k in keys:
+        cache[k]  # pylint: disable=pointless-statement
+    getitem = (time.perf_counter() - start) / OPERATIONS
+
+    start = time.perf_counter()
+    for k in keys:
+        cache.put(k, k)
+    put = (time.perf_counter() - start) / OPERATIONS
+
+    return get, getitem, put
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--max", type=int, default=1_000_000, help="largest cache size")
+    args = parser.parse_args()
+
+    sizes = []
+    size = 64
+    while size <= args.max:
+        sizes.append(size)
+        size *= 4
+
+    if sizes[-1] != args.max:
+        sizes.append(args.max)
+
+    print(f"{'size':>10} {'get (ns)':>10} {'[] (ns)':>10} {'put (ns)':>10}")
+    for size in sizes:
+        get, getitem, put = bench(size)
+        print(
+            f"{size:>10} {get * 1e9:>10.0f} {getitem * 1e9:>10.0f} {put * 1e9:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,13 @@
 from .cog import SettingsCog
 from .errors import BadSetting, UnknownSetting
 from .guild import GuildSettings
+from .user import UserSettings
+from .channel import ChannelSettings
+from .model import Field, SettingsModel, SettingsLoader
+from .store import GuildSettingsStore
+from .shared import SharedSettingsTable
+from .writer import SettingsWriter
+from .sync import SettingsSync
 
 
 def setup(bot):
@@ -0,0 +1,20 @@
+from .model import Field, SettingsModel, validate_length
+
+
+class ChannelSettings(SettingsModel):
+    """
+    A database model that represents the settings for a channel.
+
+    Unset settings are ``None``, in which case the settings of the
+    guild apply.
+
+    You should not create this yourself and instead get instances of
+    this class through :meth:`~cogs.settings.SettingsCog.get_channel_settings`.
+    """
+
+    __slots__ = ()
+    __table__ = "channel_settings"
+    __key__ = "channel"
+
+    #: Optional[str]: The ID of the channel's locale.
+    locale = Field("TEXT", validator=validate_length(16))
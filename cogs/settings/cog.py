@@ -1,26 +1,272 @@
+import asyncio
+import datetime
+
 import senko
 import utils
 
 from .guild import GuildSettings
+from .user import UserSettings
+from .channel import ChannelSettings
+from .model import SettingsLoader, fetch_records
+from .store import GuildSettingsStore
+from .shared import SharedSettingsTable
+from .writer import SettingsWriter
+from .sync import SettingsSync
 
 
 class SettingsCog(senko.Cog, name="settings"):
     """
     Implements an interface to get and modify settings.
+
+    When a shard becomes ready, the settings of its guilds are loaded in
+    bulk, so the first message of each guild after a restart does not
+    have to wait for the database.
+
+    The prefix, locale and timezone of every known guild are kept in a
+    compact :class:`~cogs.settings.GuildSettingsStore`, which serves
+    :meth:`get_guild_options`. Full :class:`~.GuildSettings` objects are
+    only cached for recently used guilds.
+
+    When :data:`config.settings_write_behind` is set, ``last_joined``
+    stamps and deferred updates are written in batches by a
+    :class:`~cogs.settings.SettingsWriter`, available as :attr:`writer`.
+
+    When :data:`config.settings_sync` is enabled, settings updates are
+    announced to other bot processes and cached settings are kept in sync
+    by a :class:`~cogs.settings.SettingsSync`, available as :attr:`sync`.
+
+    When :data:`config.settings_shared_memory` is set, the settings store
+    is backed by a :class:`~cogs.settings.SharedSettingsTable` that is
+    shared by all bot processes on the host, available as :attr:`shared`.
+
+    When :data:`config.settings_retention` is set, the settings of guilds
+    that the bot left longer ago than the retention window are deleted or
+    archived in the background, see :meth:`prune_guild_settings`.
+
+    User and channel settings are declarative models, loaded through the
+    :class:`~cogs.settings.SettingsLoader` instances :attr:`user_settings`
+    and :attr:`channel_settings`. :meth:`get_options` resolves the settings
+    of all scopes that apply to a message with at most one query.
     """
 
+    #: The maximum number of guilds to load settings for in one query.
+    WARM_UP_CHUNK_SIZE = 1000
+
     def __init__(self, bot):
         super().__init__(bot)
 
+        # IDs of shards for which guild settings were loaded.
+        self._warmed_shards = set()
+
+        # Raw settings of every known guild, optionally backed by a
+        # settings table in shared memory.
+        self.shared = None
+        options = getattr(bot.config, "settings_shared_memory", None)
+        if options is not None:
+            try:
+                self.shared = SharedSettingsTable(**options)
+            except Exception as exc:
+                self.log.exception("Could not attach shared settings table!", exc_info=exc)
+
+        self.guild_store = GuildSettingsStore(self.shared)
+
         # Caches
-        self.guild_cache = utils.caching.LRUCache(512)
+        self.guild_cache = utils.caching.TinyLFUCache(512, name="settings.guild", stats=True)
+
+        # Loaders for declarative settings models.
+        self.user_settings = SettingsLoader(bot, UserSettings, name="settings.user")
+        self.channel_settings = SettingsLoader(bot, ChannelSettings, name="settings.channel")
+
+        # Write-behind queue, if enabled.
+        options = getattr(bot.config, "settings_write_behind", None)
+        self.writer = None if options is None else SettingsWriter(bot, **options)
+
+        # Cross-process cache invalidation, if enabled.
+        self.sync = None
+        if getattr(bot.config, "settings_sync", False):
+            self.sync = SettingsSync(self)
+            self.sync.start()
+            if self.writer is not None:
+                self.writer.sync = self.sync
+
+        # Whether close() was called.
+        self._closed = False
+
+        # Pruning of settings of departed guilds, if enabled.
+        self._prune_task = None
+        options = getattr(bot.config, "settings_retention", None)
+        if options is not None:
+            self._prune_task = bot.loop.create_task(self._prune_loop(**options))
+
+    def cog_unload(self):
+        if not self._closed:
+            self.bot.loop.create_task(self.close())
+
+    async def close(self):
+        """
+        Stop listening for settings notifications, write all queued
+        updates of the write-behind queue, if enabled, and detach from the
+        shared settings table.
+
+        This is called by :meth:`senko.Senko.close` before the database
+        connection pool is closed, and when the cog is unloaded. Calls after
+        the first have no effect.
+        """
+        if self._closed:
+            return
+        self._closed = True
+
+        if self._prune_task is not None:
+            self._prune_task.cancel()
+            self._prune_task = None
+
+        if self.sync is not None:
+            await self.sync.stop()
+
+        if self.writer is not None:
+            await self.writer.close()
+
+        if self.shared is not None:
+            self.guild_store.detach()
+            self.shared.close()
+            self.shared = None
+
+    @senko.Cog.listener()
+    async def on_shard_ready(self, shard_id):
+        guilds = [guild for guild in self.bot.guilds if guild.shard_id == shard_id]
+        self._warmed_shards.add(shard_id)
+        await self._warm_up(guilds, f"shard {shard_id}")
+
+    @senko.Cog.listener()
+    async def on_ready(self):
+        # Load guild settings for shards whose ready event was missed, for
+        # example because the cog was loaded after the shard became ready.
+        guilds = [
+            guild
+            for guild in self.bot.guilds
+            if guild.shard_id not in self._warmed_shards
+        ]
+        self._warmed_shards.update(guild.shard_id for guild in guilds)
+        await self._warm_up(guilds, "remaining shards")
+
+    async def _warm_up(self, guilds, origin, refresh=False):
+        """
+        Load the settings for guilds and log the outcome.
+        """
+        if not guilds:
+            return
+
+        try:
+            count = await self.load_guild_settings(guilds, refresh=refresh)
+        except Exception as exc:
+            self.log.exception(f"Could not load guild settings for {origin}!", exc_info=exc)
+        else:
+            self.log.info(f"Loaded settings for {count} guild(s) of {origin}.")
 
     @senko.Cog.listener()
     async def on_guild_join(self, guild):
         # When joining a guild for the first time create a new default
         # configuration. If a configuration already exists, update the
         # last_joined timestamp instead.
-        await self._init_guild_settings(guild)
+        if self.writer is None:
+            await self._init_guild_settings(guild)
+            return
+
+        # Queue the stamp instead, so join bursts are written in batches.
+        # Unknown guilds receive default settings when first requested.
+        self.writer.join(guild.id)
+        settings = self.guild_cache.get(guild.id)
+        if settings is not None:
+            settings._update(last_joined=self.writer.get(guild.id)["last_joined"])
+
+    @senko.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self._evict_guild_settings(guild.id)
+
+        # Remember when the guild was left, so its settings can be pruned.
+        now = datetime.datetime.now(datetime.timezone.utc)
+        if self.writer is not None:
+            self.writer.update(guild.id, last_left=now)
+        else:
+            query = 'UPDATE "guild_settings" SET "last_left"=$2 WHERE "guild"=$1;'
+            await self.bot.db.execute(query, guild.id, now)
+            utils.db.pin_reads(self.bot.db, guild.id)
+
+    def _evict_guild_settings(self, guild_id):
+        """
+        Drop the cached settings of a guild and every cached value
+        derived from the guild.
+
+        Parameters
+        ----------
+        guild_id: int
+            The ID of the guild.
+        """
+        utils.caching.invalidate_tag(f"guild:{guild_id}")
+        self.guild_store.discard(guild_id)
+
+    def _apply_guild_settings(self, guild_id, fields):
+        """
+        Apply changed settings of a guild to the cached settings.
+
+        Parameters
+        ----------
+        guild_id: int
+            The ID of the guild.
+        fields: Dict[str, Any]
+            The changed fields and their new values.
+
+        Raises
+        ------
+        TypeError
+            When an unexpected field is provided.
+        """
+        # The guild was written by another process.
+        utils.db.pin_reads(self.bot.db, guild_id)
+
+        if guild_id in self.guild_cache:
+            # Also updates the settings store.
+            self.guild_cache[guild_id]._update(**fields)
+            return
+
+        values = self.guild_store.get(guild_id)
+        if values is not None:
+            prefix, locale, timezone = values
+            self.guild_store.put(
+                guild_id,
+                fields.get("prefix", prefix),
+                fields.get("locale", locale),
+                fields.get("timezone", timezone),
+            )
+
+    async def _reload_guild_settings(self):
+        """
+        Drop all cached guild settings and load them again.
+
+        The settings store keeps serving the previous values until
+        they are replaced.
+        """
+        self.guild_cache.clear()
+        await self._warm_up(self.bot.guilds, "all shards", refresh=True)
+
+    def _get_row_values(self, row):
+        """
+        Get the values of a database record with queued updates applied.
+
+        Parameters
+        ----------
+        row: asyncpg.Record
+            The database record of a guild's settings.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The up to date values by column name.
+        """
+        values = dict(row)
+        if self.writer is not None:
+            values.update(self.writer.get(row["guild"]))
+        return values
 
     def _build_guild_settings(self, guild, row):
         """
@@ -38,9 +284,14 @@ class SettingsCog(senko.Cog, name="settings"):
         ~.GuildSettings
             The guild settings object.
         """
+        row = self._get_row_values(row)
+        self.guild_store.put(guild.id, row["prefix"], row["locale"], row["timezone"])
         return GuildSettings(
             self.bot,
             guild,
+            store=self.guild_store,
+            writer=self.writer,
+            sync=self.sync,
             prefix=row["prefix"],
             locale=row["locale"],
             timezone=row["timezone"],
@@ -71,15 +322,17 @@ class SettingsCog(senko.Cog, name="settings"):
         query = """
         INSERT INTO "guild_settings" ("guild") VALUES ($1)
         ON CONFLICT ("guild") DO UPDATE
-        SET "last_joined"=(NOW() AT TIME ZONE 'UTC')
+        SET "last_joined"=NOW()
         RETURNING *;
         """
         async with utils.db.maybe_acquire(self.bot.db, connection) as conn:
             row = await conn.fetchrow(query, guild.id)
+            utils.db.pin_reads(self.bot.db, guild.id)
 
             # Update cached settings...
             if guild.id in self.guild_cache:
                 settings = self.guild_cache[guild.id]
+                row = self._get_row_values(row)
                 settings._update(
                     prefix=row["prefix"],
                     locale=row["locale"],
@@ -90,15 +343,82 @@ class SettingsCog(senko.Cog, name="settings"):
             # ... or cache returned settings.
             else:
                 settings = self._build_guild_settings(guild, row)
-                self.guild_cache[guild.id] = settings
+                self.guild_cache.put(guild.id, settings, tags=[f"guild:{guild.id}"])
             
             return settings
 
+    async def load_guild_settings(self, guilds, connection=None, refresh=False):
+        """
+        Load the settings for multiple guilds into the settings store.
+
+        Settings are fetched in chunks of :attr:`WARM_UP_CHUNK_SIZE` guilds
+        per query, and default settings are created in bulk for guilds
+        that do not have settings yet. Guilds that are already in the
+        store, or in the shared settings table, are skipped.
+
+        Parameters
+        ----------
+        guilds: Iterable[discord.Guild]
+            The guilds to load the settings for.
+        connection: Optional[asyncpg.connection.Connection]
+            An optional database connection to use.
+        refresh: Optional[bool]
+            Whether to load the settings of all guilds from the database,
+            including known guilds. Defaults to ``False``.
+
+        Returns
+        -------
+        int
+            The number of guilds whose settings were loaded.
+        """
+        store = self.guild_store
+        ids = [guild.id for guild in guilds]
+        if not refresh:
+            ids = store.missing(ids)
+        if not ids:
+            return 0
+
+        select = """
+        SELECT "guild", "prefix", "locale", "timezone" FROM "guild_settings"
+        WHERE "guild"=ANY($1::BIGINT[]);
+        """
+        insert = """
+        INSERT INTO "guild_settings" ("guild")
+        SELECT * FROM UNNEST($1::BIGINT[])
+        ON CONFLICT ("guild") DO NOTHING;
+        """
+
+        size = self.WARM_UP_CHUNK_SIZE
+
+        async with utils.db.maybe_acquire(self.bot.db, connection) as conn:
+            for start in range(0, len(ids), size):
+                chunk = ids[start : start + size]
+                rows = await conn.fetch(select, chunk)
+
+                # Create default settings for unknown guilds.
+                known = {row["guild"] for row in rows}
+                unknown = [guild_id for guild_id in chunk if guild_id not in known]
+                if unknown:
+                    await conn.execute(insert, unknown)
+
+                items = []
+                for row in rows:
+                    values = self._get_row_values(row)
+                    items.append(
+                        (row["guild"], values["prefix"], values["locale"], values["timezone"])
+                    )
+                items.extend((guild_id, None, None, None) for guild_id in unknown)
+                store.put_many(items)
+
+        return len(ids)
+
     async def get_guild_settings(self, guild, connection=None):
         """
         Get the settings for a guild.
 
         If no settings exist for the given guild, a new entry is created.
+        Settings are read from a replica if possible, in which case a
+        missing entry is looked up on the primary before it is created.
 
         Parameters
         ----------
@@ -113,17 +433,302 @@ class SettingsCog(senko.Cog, name="settings"):
             The settings object for the guild.
         """
         # Check the cache first.
-        if guild.id in self.guild_cache:
-            return self.guild_cache[guild.id]
+        settings = self.guild_cache.get(guild.id)
+        if settings is not None:
+            return settings
 
-        # Fetch guild settings.
+        # Fetch guild settings, from a read replica if possible.
         query = 'SELECT * FROM "guild_settings" WHERE "guild"=$1;'
-        async with utils.db.maybe_acquire(self.bot.db, connection) as conn:
+        pool = utils.db.read_pool(self.bot.db, guild.id)
+        async with utils.db.maybe_acquire(pool, connection) as conn:
             row = await conn.fetchrow(query, guild.id)
 
-            if row is None:
-                return await self._init_guild_settings(guild, connection=conn)
+        # A replica may lag behind the creation of the row. Initializing the
+        # settings would also update last_joined, so confirm the miss on the
+        # primary first.
+        if row is None and connection is None and pool is not self.bot.db:
+            async with utils.db.maybe_acquire(self.bot.db, None) as conn:
+                row = await conn.fetchrow(query, guild.id)
+
+        if row is None:
+            return await self._init_guild_settings(guild, connection=connection)
 
         settings = self._build_guild_settings(guild, row)
-        self.guild_cache[guild.id] = settings
+        self.guild_cache.put(guild.id, settings, tags=[f"guild:{guild.id}"])
         return settings
+
+    async def get_guild_options(self, guild, connection=None, fetch=True):
+        """
+        Get the prefix, locale and timezone of a guild.
+
+        Unlike :meth:`get_guild_settings`, this is served from the settings
+        store for every known guild. Guilds that are not in the store yet
+        are loaded into it with a single query, and guilds without settings
+        use the default settings without creating them.
+
+        Parameters
+        ----------
+        guild: discord.Guild
+            The guild to get the options for.
+        connection: Optional[asyncpg.connection.Connection]
+            A database connection to use.
+        fetch: Optional[bool]
+            Whether to query the database for guilds that are not in the
+            store. Defaults to ``True``.
+
+        Returns
+        -------
+        Optional[Tuple[str, str, str]]
+            The prefix, locale ID and timezone name of the guild. Unset
+            options are replaced with their defaults from the configuration.
+            ``None`` if the guild is not in the store and ``fetch`` is
+            ``False``.
+        """
+        values = self.guild_store.get(guild.id)
+        if values is None:
+            if not fetch:
+                return None
+            selects = [self._guild_select(guild.id)]
+            records = await fetch_records(self.bot.db, selects, connection=connection)
+            values = self._load_guild_record(guild.id, records[0])
+
+        config = self.bot.config
+        prefix, locale, timezone = values
+        return (
+            prefix or config.prefix,
+            locale or config.locale,
+            timezone or config.timezone,
+        )
+
+    async def get_user_settings(self, user, connection=None):
+        """
+        Get the settings for a user.
+
+        Parameters
+        ----------
+        user: Union[discord.User, discord.Member]
+            The user to get the settings for.
+        connection: Optional[asyncpg.connection.Connection]
+            A database connection to use.
+
+        Returns
+        -------
+        ~cogs.settings.UserSettings
+            The settings object for the user.
+        """
+        return await self.user_settings.get(user.id, connection=connection)
+
+    async def get_channel_settings(self, channel, connection=None):
+        """
+        Get the settings for a channel.
+
+        Parameters
+        ----------
+        channel: discord.abc.GuildChannel
+            The channel to get the settings for.
+        connection: Optional[asyncpg.connection.Connection]
+            A database connection to use.
+
+        Returns
+        -------
+        ~cogs.settings.ChannelSettings
+            The settings object for the channel.
+        """
+        return await self.channel_settings.get(channel.id, connection=connection)
+
+    async def get_options(self, channel, user, connection=None):
+        """
+        Get the prefix, locale and timezone that apply to a user in a channel.
+
+        The settings of the guild, channel and user are resolved together.
+        Settings that are neither cached nor in the settings store are
+        fetched with a single query.
+
+        The user locale takes precedence over the channel locale, which
+        takes precedence over the guild locale. The user timezone takes
+        precedence over the guild timezone. The prefix is always the
+        guild prefix.
+
+        Parameters
+        ----------
+        channel: discord.abc.Messageable
+            The channel. Guild and channel settings only apply to guild channels.
+        user: Union[discord.User, discord.Member]
+            The user.
+        connection: Optional[asyncpg.connection.Connection]
+            A database connection to use.
+
+        Returns
+        -------
+        Tuple[str, str, str]
+            The prefix, locale ID and timezone name. Unset options are
+            replaced with their defaults from the configuration.
+        """
+        guild = getattr(channel, "guild", None)
+
+        # Scope -> (subquery, loader) for every scope that must be fetched.
+        pending = dict()
+
+        guild_values = channel_settings = None
+        if guild is not None:
+            guild_values = self.guild_store.get(guild.id)
+            if guild_values is None:
+                pending["guild"] = (self._guild_select(guild.id), self._load_guild_record)
+
+            channel_settings = self.channel_settings.cache.get(channel.id)
+            if channel_settings is None:
+                select = self.channel_settings.select(channel.id)
+                pending["channel"] = (select, self.channel_settings.put)
+
+        user_settings = self.user_settings.cache.get(user.id)
+        if user_settings is None:
+            pending["user"] = (self.user_settings.select(user.id), self.user_settings.put)
+
+        if pending:
+            selects = [select for select, _ in pending.values()]
+            records = await fetch_records(self.bot.db, selects, connection=connection)
+            loaded = {
+                scope: load(select[2], record)
+                for (scope, (select, load)), record in zip(pending.items(), records)
+            }
+            guild_values = loaded.get("guild", guild_values)
+            channel_settings = loaded.get("channel", channel_settings)
+            user_settings = loaded.get("user", user_settings)
+
+        prefix = locale = timezone = None
+        if guild_values is not None:
+            prefix, locale, timezone = guild_values
+        if channel_settings is not None:
+            locale = channel_settings.locale or locale
+
+        locale = user_settings.locale or locale
+        timezone = user_settings.timezone or timezone
+
+        config = self.bot.config
+        return (
+            prefix or config.prefix,
+            locale or config.locale,
+            timezone or config.timezone,
+        )
+
+    def _guild_select(self, guild_id):
+        """
+        Get the subquery for the settings of a guild, as passed into
+        :func:`~cogs.settings.model.fetch_records`.
+        """
+        columns = ("prefix", "locale", "timezone")
+        query = (
+            '(SELECT ROW("prefix", "locale", "timezone") '
+            'FROM "guild_settings" WHERE "guild"=${})'
+        )
+        return query, columns, guild_id
+
+    def _load_guild_record(self, guild_id, record):
+        """
+        Put the values of a guild's settings record into the settings store.
+
+        Guilds without settings use the default settings.
+        """
+        values = dict(record or dict(prefix=None, locale=None, timezone=None))
+        if self.writer is not None:
+            values.update(self.writer.get(guild_id))
+
+        self.guild_store.put(guild_id, values["prefix"], values["locale"], values["timezone"])
+        return self.guild_store.get(guild_id)
+
+    async def _prune_loop(self, days, archive=False, interval=3600.0, batch_size=500):
+        """
+        Periodically prune the settings of departed guilds.
+        """
+        await self.bot.wait_until_ready()
+        retention = datetime.timedelta(days=days)
+
+        while True:
+            try:
+                count = await self.prune_guild_settings(
+                    retention, archive=archive, batch_size=batch_size
+                )
+            except Exception as exc:
+                self.log.exception("Could not prune guild settings!", exc_info=exc)
+            else:
+                if count:
+                    self.log.info(f"Pruned settings of {count} departed guild(s).")
+
+            await asyncio.sleep(interval)
+
+    async def prune_guild_settings(
+        self, retention, *, archive=False, batch_size=500, connection=None
+    ):
+        """
+        Delete the settings of guilds that the bot left and did not rejoin
+        within a retention window.
+
+        Rows are deleted in small batches, each in its own transaction, and
+        paginated by guild ID, so the table is never locked for long. Rows
+        locked by other transactions are skipped.
+
+        Parameters
+        ----------
+        retention: datetime.timedelta
+            How long to keep the settings of departed guilds.
+        archive: Optional[bool]
+            Whether to move deleted rows into the ``guild_settings_archive``
+            table instead of discarding them. Defaults to ``False``.
+        batch_size: Optional[int]
+            The maximum number of rows to delete per batch. Defaults to ``500``.
+        connection: Optional[asyncpg.connection.Connection]
+            An optional database connection to use.
+
+        Returns
+        -------
+        int
+            The number of deleted rows.
+        """
+        columns = (
+            '"guild", "prefix", "locale", "timezone", '
+            '"first_joined", "last_joined", "last_left"'
+        )
+        archived = ""
+        if archive:
+            archived = f"""
+            , "archived" AS (
+                INSERT INTO "guild_settings_archive" ({columns})
+                SELECT {columns} FROM "deleted"
+                ON CONFLICT ("guild") DO UPDATE SET
+                "prefix"=EXCLUDED."prefix", "locale"=EXCLUDED."locale",
+                "timezone"=EXCLUDED."timezone", "last_joined"=EXCLUDED."last_joined",
+                "last_left"=EXCLUDED."last_left", "archived"=DEFAULT
+            )
+            """
+
+        query = f"""
+        WITH "batch" AS (
+            SELECT "guild" FROM "guild_settings"
+            WHERE "guild">$1 AND "last_left"<$2
+            AND ("last_joined" IS NULL OR "last_joined"<"last_left")
+            ORDER BY "guild" LIMIT $3
+            FOR UPDATE SKIP LOCKED
+        ), "deleted" AS (
+            DELETE FROM "guild_settings" WHERE "guild" IN (SELECT "guild" FROM "batch")
+            RETURNING *
+        ){archived}
+        SELECT COUNT(*), MAX("guild") FROM "deleted";
+        """
+
+        cutoff = datetime.datetime.now(datetime.timezone.utc) - retention
+        last = -1
+        total = 0
+
+        while True:
+            async with utils.db.maybe_acquire(self.bot.db, connection) as conn:
+                async with conn.transaction():
+                    count, upper = await conn.fetchrow(query, last, cutoff, batch_size)
+
+            if upper is None:
+                return total
+
+            total += count
+            last = upper
+
+            # Let other tasks use the database between batches.
+            await asyncio.sleep(0)
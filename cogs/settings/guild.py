@@ -20,11 +20,17 @@ class GuildSettings(object):
         "_timezone",
         "_first_joined",
         "_last_joined",
+        "_store",
+        "_writer",
+        "_sync",
     )
 
     def __init__(self, bot, guild, **options):
         self._bot = bot
         self._guild = guild
+        self._store = options.pop("store", None)
+        self._writer = options.pop("writer", None)
+        self._sync = options.pop("sync", None)
         self._prefix = options.pop("prefix")
         self._locale = options.pop("locale")
         self._timezone = options.pop("timezone")
@@ -81,7 +87,11 @@ class GuildSettings(object):
 
             setattr(self, f"_{option}", value)
 
-    async def update(self, connection=None, **options):
+        # Keep the compact settings store in sync.
+        if self._store is not None:
+            self._store.put(self._guild.id, self._prefix, self._locale, self._timezone)
+
+    async def update(self, connection=None, defer=False, **options):
         """
         Update the guild settings.
 
@@ -89,6 +99,14 @@ class GuildSettings(object):
         ----------
         connection: Optional[asyncpg.connection.Connection]
             A database connection to use.
+        defer: Optional[bool]
+            Whether to queue the update in the write-behind queue of the
+            settings cog instead of writing it immediately. The settings
+            are updated in memory right away. When write-behind is not
+            enabled, the update is written immediately. Defaults to ``False``.
+
+            When settings sync is enabled, other processes are notified
+            of the update once it is written.
         prefix: Optional[str]
             The new guild prefix. Can be ``None`` to reset the guild
             prefix to the default prefix.
@@ -126,8 +144,19 @@ class GuildSettings(object):
 
             # TODO: Validate timezone.
 
+        writer = self._writer
+        if writer is not None and (defer or self._guild.id in writer):
+            # Queued updates of the guild must not overwrite this one, so it
+            # is queued as well and the queue is flushed unless deferred.
+            # The writer announces the update once it was written.
+            writer.update(self._guild.id, **options)
+            self._update(**options)
+            if not defer:
+                await writer.flush(connection)
+            return
+
         # Build the database query.
-        skeleton = 'UPDATE "guild_settings"SET {assignments} WHERE "guild"=$1;'
+        skeleton = 'UPDATE "guild_settings" SET {assignments} WHERE "guild"=$1;'
         enumerated = list(enumerate(options.items(), 2))
         assignments = ", ".join(f'"{pair[0]}"=${pos}' for pos, pair in enumerated)
         values = [pair[1] for _, pair in enumerated]
@@ -136,6 +165,12 @@ class GuildSettings(object):
         async with utils.db.maybe_acquire(self._bot.db, connection) as db:
             await db.execute(query, self._guild.id, *values)
 
+            # Announce the update to other processes.
+            if self._sync is not None:
+                await self._sync.notify(self._guild.id, db, **options)
+
+        utils.db.pin_reads(self._bot.db, self._guild.id)
+
         # Update the model.
         self._update(**options)
 
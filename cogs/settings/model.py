@@ -0,0 +1,521 @@
+import zoneinfo
+
+import utils
+
+from .errors import BadSetting, UnknownSetting
+
+
+class Field(object):
+    """
+    A declarative settings field.
+
+    Fields are defined as class attributes of a :class:`SettingsModel` and
+    map to a nullable column of the model's table. Accessing a field on a
+    model instance returns the stored value, or the default if the stored
+    value is ``None``.
+
+    Parameters
+    ----------
+    sql_type: str
+        The SQL type of the column.
+    default: Optional[Union[Any, Callable[[senko.Senko], Any]]]
+        The default value, or a callable that takes the bot and returns
+        the default value. Defaults to ``None``.
+    validator: Optional[Callable[[Any], None]]
+        An optional callable that raises :exc:`~cogs.settings.BadSetting`
+        for invalid values. It is not called for ``None``, which always
+        resets the field to its default.
+
+    Attributes
+    ----------
+    name: str
+        The name of the field and its column.
+    """
+
+    __slots__ = ("name", "sql_type", "default", "validator")
+
+    def __init__(self, sql_type, *, default=None, validator=None):
+        self.name = None
+        self.sql_type = sql_type
+        self.default = default
+        self.validator = validator
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        value = instance._values.get(self.name)
+        if value is None:
+            return self.get_default(instance._bot)
+        return value
+
+    def get_default(self, bot):
+        """
+        Get the default value of the field.
+
+        Parameters
+        ----------
+        bot: senko.Senko
+            The bot instance, passed to callable defaults.
+
+        Returns
+        -------
+        Any
+            The default value.
+        """
+        if callable(self.default):
+            return self.default(bot)
+        return self.default
+
+    def validate(self, value):
+        """
+        Validate a new value for the field.
+
+        Parameters
+        ----------
+        value: Any
+            The value to validate.
+
+        Raises
+        ------
+        BadSetting
+            When the value is invalid.
+        """
+        if value is not None and self.validator is not None:
+            self.validator(value)
+
+
+def validate_length(length):
+    """
+    Create a validator for strings that must not be empty and must be
+    at most ``length`` characters long.
+
+    Parameters
+    ----------
+    length: int
+        The maximum length.
+
+    Returns
+    -------
+    Callable[[str], None]
+        The validator.
+    """
+
+    def validator(value):
+        if len(value) == 0:
+            raise BadSetting("Setting must not be empty!")
+        elif len(value) > length:
+            raise BadSetting(f"Setting must be at most {length} characters long!")
+
+    return validator
+
+
+def validate_timezone(value):
+    """
+    A validator for timezone names.
+
+    Parameters
+    ----------
+    value: str
+        The timezone name.
+
+    Raises
+    ------
+    BadSetting
+        When the timezone is unknown.
+    """
+    try:
+        zoneinfo.ZoneInfo(value)
+    except (ValueError, zoneinfo.ZoneInfoNotFoundError):
+        raise BadSetting(f"Unknown timezone: {value!r}") from None
+
+
+class SettingsModel(object):
+    """
+    The base class of declarative settings models.
+
+    Subclasses set :attr:`__table__` to the name of their table,
+    :attr:`__key__` to the name of its ``BIGINT`` primary key column and
+    define their settings as :class:`Field` class attributes. Rows that do
+    not exist use the defaults of all fields, so rows are only created
+    once a setting is changed.
+
+    You should not create instances yourself and instead get them through
+    the :class:`SettingsLoader` of the model.
+
+    Parameters
+    ----------
+    bot: senko.Senko
+        The bot instance.
+    key: int
+        The value of the primary key.
+    values: Optional[Dict[str, Any]]
+        The stored values by field name.
+    loader: Optional[SettingsLoader]
+        The loader used to write updates.
+    """
+
+    __slots__ = ("_bot", "_key", "_values", "_loader")
+
+    #: The name of the table.
+    __table__ = None
+
+    #: The name of the primary key column.
+    __key__ = None
+
+    #: Fields by name, collected when subclassing.
+    _fields = dict()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        fields = dict()
+        for base in reversed(cls.__mro__):
+            for name, value in vars(base).items():
+                if isinstance(value, Field):
+                    fields[name] = value
+
+        cls._fields = fields
+
+    def __init__(self, bot, key, values=None, loader=None):
+        self._bot = bot
+        self._key = key
+        self._values = dict(values or ())
+        self._loader = loader
+
+    @property
+    def key(self):
+        """int: The value of the primary key."""
+        return self._key
+
+    @classmethod
+    def columns(cls):
+        """
+        Get the names of the model's columns, excluding the primary key.
+
+        Returns
+        -------
+        Tuple[str, ...]
+            The column names.
+        """
+        return tuple(cls._fields)
+
+    @classmethod
+    def schema(cls):
+        """
+        Generate the ``CREATE TABLE`` statement of the model.
+
+        Returns
+        -------
+        str
+            The SQL statement.
+        """
+        lines = [f'    "{cls.__key__}" BIGINT NOT NULL,']
+        lines.extend(f'    "{f.name}" {f.sql_type},' for f in cls._fields.values())
+        lines.append(f'    CONSTRAINT pk_{cls.__table__} PRIMARY KEY ("{cls.__key__}")')
+        body = "\n".join(lines)
+        return f'CREATE TABLE IF NOT EXISTS "{cls.__table__}" (\n{body}\n);'
+
+    @classmethod
+    def validate(cls, options):
+        """
+        Validate new values for the model's fields.
+
+        Parameters
+        ----------
+        options: Dict[str, Any]
+            The new values by field name.
+
+        Raises
+        ------
+        BadSetting
+            When an invalid value is provided for a field.
+        UnknownSetting
+            When an unknown field is provided.
+        """
+        for option, value in options.items():
+            try:
+                field = cls._fields[option]
+            except KeyError:
+                raise UnknownSetting(f"Unknown setting: {option!r}") from None
+
+            field.validate(value)
+
+    def _update(self, **options):
+        r"""
+        Update the stored values.
+
+        Parameters
+        ----------
+        \*\*options
+            The fields to update.
+        """
+        for option in options:
+            if option not in self._fields:
+                raise TypeError(f"Received unexpected field: {option!r}!")
+
+        self._values.update(options)
+
+    async def update(self, connection=None, **options):
+        r"""
+        Update the settings.
+
+        Parameters
+        ----------
+        connection: Optional[asyncpg.connection.Connection]
+            A database connection to use.
+        \*\*options
+            The new values by field name. ``None`` resets a field to
+            its default.
+
+        Raises
+        ------
+        BadSetting
+            When an invalid value is provided for a field.
+        UnknownSetting
+            When an unknown field is provided.
+        """
+        if not options:
+            return
+
+        self.validate(options)
+        await self._loader.write_many({self._key: options}, connection=connection)
+        self._update(**options)
+
+    def __repr__(self):
+        values = " ".join(f"{name}={self._values.get(name)!r}" for name in self._fields)
+        return f"<{type(self).__name__} {self.__key__}={self._key} {values}>"
+
+
+class SettingsLoader(object):
+    """
+    A cached loader for the instances of a :class:`SettingsModel`.
+
+    Instances are cached in a :class:`~utils.caching.TinyLFUCache` and
+    tagged with ``<key column>:<key>``. Cache misses of multiple keys are
+    fetched with a single query, and writes of multiple keys are batched
+    into one upsert per set of updated columns.
+
+    Parameters
+    ----------
+    bot: senko.Senko
+        The bot instance.
+    model: Type[SettingsModel]
+        The model to load.
+    maxsize: Optional[int]
+        The maximum number of cached instances. Defaults to ``4096``.
+    name: Optional[str]
+        An optional name to register the cache under.
+    """
+
+    def __init__(self, bot, model, *, maxsize=4096, name=None):
+        self.bot = bot
+        self.model = model
+        self.cache = utils.caching.TinyLFUCache(maxsize, name=name, stats=True)
+
+    def _tags(self, key):
+        return [f"{self.model.__key__}:{key}"]
+
+    def select(self, key):
+        """
+        Get a scalar subquery that selects the row of a key as a record.
+
+        This allows loading multiple models in a single query, see
+        :func:`fetch_records`.
+
+        Parameters
+        ----------
+        key: int
+            The value of the primary key.
+
+        Returns
+        -------
+        Tuple[str, Tuple[str, ...], int]
+            The SQL subquery with a ``{}`` placeholder for the parameter
+            index, the selected columns and the key parameter.
+        """
+        model = self.model
+        columns = model.columns()
+        fields = ", ".join(f'"{column}"' for column in columns)
+        query = f'(SELECT ROW({fields}) FROM "{model.__table__}" WHERE "{model.__key__}"=${{}})'
+        return query, columns, key
+
+    def put(self, key, values=None):
+        """
+        Cache the instance for a key.
+
+        Parameters
+        ----------
+        key: int
+            The value of the primary key.
+        values: Optional[Dict[str, Any]]
+            The stored values by field name. ``None`` if no row exists.
+
+        Returns
+        -------
+        SettingsModel
+            The cached instance.
+        """
+        instance = self.model(self.bot, key, values, loader=self)
+        self.cache.put(key, instance, tags=self._tags(key))
+        return instance
+
+    async def get(self, key, connection=None):
+        """
+        Get the instance for a key.
+
+        Parameters
+        ----------
+        key: int
+            The value of the primary key.
+        connection: Optional[asyncpg.connection.Connection]
+            A database connection to use.
+
+        Returns
+        -------
+        SettingsModel
+            The instance. Uses the defaults if no row exists.
+        """
+        instances = await self.get_many([key], connection=connection)
+        return instances[key]
+
+    async def get_many(self, keys, connection=None):
+        """
+        Get the instances for multiple keys.
+
+        Keys that are not cached are fetched with a single query.
+
+        Parameters
+        ----------
+        keys: Iterable[int]
+            The values of the primary key.
+        connection: Optional[asyncpg.connection.Connection]
+            A database connection to use.
+
+        Returns
+        -------
+        Dict[int, SettingsModel]
+            The instances by key.
+        """
+        found, missing = self.cache.get_many(keys)
+        if not missing:
+            return found
+
+        model = self.model
+        columns = ", ".join(f'"{column}"' for column in model.columns())
+        query = f"""
+        SELECT "{model.__key__}", {columns} FROM "{model.__table__}"
+        WHERE "{model.__key__}"=ANY($1::BIGINT[]);
+        """
+        async with utils.db.maybe_acquire(self.bot.db, connection) as conn:
+            rows = await conn.fetch(query, missing)
+
+        columns = model.columns()
+        rows = {row[0]: dict(zip(columns, row[1:])) for row in rows}
+        for key in missing:
+            found[key] = self.put(key, rows.get(key))
+
+        return found
+
+    async def write_many(self, items, connection=None):
+        """
+        Write updates for multiple keys.
+
+        Rows are created if they do not exist. Updates are batched into one
+        ``executemany`` upsert per set of updated columns. Cached instances
+        are not updated, see :meth:`update_many`.
+
+        Parameters
+        ----------
+        items: Dict[int, Dict[str, Any]]
+            The new values by field name, by key.
+        connection: Optional[asyncpg.connection.Connection]
+            A database connection to use.
+        """
+        groups = dict()
+        for key, options in items.items():
+            if options:
+                columns = tuple(sorted(options))
+                row = (key, *(options[column] for column in columns))
+                groups.setdefault(columns, []).append(row)
+
+        if not groups:
+            return
+
+        model = self.model
+        async with utils.db.maybe_acquire(self.bot.db, connection) as conn:
+            for columns, rows in groups.items():
+                names = ", ".join(f'"{column}"' for column in columns)
+                params = ", ".join(f"${pos}" for pos in range(2, len(columns) + 2))
+                assignments = ", ".join(f'"{c}"=EXCLUDED."{c}"' for c in columns)
+                query = f"""
+                INSERT INTO "{model.__table__}" ("{model.__key__}", {names})
+                VALUES ($1, {params})
+                ON CONFLICT ("{model.__key__}") DO UPDATE SET {assignments};
+                """
+                await conn.executemany(query, rows)
+
+    async def update_many(self, items, connection=None):
+        """
+        Validate and write updates for multiple keys, and apply them
+        to cached instances.
+
+        Parameters
+        ----------
+        items: Dict[int, Dict[str, Any]]
+            The new values by field name, by key.
+        connection: Optional[asyncpg.connection.Connection]
+            A database connection to use.
+
+        Raises
+        ------
+        BadSetting
+            When an invalid value is provided for a field.
+        UnknownSetting
+            When an unknown field is provided.
+        """
+        for options in items.values():
+            self.model.validate(options)
+
+        await self.write_many(items, connection=connection)
+
+        for key, options in items.items():
+            if key in self.cache:
+                self.cache[key]._update(**options)
+
+
+async def fetch_records(pool, selects, connection=None):
+    """
+    Fetch records of multiple tables in a single round-trip.
+
+    Parameters
+    ----------
+    pool: asyncpg.pool.Pool
+        The database connection pool.
+    selects: List[Tuple[str, Tuple[str, ...], int]]
+        Subqueries as returned by :meth:`SettingsLoader.select`.
+    connection: Optional[asyncpg.connection.Connection]
+        A database connection to use.
+
+    Returns
+    -------
+    List[Optional[Dict[str, Any]]]
+        The selected values by column for each subquery, or ``None``
+        if no row exists.
+    """
+    if not selects:
+        return []
+
+    parts = ", ".join(query.format(pos) for pos, (query, _, _) in enumerate(selects, 1))
+    keys = [key for _, _, key in selects]
+
+    async with utils.db.maybe_acquire(pool, connection) as conn:
+        row = await conn.fetchrow(f"SELECT {parts};", *keys)
+
+    return [
+        None if record is None else dict(zip(columns, record))
+        for record, (_, columns, _) in zip(row, selects)
+    ]
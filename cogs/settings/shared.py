@@ -0,0 +1,348 @@
+import os
+import sys
+import struct
+import tempfile
+import contextlib
+
+from multiprocessing import shared_memory, resource_tracker
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+# Header: magic, layout version, capacity.
+_HEADER = struct.Struct("<4sII")
+_MAGIC = b"SSET"
+_VERSION = 1
+
+# Record: sequence, guild ID, mask of set values, value lengths, values.
+_RECORD = struct.Struct("<IqB3B40s16s32s")
+_BODY = struct.Struct("<qB3B40s16s32s")
+_SEQ = struct.Struct("<I")
+
+# Widths of the prefix, locale and timezone fields in bytes.
+_WIDTHS = (40, 16, 32)
+
+# Guild ID of a record whose guild was removed.
+_TOMBSTONE = -1
+
+# Maximum number of slots probed for a guild.
+_MAX_PROBES = 16
+
+# Maximum number of attempts to read a record that is being written.
+_MAX_RETRIES = 100
+
+# Whether shared memory blocks can be opened without the resource tracker.
+_UNTRACKED = sys.version_info >= (3, 13)
+
+
+def _open_block(name, create=False, size=0):
+    # The block must outlive this process, so it must not be unlinked by the
+    # resource tracker when this process exits.
+    if _UNTRACKED:
+        return shared_memory.SharedMemory(name, create, size, track=False)
+
+    # Before Python 3.13 every block is registered with the resource tracker
+    # when it is opened, under its private name with a leading slash.
+    shm = shared_memory.SharedMemory(name, create, size)
+    resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+def _unlink_block(shm):
+    # Before Python 3.13 unlinking unregisters the block from the resource
+    # tracker, which fails for a block that was unregistered when opened.
+    if not _UNTRACKED:
+        resource_tracker.register(shm._name, "shared_memory")
+    shm.unlink()
+
+
+def _encode(value, width):
+    if value is None:
+        return b"", False
+
+    data = value.encode("utf-8")
+    if len(data) > width:
+        raise ValueError(f"Value {value!r} does not fit into {width} bytes!")
+    return data, True
+
+
+class SharedSettingsTable(object):
+    """
+    A guild settings table in shared memory, shared by all bot processes
+    on a host.
+
+    The table is an open addressing hash table of fixed-width records
+    that hold the guild ID, prefix, locale and timezone of a guild. It
+    sits between the per-process settings store and the database, so
+    processes share a single copy of the settings and a restarted process
+    can load settings without querying the database.
+
+    Each record starts with a sequence counter that is odd while the
+    record is being written. Readers retry until they read the same even
+    counter before and after the record, so they never see torn records.
+    Writers of all processes are serialized with a lock file.
+
+    The table is a cache. Guilds whose probe sequence is full are not
+    stored. The shared memory block outlives the processes using it
+    until :meth:`unlink` is called.
+
+    Parameters
+    ----------
+    name: str
+        The name of the shared memory block.
+    capacity: Optional[int]
+        The number of records, rounded up to a power of two. Must be the
+        same for all processes. Defaults to ``262144``.
+
+    Raises
+    ------
+    RuntimeError
+        When shared memory locking is not supported on this platform, or
+        when the existing block has a different layout or capacity.
+    """
+
+    def __init__(self, name, capacity=262144):
+        if fcntl is None:
+            raise RuntimeError("Shared settings require fcntl file locks!")
+
+        size = 1
+        while size < capacity:
+            size <<= 1
+
+        self.name = name
+        self.capacity = size
+        self._mask = size - 1
+
+        lock = os.path.join(tempfile.gettempdir(), f"{name}.lock")
+        self._lock = open(lock, "a+b")
+
+        # Creating and validating the block is serialized, so no process
+        # reads the header before it was written.
+        nbytes = _HEADER.size + size * _RECORD.size
+        with self._locked():
+            try:
+                self._shm = _open_block(name, create=True, size=nbytes)
+            except FileExistsError:
+                self._shm = _open_block(name)
+            else:
+                _HEADER.pack_into(self._shm.buf, 0, _MAGIC, _VERSION, size)
+
+            header = _HEADER.unpack_from(self._shm.buf, 0)
+
+        if header != (_MAGIC, _VERSION, size):
+            self.close()
+            raise RuntimeError(
+                f"Shared settings block {name!r} has an incompatible layout!"
+            )
+
+    @contextlib.contextmanager
+    def _locked(self):
+        fcntl.flock(self._lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock, fcntl.LOCK_UN)
+
+    def _slots(self, guild_id):
+        """
+        Get the offsets of the records in the probe sequence of a guild.
+        """
+        index = ((guild_id * 0x9E3779B97F4A7C15) >> 17) & self._mask
+        for probe in range(min(_MAX_PROBES, self.capacity)):
+            yield _HEADER.size + ((index + probe) & self._mask) * _RECORD.size
+
+    def _read(self, offset):
+        """
+        Read a consistent record body.
+        """
+        buf = self._shm.buf
+        for _ in range(_MAX_RETRIES):
+            (before,) = _SEQ.unpack_from(buf, offset)
+            if before & 1:
+                continue
+
+            body = _BODY.unpack_from(buf, offset + _SEQ.size)
+
+            (after,) = _SEQ.unpack_from(buf, offset)
+            if before == after:
+                return body
+
+        return None
+
+    def _write(self, offset, guild_id, mask, lengths, values):
+        """
+        Write a record body. Must be called with the lock held.
+        """
+        buf = self._shm.buf
+        (seq,) = _SEQ.unpack_from(buf, offset)
+        _SEQ.pack_into(buf, offset, (seq + 1) & 0xFFFFFFFF)
+        _BODY.pack_into(buf, offset + _SEQ.size, guild_id, mask, *lengths, *values)
+        _SEQ.pack_into(buf, offset, (seq + 2) & 0xFFFFFFFF)
+
+    def get(self, guild_id):
+        """
+        Get the settings of a guild.
+
+        Parameters
+        ----------
+        guild_id: int
+            The ID of the guild.
+
+        Returns
+        -------
+        Optional[Tuple[Optional[str], Optional[str], Optional[str]]]
+            The ``(prefix, locale, timezone)`` of the guild, or ``None``
+            if the guild is not in the table.
+        """
+        for offset in self._slots(guild_id):
+            body = self._read(offset)
+            if body is None:
+                return None
+
+            key, mask, *rest = body
+            if key == 0:
+                return None
+            if key != guild_id:
+                continue
+
+            lengths, data = rest[:3], rest[3:]
+            return tuple(
+                value[:length].decode("utf-8") if mask & (1 << i) else None
+                for i, (length, value) in enumerate(zip(lengths, data))
+            )
+
+        return None
+
+    def put(self, guild_id, prefix, locale, timezone):
+        """
+        Set the settings of a guild.
+
+        Values that do not fit into their fixed-width field are not
+        stored and the guild is removed from the table instead.
+
+        Parameters
+        ----------
+        guild_id: int
+            The ID of the guild.
+        prefix: Optional[str]
+            The guild prefix, or ``None`` for the default.
+        locale: Optional[str]
+            The guild locale, or ``None`` for the default.
+        timezone: Optional[str]
+            The guild timezone, or ``None`` for the default.
+
+        Returns
+        -------
+        bool
+            Whether the guild was stored.
+        """
+        record = self._encode_record(prefix, locale, timezone)
+        with self._locked():
+            return self._put(guild_id, record)
+
+    def put_many(self, items):
+        """
+        Set the settings of multiple guilds.
+
+        The lock is taken once for all guilds, so loading many guilds does
+        not contend with the other processes for each guild.
+
+        Parameters
+        ----------
+        items: Iterable[Tuple[int, Optional[str], Optional[str], Optional[str]]]
+            The ``(guild_id, prefix, locale, timezone)`` of each guild.
+        """
+        records = [
+            (guild_id, self._encode_record(prefix, locale, timezone))
+            for guild_id, prefix, locale, timezone in items
+        ]
+        if not records:
+            return
+
+        with self._locked():
+            for guild_id, record in records:
+                self._put(guild_id, record)
+
+    @staticmethod
+    def _encode_record(prefix, locale, timezone):
+        """
+        Encode the values of a record, or return ``None`` if they do not fit.
+        """
+        try:
+            encoded = [
+                _encode(v, w) for v, w in zip((prefix, locale, timezone), _WIDTHS)
+            ]
+        except ValueError:
+            return None
+
+        mask = sum(1 << i for i, (_, present) in enumerate(encoded) if present)
+        lengths = [len(data) for data, _ in encoded]
+        values = [data for data, _ in encoded]
+        return mask, lengths, values
+
+    def _put(self, guild_id, record):
+        """
+        Write the encoded record of a guild. Must be called with the lock held.
+        """
+        if record is None:
+            self._discard(guild_id)
+            return False
+
+        free = None
+        for offset in self._slots(guild_id):
+            key = _BODY.unpack_from(self._shm.buf, offset + _SEQ.size)[0]
+            if key == guild_id:
+                self._write(offset, guild_id, *record)
+                return True
+
+            if key in (0, _TOMBSTONE) and free is None:
+                free = offset
+            if key == 0:
+                break
+
+        if free is None:
+            return False
+
+        self._write(free, guild_id, *record)
+        return True
+
+    def discard(self, guild_id):
+        """
+        Remove a guild from the table, if present.
+
+        Parameters
+        ----------
+        guild_id: int
+            The ID of the guild.
+        """
+        with self._locked():
+            self._discard(guild_id)
+
+    def _discard(self, guild_id):
+        """
+        Remove a guild from the table. Must be called with the lock held.
+        """
+        for offset in self._slots(guild_id):
+            key = _BODY.unpack_from(self._shm.buf, offset + _SEQ.size)[0]
+            if key == 0:
+                return
+            if key == guild_id:
+                self._write(offset, _TOMBSTONE, 0, (0, 0, 0), (b"", b"", b""))
+                return
+
+    def close(self):
+        """
+        Detach from the shared memory block.
+        """
+        self._shm.close()
+        self._lock.close()
+
+    def unlink(self):
+        """
+        Destroy the shared memory block.
+
+        The block should only be destroyed once no process uses it anymore.
+        """
+        _unlink_block(self._shm)
@@ -0,0 +1,312 @@
+import sys
+import array
+import bisect
+import heapq
+
+#: The values of a guild that uses the default settings.
+DEFAULT = (None, None, None)
+
+# The minimum number of buffered changes before the default array is rebuilt.
+_MIN_BUFFER = 1024
+
+
+def _intern(value):
+    return None if value is None else sys.intern(value)
+
+
+class GuildSettingsStore(object):
+    """
+    A compact in-memory view of the settings of every known guild.
+
+    Most guilds never change a setting. Only guilds that do are stored
+    as a tuple of ``(prefix, locale, timezone)``, with ``None`` marking
+    values that use the default. Guilds known to use the default settings
+    are kept as a sorted array of 64-bit IDs, which takes eight bytes per
+    guild. Setting values are interned, so guilds sharing a value also
+    share the string.
+
+    Guilds added to or removed from the default array are buffered in
+    small sets and merged into the array in a single linear pass once
+    the buffer has grown to a fraction of the array, so each change costs
+    amortized constant time instead of shifting the whole array.
+
+    The store does not apply the defaults from the configuration and
+    only holds the raw database values.
+
+    Parameters
+    ----------
+    shared: Optional[~cogs.settings.SharedSettingsTable]
+        An optional second-level table shared with other processes. Guilds
+        that are not in the store are looked up in it, and all changes are
+        written through to it.
+    """
+
+    __slots__ = ("_overrides", "_defaults", "_added", "_removed", "_shared")
+
+    def __init__(self, shared=None):
+        self._shared = shared
+
+        # Guild ID -> (prefix, locale, timezone) for non-default guilds.
+        self._overrides = dict()
+
+        # Sorted IDs of guilds known to use the default settings.
+        self._defaults = array.array("q")
+
+        # Buffered changes of the default array. Added IDs are not in the
+        # array, removed IDs are.
+        self._added = set()
+        self._removed = set()
+
+    @property
+    def nbytes(self):
+        """int: An estimate of the memory used by the store in bytes."""
+        defaults = self._defaults
+        return (
+            sys.getsizeof(defaults)
+            + sys.getsizeof(self._added)
+            + sys.getsizeof(self._removed)
+            + sys.getsizeof(self._overrides)
+            + len(self._overrides) * (sys.getsizeof(DEFAULT) + sys.getsizeof(2**62))
+        )
+
+    def _find(self, guild_id):
+        """
+        Get the index of a guild ID in the default array, or ``-1``.
+        """
+        defaults = self._defaults
+        index = bisect.bisect_left(defaults, guild_id)
+        if index < len(defaults) and defaults[index] == guild_id:
+            return index
+        return -1
+
+    def _is_default(self, guild_id):
+        """
+        Check whether a guild is known to use the default settings.
+        """
+        if guild_id in self._added:
+            return True
+        return self._find(guild_id) != -1 and guild_id not in self._removed
+
+    def _add_default(self, guild_id):
+        """
+        Buffer adding a guild to the default array.
+        """
+        if guild_id in self._removed:
+            self._removed.discard(guild_id)
+        elif self._find(guild_id) == -1:
+            self._added.add(guild_id)
+
+    def _remove_default(self, guild_id):
+        """
+        Buffer removing a guild from the default array.
+        """
+        if guild_id in self._added:
+            self._added.discard(guild_id)
+        elif self._find(guild_id) != -1:
+            self._removed.add(guild_id)
+
+    def _maybe_compact(self):
+        """
+        Merge the buffered changes once the buffer is large enough.
+        """
+        buffered = len(self._added) + len(self._removed)
+        if buffered > max(_MIN_BUFFER, len(self._defaults) >> 3):
+            self._compact()
+
+    def _compact(self):
+        """
+        Merge the buffered changes into the default array in one pass.
+        """
+        removed = self._removed
+        defaults = self._defaults
+        if removed:
+            defaults = (i for i in defaults if i not in removed)
+
+        merged = heapq.merge(defaults, sorted(self._added))
+        self._defaults = array.array("q", merged)
+        self._added = set()
+        self._removed = set()
+
+    def get(self, guild_id):
+        """
+        Get the settings of a guild.
+
+        Parameters
+        ----------
+        guild_id: int
+            The ID of the guild.
+
+        Returns
+        -------
+        Optional[Tuple[Optional[str], Optional[str], Optional[str]]]
+            The ``(prefix, locale, timezone)`` of the guild, or ``None``
+            if the guild is unknown.
+        """
+        values = self._overrides.get(guild_id)
+        if values is not None:
+            return values
+
+        if self._is_default(guild_id):
+            return DEFAULT
+
+        # Fall back to the shared table and keep a local copy.
+        if self._shared is not None:
+            values = self._shared.get(guild_id)
+            if values is not None:
+                self._put(guild_id, *values)
+                return self.get(guild_id)
+
+        return None
+
+    def put(self, guild_id, prefix, locale, timezone):
+        """
+        Set the settings of a guild.
+
+        Parameters
+        ----------
+        guild_id: int
+            The ID of the guild.
+        prefix: Optional[str]
+            The guild prefix, or ``None`` for the default.
+        locale: Optional[str]
+            The guild locale, or ``None`` for the default.
+        timezone: Optional[str]
+            The guild timezone, or ``None`` for the default.
+        """
+        self._put(guild_id, prefix, locale, timezone)
+        if self._shared is not None:
+            self._shared.put(guild_id, prefix, locale, timezone)
+
+    def _put(self, guild_id, prefix, locale, timezone):
+        """
+        Set the settings of a guild in this store only.
+        """
+        values = (_intern(prefix), _intern(locale), _intern(timezone))
+
+        if values == DEFAULT:
+            self._overrides.pop(guild_id, None)
+            self._add_default(guild_id)
+        else:
+            self._remove_default(guild_id)
+            self._overrides[guild_id] = values
+
+        self._maybe_compact()
+
+    def put_many(self, items):
+        """
+        Set the settings of multiple guilds.
+
+        This is faster than calling :meth:`put` for each guild, since
+        the shared table, if any, is updated in bulk.
+
+        Parameters
+        ----------
+        items: Iterable[Tuple[int, Optional[str], Optional[str], Optional[str]]]
+            The ``(guild_id, prefix, locale, timezone)`` of each guild.
+        """
+        if self._shared is not None:
+            items = list(items)
+            self._shared.put_many(items)
+
+        self._put_many(items)
+
+    def _put_many(self, items):
+        """
+        Set the settings of multiple guilds in this store only.
+        """
+        overrides = self._overrides
+        for guild_id, prefix, locale, timezone in items:
+            values = (_intern(prefix), _intern(locale), _intern(timezone))
+            if values == DEFAULT:
+                overrides.pop(guild_id, None)
+                self._add_default(guild_id)
+            else:
+                self._remove_default(guild_id)
+                overrides[guild_id] = values
+
+        self._maybe_compact()
+
+    def missing(self, guild_ids):
+        """
+        Get the IDs of guilds that are not in the store.
+
+        Guilds that are only in the shared table are loaded into the
+        store in bulk and are not considered missing.
+
+        Parameters
+        ----------
+        guild_ids: Iterable[int]
+            The IDs of the guilds.
+
+        Returns
+        -------
+        List[int]
+            The IDs of the missing guilds.
+        """
+        missing = [
+            guild_id
+            for guild_id in guild_ids
+            if guild_id not in self._overrides and not self._is_default(guild_id)
+        ]
+        if self._shared is None or not missing:
+            return missing
+
+        found = []
+        unknown = []
+        for guild_id in missing:
+            values = self._shared.get(guild_id)
+            if values is None:
+                unknown.append(guild_id)
+            else:
+                found.append((guild_id, *values))
+
+        self._put_many(found)
+        return unknown
+
+    def discard(self, guild_id):
+        """
+        Remove a guild from the store, if present.
+
+        Parameters
+        ----------
+        guild_id: int
+            The ID of the guild.
+        """
+        self._overrides.pop(guild_id, None)
+        self._remove_default(guild_id)
+        self._maybe_compact()
+
+        if self._shared is not None:
+            self._shared.discard(guild_id)
+
+    def clear(self):
+        """
+        Remove all guilds from the store.
+
+        The shared table, if any, is not cleared.
+        """
+        self._overrides.clear()
+        self._defaults = array.array("q")
+        self._added = set()
+        self._removed = set()
+
+    def detach(self):
+        """
+        Stop using the shared table, if any, for example before it is
+        closed. The guilds in the store are kept.
+        """
+        self._shared = None
+
+    def __contains__(self, guild_id):
+        return self.get(guild_id) is not None
+
+    def __len__(self):
+        return len(self._overrides) + self._count_defaults()
+
+    def _count_defaults(self):
+        return len(self._defaults) + len(self._added) - len(self._removed)
+
+    def __repr__(self):
+        overrides = len(self._overrides)
+        defaults = self._count_defaults()
+        return f"<GuildSettingsStore overrides={overrides} defaults={defaults}>"
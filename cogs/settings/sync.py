@@ -0,0 +1,195 @@
+import asyncio
+import datetime
+import json
+import logging
+import uuid
+
+import utils
+
+log = logging.getLogger(__name__)
+
+
+class SettingsSync(object):
+    """
+    Keeps cached guild settings in sync across bot processes.
+
+    Every update of a guild's settings is announced with a ``NOTIFY`` on the
+    :attr:`CHANNEL` channel, carrying the guild ID and the changed fields.
+    Each process listens on one dedicated connection, opened with
+    :meth:`senko.Pool.connect` outside the pool, and applies announced
+    changes to its cached settings, or evicts them if a change cannot be
+    applied. Announcements of the process itself are ignored.
+
+    Notifications sent while the listening connection is lost cannot be
+    recovered, so all cached guild settings are reloaded after reconnecting.
+
+    Parameters
+    ----------
+    cog: cogs.settings.SettingsCog
+        The settings cog whose caches to keep in sync.
+    retry: Optional[float]
+        The time in seconds to wait before reconnecting after the listening
+        connection could not be established. Defaults to ``5.0``.
+
+    Attributes
+    ----------
+    origin: str
+        A unique ID of this process, used to ignore its own notifications.
+    """
+
+    #: The name of the notification channel.
+    CHANNEL = "guild_settings"
+
+    #: The guild settings fields that are announced.
+    FIELDS = ("prefix", "locale", "timezone", "last_joined")
+
+    def __init__(self, cog, *, retry=5.0):
+        self._cog = cog
+        self._bot = cog.bot
+        self._retry = retry
+        self._connection = None
+        self._task = None
+        self._closed = False
+        self.origin = uuid.uuid4().hex
+
+    @property
+    def listening(self):
+        """bool: Whether the listening connection is established."""
+        return self._connection is not None and not self._connection.is_closed()
+
+    def start(self):
+        """
+        Start listening for notifications in the background.
+        """
+        if self._task is None:
+            self._task = self._bot.loop.create_task(self._listen(reload=False))
+
+    async def stop(self):
+        """
+        Stop listening and close the listening connection.
+        """
+        self._closed = True
+
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+        conn, self._connection = self._connection, None
+        if conn is not None:
+            conn.remove_termination_listener(self._on_termination)
+            if not conn.is_closed():
+                await conn.remove_listener(self.CHANNEL, self._on_notification)
+            await conn.close()
+
+    async def _listen(self, reload):
+        """
+        Open the listening connection, retrying until it succeeds.
+        """
+        while True:
+            try:
+                conn = await self._bot.db.connect()
+                try:
+                    await conn.add_listener(self.CHANNEL, self._on_notification)
+                except BaseException:
+                    conn.terminate()
+                    raise
+            except Exception as exc:
+                log.warning(f"Could not listen for settings notifications: {exc}")
+                await asyncio.sleep(self._retry)
+            else:
+                break
+
+        conn.add_termination_listener(self._on_termination)
+        self._connection = conn
+        self._task = None
+
+        if reload:
+            log.info("Reconnected settings listener, reloading guild settings.")
+            await self._cog._reload_guild_settings()
+
+    def _on_termination(self, conn):
+        self._connection = None
+        if not self._closed:
+            log.warning("Lost settings listener connection, reconnecting.")
+            self._task = self._bot.loop.create_task(self._listen(reload=True))
+
+    def _on_notification(self, conn, pid, channel, payload):
+        try:
+            data = json.loads(payload)
+            if data["origin"] == self.origin:
+                return
+
+            guild_id = data["guild"]
+            fields = self.decode(data["fields"])
+        except (ValueError, KeyError, TypeError) as exc:
+            log.warning(f"Received malformed settings notification: {exc}")
+            return
+
+        try:
+            self._cog._apply_guild_settings(guild_id, fields)
+        except Exception:
+            # Fields that cannot be applied invalidate the guild instead.
+            self._cog._evict_guild_settings(guild_id)
+
+    @staticmethod
+    def encode(fields):
+        """
+        Encode changed fields for a notification payload.
+
+        Parameters
+        ----------
+        fields: Dict[str, Any]
+            The changed fields.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The fields with datetimes converted to ISO 8601 strings.
+        """
+        return {
+            key: value.isoformat() if isinstance(value, datetime.datetime) else value
+            for key, value in fields.items()
+        }
+
+    @staticmethod
+    def decode(fields):
+        """
+        Decode changed fields from a notification payload.
+
+        Parameters
+        ----------
+        fields: Dict[str, Any]
+            The fields as encoded by :meth:`encode`.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The changed fields.
+        """
+        fields = dict(fields)
+        for key in ("last_joined",):
+            if fields.get(key) is not None:
+                fields[key] = datetime.datetime.fromisoformat(fields[key])
+        return fields
+
+    async def notify(self, guild_id, connection=None, **fields):
+        r"""
+        Announce changed settings of a guild to the other processes.
+
+        When called within a transaction, the notification is delivered
+        once the transaction is committed.
+
+        Parameters
+        ----------
+        guild_id: int
+            The ID of the guild.
+        connection: Optional[asyncpg.connection.Connection]
+            A database connection to use.
+        \*\*fields
+            The changed fields and their new values.
+        """
+        payload = json.dumps(
+            dict(origin=self.origin, guild=guild_id, fields=self.encode(fields))
+        )
+        async with utils.db.maybe_acquire(self._bot.db, connection) as conn:
+            await conn.execute("SELECT pg_notify($1, $2);", self.CHANNEL, payload)
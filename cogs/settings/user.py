@@ -0,0 +1,23 @@
+from .model import Field, SettingsModel, validate_length, validate_timezone
+
+
+class UserSettings(SettingsModel):
+    """
+    A database model that represents the settings for a user.
+
+    Unset settings are ``None``, in which case the settings of the
+    channel or guild apply.
+
+    You should not create this yourself and instead get instances
+    of this class through :meth:`~cogs.settings.SettingsCog.get_user_settings`.
+    """
+
+    __slots__ = ()
+    __table__ = "user_settings"
+    __key__ = "user"
+
+    #: Optional[str]: The ID of the user's locale.
+    locale = Field("TEXT", validator=validate_length(16))
+
+    #: Optional[str]: The name of the user's timezone.
+    timezone = Field("TEXT", validator=validate_timezone)
@@ -0,0 +1,263 @@
+import asyncio
+import datetime
+import logging
+
+import utils
+
+log = logging.getLogger(__name__)
+
+
+class SettingsWriter(object):
+    """
+    A write-behind queue for guild settings.
+
+    Updates are coalesced per guild, so only the latest value of each
+    column is written, and flushed in batches with one statement per
+    set of updated columns. The ``last_joined`` stamps of joined guilds
+    are flushed with a single upsert.
+
+    The queue is flushed once it holds updates for ``max_pending`` guilds,
+    ``delay`` seconds after the first update was queued, and when the
+    writer is closed. Failed flushes are queued again, without replacing
+    newer values, and retried with the next flush.
+
+    Queued values can be read with :meth:`get` until they were written,
+    so values read from the database can be brought up to date.
+
+    When :attr:`sync` is set, the written settings are announced to the
+    other processes in the transaction that writes them, so they are only
+    delivered once the new values can be read.
+
+    Parameters
+    ----------
+    bot: senko.Senko
+        The bot instance whose database pool is used for flushes.
+    max_pending: Optional[int]
+        The number of guilds with queued updates that triggers a flush.
+        Defaults to ``100``.
+    delay: Optional[float]
+        The maximum time in seconds that updates stay queued.
+        Defaults to ``5.0``.
+
+    Attributes
+    ----------
+    sync: Optional[~cogs.settings.SettingsSync]
+        The settings sync to announce written settings with.
+    """
+
+    def __init__(self, bot, *, max_pending=100, delay=5.0):
+        self._bot = bot
+        self.sync = None
+        self._max_pending = max_pending
+        self._delay = delay
+
+        # Guild ID -> {column: value} of queued updates.
+        self._pending = dict()
+
+        # Queued updates that are currently being written.
+        self._flushing = dict()
+
+        self._timer = None
+        self._task = None
+        self._backoff = False
+        self._lock = asyncio.Lock()
+        self._closed = False
+
+    @property
+    def pending(self):
+        """int: The number of guilds with queued or unwritten updates."""
+        return len(self._pending.keys() | self._flushing.keys())
+
+    def get(self, guild_id):
+        """
+        Get the queued updates of a guild.
+
+        Parameters
+        ----------
+        guild_id: int
+            The ID of the guild.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The queued values by column name. Empty if there are none.
+        """
+        values = dict(self._flushing.get(guild_id, ()))
+        values.update(self._pending.get(guild_id, ()))
+        return values
+
+    def update(self, guild_id, **options):
+        r"""
+        Queue an update for the settings of a guild.
+
+        Parameters
+        ----------
+        guild_id: int
+            The ID of the guild.
+        \*\*options
+            The columns to update and their new values.
+        """
+        self._pending.setdefault(guild_id, dict()).update(options)
+        self._schedule()
+
+    def join(self, guild_id, when=None):
+        """
+        Queue the ``last_joined`` stamp of a guild.
+
+        If the guild has no settings when the stamp is written, default
+        settings are created for it.
+
+        Parameters
+        ----------
+        guild_id: int
+            The ID of the guild.
+        when: Optional[datetime.datetime]
+            The time at which the guild was joined. Defaults to now.
+        """
+        if when is None:
+            when = datetime.datetime.now(datetime.timezone.utc)
+
+        self.update(guild_id, last_joined=when)
+
+    def _schedule(self):
+        """
+        Schedule a flush according to the size and time thresholds.
+        """
+        if self._closed or self._task is not None or self._backoff:
+            return
+
+        if len(self._pending) >= self._max_pending:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = self._bot.loop.call_later(self._delay, self._start_flush)
+
+    def _start_flush(self):
+        self._timer = None
+        self._backoff = False
+        if self._task is None:
+            self._task = self._bot.loop.create_task(self._run_flush())
+
+    async def _run_flush(self):
+        failed = False
+        try:
+            await self.flush()
+        except Exception as exc:
+            log.exception("Could not flush guild settings!", exc_info=exc)
+            failed = True
+        finally:
+            self._task = None
+
+        if not self._pending or self._closed:
+            return
+
+        # Retry failed flushes after the delay, regardless of the queue size.
+        if failed:
+            self._backoff = True
+            self._timer = self._bot.loop.call_later(self._delay, self._start_flush)
+        else:
+            self._schedule()
+
+    async def flush(self, connection=None):
+        """
+        Write all queued updates to the database.
+
+        Parameters
+        ----------
+        connection: Optional[asyncpg.connection.Connection]
+            An optional database connection to use.
+
+        Returns
+        -------
+        int
+            The number of guilds whose updates were written.
+        """
+        async with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            if not self._pending:
+                return 0
+
+            self._flushing, self._pending = self._pending, dict()
+            try:
+                async with utils.db.maybe_acquire(self._bot.db, connection) as conn:
+                    async with conn.transaction():
+                        await self._write(conn, self._flushing)
+                        if self.sync is not None:
+                            await self._notify(conn, self._flushing)
+            except BaseException:
+                # Queue the batch again without replacing newer values.
+                for guild_id, values in self._flushing.items():
+                    values.update(self._pending.get(guild_id, ()))
+                    self._pending[guild_id] = values
+                raise
+            else:
+                utils.db.pin_reads(self._bot.db, *self._flushing)
+            finally:
+                count = len(self._flushing)
+                self._flushing = dict()
+
+            return count
+
+    async def _write(self, conn, batch):
+        """
+        Write a batch of updates using a connection.
+        """
+        # Joins create missing rows, so write them first.
+        joins = [
+            (guild_id, values["last_joined"])
+            for guild_id, values in batch.items()
+            if "last_joined" in values
+        ]
+
+        if joins:
+            query = """
+            INSERT INTO "guild_settings" ("guild", "last_joined")
+            SELECT * FROM UNNEST($1::BIGINT[], $2::TIMESTAMPTZ[])
+            ON CONFLICT ("guild") DO UPDATE
+            SET "last_joined"=EXCLUDED."last_joined";
+            """
+            await conn.execute(query, *map(list, zip(*joins)))
+
+        # Group the remaining updates by their set of columns.
+        groups = dict()
+        for guild_id, values in batch.items():
+            columns = tuple(sorted(c for c in values if c != "last_joined"))
+            if columns:
+                row = (guild_id, *(values[column] for column in columns))
+                groups.setdefault(columns, []).append(row)
+
+        skeleton = 'UPDATE "guild_settings" SET {assignments} WHERE "guild"=$1;'
+        for columns, rows in groups.items():
+            assignments = ", ".join(f'"{c}"=${pos}' for pos, c in enumerate(columns, 2))
+            await conn.executemany(skeleton.format(assignments=assignments), rows)
+
+    async def _notify(self, conn, batch):
+        """
+        Announce a batch of updates using a connection.
+        """
+        for guild_id, values in batch.items():
+            fields = {k: v for k, v in values.items() if k in self.sync.FIELDS}
+            if fields:
+                await self.sync.notify(guild_id, conn, **fields)
+
+    def __contains__(self, guild_id):
+        return guild_id in self._pending or guild_id in self._flushing
+
+    def __len__(self):
+        return self.pending
+
+    async def close(self):
+        """
+        Stop scheduling flushes and write all queued updates.
+        """
+        self._closed = True
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if self._task is not None:
+            await asyncio.shield(self._task)
+
+        await self.flush()
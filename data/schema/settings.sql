@@ -6,7 +6,42 @@ CREATE TABLE IF NOT EXISTS "guild_settings" (
     "prefix" VARCHAR(10),
     "locale" TEXT,
     "timezone" TEXT,
-    "first_joined" TIMESTAMPTZ DEFAULT (NOW() AT TIME ZONE 'UTC'),
-    "last_joined" TIMESTAMPTZ DEFAULT (NOW() AT TIME ZONE 'UTC'),
+    "first_joined" TIMESTAMPTZ DEFAULT NOW(),
+    "last_joined" TIMESTAMPTZ DEFAULT NOW(),
     CONSTRAINT pk_guild_settings PRIMARY KEY ("guild")
 );
+
+/* User Settings */
+CREATE TABLE IF NOT EXISTS "user_settings" (
+    "user" BIGINT NOT NULL,
+    "locale" TEXT,
+    "timezone" TEXT,
+    CONSTRAINT pk_user_settings PRIMARY KEY ("user")
+);
+
+/* Channel Settings */
+CREATE TABLE IF NOT EXISTS "channel_settings" (
+    "channel" BIGINT NOT NULL,
+    "locale" TEXT,
+    CONSTRAINT pk_channel_settings PRIMARY KEY ("channel")
+);
+
+/* Departed Guilds */
+ALTER TABLE "guild_settings" ADD COLUMN IF NOT EXISTS "last_left" TIMESTAMPTZ;
+
+/* Join times are compared with last_left, so they must not depend on the
+   time zone of the session that wrote them. */
+ALTER TABLE "guild_settings" ALTER COLUMN "first_joined" SET DEFAULT NOW();
+ALTER TABLE "guild_settings" ALTER COLUMN "last_joined" SET DEFAULT NOW();
+
+CREATE TABLE IF NOT EXISTS "guild_settings_archive" (
+    "guild" BIGINT NOT NULL,
+    "prefix" VARCHAR(10),
+    "locale" TEXT,
+    "timezone" TEXT,
+    "first_joined" TIMESTAMPTZ,
+    "last_joined" TIMESTAMPTZ,
+    "last_left" TIMESTAMPTZ,
+    "archived" TIMESTAMPTZ DEFAULT NOW(),
+    CONSTRAINT pk_guild_settings_archive PRIMARY KEY ("guild")
+);
@@ -98,7 +98,15 @@ class Launcher:
         # Creates the asyncpg connection pool.
         self.log.info("Creating database connection pool.")
         try:
-            self.db = await senko.init_db(**config.database_credentials)
+            options = dict(getattr(config, "database_pool", None) or ())
+
+            # Replicas may also be given with the pool options, but the
+            # dedicated setting takes precedence.
+            replicas = options.pop("replicas", None)
+            replicas = getattr(config, "database_replicas", None) or replicas
+            self.db = await senko.init_db(
+                **config.database_credentials, **options, replicas=replicas
+            )
         except Exception as exc:
             self.log.exception("Could not connect to database!", exc_info=exc)
             raise
@@ -5,8 +5,9 @@ __copyright__   = "Copyright 2020 Maxee"
 __version__     = "1.0.0"
 
 # Utilities
-from .db import init_db
+from .db import init_db, Pool, PoolStats, QueryStats, StatementStats
 from .colour import Colour
+from .prefix import PrefixMatcher
 
 # Assets
 from .assets import Emojis, Images
@@ -20,4 +21,4 @@ from . import converters
 from .context import CommandContext, PartialContext
 from .command import Command, Group, command, group
 from .cog import Cog
-from .bot import Senko, command_prefix
+from .bot import Senko, MessageSettings, command_prefix
@@ -1,3 +1,4 @@
+import contextvars
 import logging
 import os
 import datetime
@@ -6,6 +7,44 @@ import discord
 from discord.ext import commands
 
 import senko
+import utils
+
+
+class MessageSettings(object):
+    """
+    The settings that apply to a message, resolved once per message.
+
+    Instances of this class are created by :meth:`Senko.resolve_message_settings`.
+
+    Attributes
+    ----------
+    message: discord.Message
+        The message the settings were resolved for.
+    prefix: str
+        The command prefix. Either the guild prefix or :data:`config.prefix`.
+    locale_id: str
+        The ID of the locale. Either the guild locale or :data:`config.locale`.
+    prefixes: List[str]
+        The prefixes to pass to discord.py. This is the matched prefix if
+        the message starts with one, and all prefixes that can be used to
+        invoke commands, including mentions, otherwise.
+    """
+
+    __slots__ = ("message", "prefix", "locale_id", "prefixes")
+
+    def __init__(self, message, prefix, locale_id, prefixes):
+        self.message = message
+        self.prefix = prefix
+        self.locale_id = locale_id
+        self.prefixes = prefixes
+
+    def __repr__(self):
+        return f"<MessageSettings prefix={self.prefix!r} locale_id={self.locale_id!r}>"
+
+
+# The settings of the message whose context is currently being created.
+# Allows command_prefix to reuse the settings resolved by Senko.get_context.
+_message_settings = contextvars.ContextVar("message_settings", default=None)
 
 
 async def command_prefix(bot, msg):
@@ -16,17 +55,15 @@ async def command_prefix(bot, msg):
     get the command prefix for guilds.
 
     Allows the bot to be mentioned instead of using the prefix.
-    """
-    prefix = None
-    cog = bot.get_cog("settings")
-    if msg.guild and cog:
-        settings = await cog.get_guild_settings(msg.guild)
-        prefix = settings.prefix
 
-    if prefix is None:
-        prefix = bot.config.prefix
+    When called while :meth:`Senko.get_context` creates the context for
+    a message, the settings resolved for the message are reused.
+    """
+    resolved = _message_settings.get()
+    if resolved is None or resolved.message is not msg:
+        resolved = await bot.resolve_message_settings(msg)
 
-    return commands.when_mentioned_or(prefix)(bot, msg)
+    return resolved.prefixes
 
 
 class Senko(senko.LocaleMixin, commands.AutoShardedBot):
@@ -58,6 +95,8 @@ class Senko(senko.LocaleMixin, commands.AutoShardedBot):
         The asset library for images.
     logging: senko.Logging
         The internal logging module.
+    reaper: utils.caching.CacheReaper
+        Removes expired items from named caches in the background.
     """
 
     def __init__(self, db, session, loop):
@@ -118,6 +157,13 @@ class Senko(senko.LocaleMixin, commands.AutoShardedBot):
         # Logging
         self.logging = senko.Logging(self)
 
+        # Caches
+        self.reaper = utils.caching.CacheReaper()
+        self.reaper.start(loop)
+
+        # Compiled prefix matchers, shared by guilds with the same prefixes.
+        self._prefix_matchers = utils.caching.LRUCache(1024, name="senko.prefixes")
+
         # Extensions
         for ext in self.config.extensions:
             self.load_extension(f"cogs.{ext}")
@@ -211,6 +257,9 @@ class Senko(senko.LocaleMixin, commands.AutoShardedBot):
         # Remove cog name mappings for locale.
         self._cog_names.pop(locale.language, None)
 
+        # Drop cached values derived from the locale.
+        utils.caching.invalidate_tag(f"locale:{locale.language}")
+
     def _add_cog_names(self, cog, locale):
         """
         Add the localization mappings for a cog.
@@ -337,6 +386,137 @@ class Senko(senko.LocaleMixin, commands.AutoShardedBot):
 
     # Context methods
 
+    async def _get_options(self, channel, user):
+        """
+        Get the prefix and locale ID that apply to a user in a channel.
+
+        Parameters
+        ----------
+        channel: discord.abc.Messageable
+            The channel to get the settings for.
+        user: Union[discord.User, discord.Member]
+            The user to get the settings for.
+
+        Returns
+        -------
+        Tuple[str, str]
+            The prefix and locale ID. These are resolved from the guild,
+            channel and user settings, and are the defaults if the
+            settings cog is not loaded.
+        """
+        try:
+            cog = self.cogs["settings"]
+        except KeyError:
+            return self.config.prefix, self.config.locale
+
+        prefix, locale_id, _ = await cog.get_options(channel, user)
+        return prefix, locale_id
+
+    async def _get_guild_options(self, channel):
+        """
+        Get the prefix and locale ID of the guild of a channel.
+
+        Unlike :meth:`_get_options`, user and channel settings are ignored
+        and the database is never queried, so this is served from the
+        settings store.
+
+        Parameters
+        ----------
+        channel: discord.abc.Messageable
+            The channel to get the settings for.
+
+        Returns
+        -------
+        Optional[Tuple[str, str]]
+            The prefix and locale ID of the guild, or the defaults outside
+            of guilds or if the settings cog is not loaded. ``None`` if the
+            settings of the guild are not loaded yet.
+        """
+        guild = getattr(channel, "guild", None)
+        cog = self.cogs.get("settings")
+        if guild is None or cog is None:
+            return self.config.prefix, self.config.locale
+
+        options = await cog.get_guild_options(guild, fetch=False)
+        if options is None:
+            return None
+
+        prefix, locale_id, _ = options
+        return prefix, locale_id
+
+    async def resolve_message_settings(self, message):
+        """
+        Resolve the settings that apply to a message.
+
+        :meth:`get_context` resolves the settings once and shares them with
+        :func:`command_prefix`. Every message costs at most one settings
+        lookup. The prefix is matched against the guild settings in the
+        settings store first, and the user and channel settings are only
+        looked up for messages that start with a prefix, so ordinary
+        messages are served without querying the database. For guilds
+        whose settings are not loaded yet, the guild, channel and user
+        settings are looked up together before matching the prefix.
+
+        Parameters
+        ----------
+        message: discord.Message
+            The message to resolve the settings for.
+
+        Returns
+        -------
+        senko.MessageSettings
+            The resolved settings.
+        """
+        options = await self._get_guild_options(message.channel)
+        if options is None:
+            options = await self._get_options(message.channel, message.author)
+            resolved = True
+        else:
+            resolved = False
+
+        # The prefix is always the guild prefix. Match the prefixes once, so
+        # discord.py only has to test the match.
+        prefix, locale_id = options
+        matcher = self.get_prefix_matcher((prefix,))
+        matched = matcher.match(message.content)
+        if matched is None:
+            return MessageSettings(message, prefix, locale_id, list(matcher.prefixes))
+
+        # Only messages that may invoke a command need the full settings.
+        if not resolved:
+            prefix, locale_id = await self._get_options(message.channel, message.author)
+        return MessageSettings(message, prefix, locale_id, [matched])
+
+    def get_prefix_matcher(self, prefixes):
+        """
+        Get the prefix matcher for a set of prefixes.
+
+        The matcher also matches mentions of the bot. Matchers are cached by
+        their prefixes, so guilds with the same prefix share a matcher, and
+        changing the prefix of a guild uses the matcher of the new prefix.
+
+        Parameters
+        ----------
+        prefixes: Tuple[str, ...]
+            The command prefixes.
+
+        Returns
+        -------
+        senko.PrefixMatcher
+            The prefix matcher.
+        """
+        user_id = self.user.id
+        key = (user_id, *prefixes)
+
+        matcher = self._prefix_matchers.get(key)
+        if matcher is None:
+            matcher = senko.PrefixMatcher(
+                (f"<@{user_id}> ", f"<@!{user_id}> ", *prefixes)
+            )
+            self._prefix_matchers.put(key, matcher)
+
+        return matcher
+
     async def get_context(self, message, cls=senko.CommandContext):
         """
         Get a command context for the given message.
@@ -357,26 +537,17 @@ class Senko(senko.LocaleMixin, commands.AutoShardedBot):
             The command context for the given message. The type
             of this may change depending on the ``cls`` argument.
         """
-        context = await super().get_context(message, cls=cls)
+        # Resolve the settings once and share them with command_prefix.
+        resolved = await self.resolve_message_settings(message)
+        token = _message_settings.set(resolved)
+        try:
+            context = await super().get_context(message, cls=cls)
+        finally:
+            _message_settings.reset(token)
 
         # Set custom attributes.
-        prefix = self.config.prefix
-        locale_id = self.config.locale
-
-        if isinstance(message.channel, discord.TextChannel):
-            try:
-                cog = self.cogs["settings"]
-            except KeyError:
-                pass
-            else:
-                settings = await cog.get_guild_settings(message.channel.guild)
-                prefix = settings.prefix
-                locale_id = settings.locale
-
-        locale = self.locales.get(locale_id)
-
-        context._default_prefix = prefix
-        context._locale = locale
+        context._default_prefix = resolved.prefix
+        context._locale = self.locales.get(resolved.locale_id)
 
         # Ensure that commands are invoked using the locale.
         invoker = context.invoked_with
@@ -404,23 +575,41 @@ class Senko(senko.LocaleMixin, commands.AutoShardedBot):
             A partial context. The type of this may change
             depending on the ``cls`` argument.
         """
-        prefix = self.config.prefix
-        locale_id = self.config.locale
-
-        if isinstance(channel, discord.TextChannel):
-            try:
-                cog = self.cogs["settings"]
-            except KeyError:
-                pass
-            else:
-                settings = await cog.get_guild_settings(channel.guild)
-                prefix = settings.prefix
-                locale_id = settings.locale
-
+        prefix, locale_id = await self._get_options(channel, user)
         locale = self.locales.get(locale_id)
 
         return cls(self, user, channel, locale, prefix)
 
+    async def invoke(self, ctx):
+        """
+        Invoke the command of a context.
+
+        While the command runs, database queries are attributed to its cog
+        and command in the query statistics of the pool, see
+        :data:`senko.db.query_origin`. Once it has finished, the database
+        connection of the context, if any, is released.
+
+        Parameters
+        ----------
+        ctx: senko.CommandContext
+            The context to invoke.
+        """
+        command = ctx.command
+        if command is None:
+            return await super().invoke(ctx)
+
+        cog = command.cog.qualified_name if command.cog is not None else "-"
+        token = senko.db.query_origin.set((cog, command.qualified_name))
+        try:
+            await super().invoke(ctx)
+        finally:
+            senko.db.query_origin.reset(token)
+
+            # Error handlers dispatched as events run after this, so they
+            # must not acquire a connection that is never released.
+            ctx._finished = True
+            await ctx.release()
+
     # Runtime methods
 
     async def close(self, code=None):
@@ -440,6 +629,15 @@ class Senko(senko.LocaleMixin, commands.AutoShardedBot):
 
         self.log.info(f"Closing with exit code {self._exit_code}.")
 
+        self.reaper.stop()
+
+        # Write queued settings before the pool is closed.
+        if self.settings is not None:
+            try:
+                await self.settings.close()
+            except Exception as exc:
+                self.log.exception("Could not write queued settings!", exc_info=exc)
+
         await self.db.close()
         await self.session.close()
         await super().close()
@@ -1,3 +1,4 @@
+import asyncio
 from datetime import datetime, timezone
 
 import babel
@@ -19,6 +20,11 @@ class CommandContext(commands.Context):
 
     * :attr:`senko.CommandContext.locale`
     * :attr:`senko.CommandContext.default_Prefix`
+
+    Commands that make several queries can share one database connection
+    through :meth:`acquire` and :meth:`transaction`. The connection is
+    acquired on first use and released by :meth:`senko.Senko.invoke` once
+    the command has finished, even if it raised an error.
     """
 
     def __init__(self, **kwargs):
@@ -31,6 +37,8 @@ class CommandContext(commands.Context):
 
         # Set new variables.
         self._connection = None
+        self._acquire_lock = None
+        self._finished = False
 
     @property
     def loop(self):
@@ -53,6 +61,101 @@ class CommandContext(commands.Context):
         """
         return self.bot.db
 
+    @property
+    def connection(self):
+        """
+        Optional[asyncpg.connection.Connection]: The database connection of
+        this context, or ``None`` if none was acquired with :meth:`acquire`.
+
+        Helpers that take an optional ``connection`` should be passed this,
+        so they reuse the connection of the command if there is one.
+        """
+        return self._connection
+
+    async def acquire(self):
+        """
+        Get the database connection of this context.
+
+        The connection is acquired from the pool on the first call and
+        returned by all further calls, so that every query of a command
+        uses the same connection, including calls that are made while
+        the connection is still being acquired. It is released when the
+        command has finished and must not be released manually.
+
+        .. note::
+
+            A connection can only run one query at a time. Queries that
+            run concurrently, e.g. through :func:`asyncio.gather`, need
+            connections of their own.
+
+        Raises
+        ------
+        RuntimeError
+            When the invocation of this context has already finished.
+
+        Returns
+        -------
+        asyncpg.connection.Connection
+            The database connection of this context.
+        """
+        if self._connection is not None:
+            return self._connection
+
+        # Concurrent calls wait for the first one, so that only a single
+        # connection is taken from the pool.
+        if self._acquire_lock is None:
+            self._acquire_lock = asyncio.Lock()
+
+        async with self._acquire_lock:
+            if self._connection is None:
+                if self._finished:
+                    raise RuntimeError("The invocation of this context has finished!")
+                self._connection = await self.bot.db.acquire()
+
+        return self._connection
+
+    def transaction(self, **kwargs):
+        r"""
+        Start a transaction on the database connection of this context.
+
+        Acquires the connection of this context if necessary. Nested
+        transactions are created as savepoints.
+
+        Examples
+        --------
+
+        .. code-block:: python3
+
+            async with ctx.transaction() as conn:
+                settings = await cog.get_guild_settings(ctx.guild, connection=conn)
+                await settings.update(connection=conn, prefix="!")
+
+        Parameters
+        ----------
+        \*\*kwargs
+            Keyword arguments to pass into
+            :meth:`asyncpg.connection.Connection.transaction`.
+
+        Returns
+        -------
+        AsyncContextManager[asyncpg.connection.Connection]
+            A context manager that yields the connection within the
+            transaction.
+        """
+        return _ContextTransaction(self, kwargs)
+
+    async def release(self):
+        """
+        Release the database connection of this context, if any.
+
+        This is called by :meth:`senko.Senko.invoke` once the command has
+        finished and only needs to be called manually for contexts that are
+        not invoked, such as partial contexts.
+        """
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            await self.bot.db.release(connection)
+
     @discord.utils.cached_property
     def user(self):
         """
@@ -285,3 +388,28 @@ class CommandContext(commands.Context):
         """
         prompt = utils.io.YesNo(self, *args, **kwargs)
         return await prompt.run()
+
+
+class _ContextTransaction(object):
+    """
+    A transaction on the database connection of a context.
+    """
+
+    __slots__ = ("ctx", "kwargs", "transaction")
+
+    def __init__(self, ctx, kwargs):
+        self.ctx = ctx
+        self.kwargs = kwargs
+        self.transaction = None
+
+    async def __aenter__(self):
+        connection = await self.ctx.acquire()
+        self.transaction = connection.transaction(**self.kwargs)
+        await self.transaction.start()
+        return connection
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            await self.transaction.commit()
+        else:
+            await self.transaction.rollback()
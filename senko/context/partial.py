@@ -58,6 +58,8 @@ class PartialContext(CommandContext):
         self._locale = locale
         self._default_prefix = prefix
         self._connection = None
+        self._acquire_lock = None
+        self._finished = False
 
     async def _get_channel(self):
         # Helper method required by discord.abc.Messageable
@@ -1,10 +1,302 @@
+import re
 import json
+import time
+import bisect
+import asyncio
+import logging
+import functools
+import contextvars
+
 import asyncpg
 
-__all__ = ("init_db", )
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+__all__ = (
+    "init_db",
+    "init_connection",
+    "get_serializer",
+    "load_json",
+    "JSONSerializer",
+    "JSONCodec",
+    "DeferredJSON",
+    "normalize_query",
+    "Pool",
+    "PoolStats",
+    "QueryStats",
+    "StatementStats",
+    "query_origin",
+)
+
+log = logging.getLogger("senko.db")
+
+#: The ``(cog, command)`` on whose behalf queries are currently made, set by
+#: :meth:`senko.Senko.invoke` while a command runs.
+query_origin = contextvars.ContextVar("query_origin", default=None)
+
+# String and numeric literals, replaced when normalizing statements.
+_LITERALS = re.compile(r"'(?:[^']|'')*'|(?<![\w$])\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+# The number of normalized statements remembered before forgetting all.
+_MAX_NORMALIZED = 4096
+
+# The minimum number of pins before expired pins are dropped.
+_MIN_PIN_SWEEP = 1024
+
+# Options of asyncpg.create_pool that do not apply to single connections.
+_POOL_OPTIONS = frozenset(
+    ("min_size", "max_size", "max_queries", "max_inactive_connection_lifetime")
+)
+
+#: The version byte that starts every value in the binary ``JSONB`` format.
+JSONB_VERSION = b"\x01"
+
+#: Upper bounds in seconds of the buckets of the acquire wait histogram.
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class JSONSerializer(object):
+    """
+    A pair of functions that convert between objects and UTF-8 encoded JSON.
+
+    Parameters
+    ----------
+    name: str
+        The name of the serializer.
+    dumps: Callable[[Any], bytes]
+        The function that serializes an object.
+    loads: Callable[[bytes], Any]
+        The function that deserializes an object.
+    """
+
+    __slots__ = ("name", "dumps", "loads")
+
+    def __init__(self, name, dumps, loads):
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+
+    def __repr__(self):
+        return f"<JSONSerializer name={self.name!r}>"
+
+
+def _json_dumps(value):
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+#: The available serializers by name. ``orjson`` is only available if the
+#: :mod:`orjson` package is installed.
+SERIALIZERS = dict(json=JSONSerializer("json", _json_dumps, json.loads))
+
+if orjson is not None:
+    # Non-string keys are converted like the json module does.
+    SERIALIZERS["orjson"] = JSONSerializer(
+        "orjson",
+        functools.partial(orjson.dumps, option=orjson.OPT_NON_STR_KEYS),
+        orjson.loads,
+    )
+
+
+def get_serializer(serializer=None):
+    """
+    Get a JSON serializer.
+
+    Parameters
+    ----------
+    serializer: Optional[Union[str, JSONSerializer]]
+        The name of a serializer in :data:`SERIALIZERS` or a serializer,
+        which is returned as is. Defaults to ``orjson`` if it is installed
+        and ``json`` otherwise.
+
+    Raises
+    ------
+    ValueError
+        When there is no serializer with the given name.
+
+    Returns
+    -------
+    JSONSerializer
+        The serializer.
+    """
+    if isinstance(serializer, JSONSerializer):
+        return serializer
+    if serializer is None:
+        return SERIALIZERS.get("orjson", SERIALIZERS["json"])
+
+    try:
+        return SERIALIZERS[serializer]
+    except KeyError:
+        raise ValueError(
+            f"Unknown or unavailable JSON serializer {serializer!r}!"
+        ) from None
+
+
+class DeferredJSON(object):
+    """
+    A ``JSONB`` value too large to be decoded on the event loop.
+
+    Awaiting the value decodes it in the default executor of the loop,
+    see :func:`load_json`.
+
+    Parameters
+    ----------
+    data: bytes
+        The value in the binary ``JSONB`` format.
+    loads: Callable[[bytes], Any]
+        The function that deserializes the value.
+    """
+
+    __slots__ = ("data", "_loads")
+
+    def __init__(self, data, loads):
+        self.data = data
+        self._loads = loads
+
+    def _decode(self):
+        return self._loads(self.data[1:])
+
+    async def load(self):
+        """
+        Decode the value in the default executor of the loop.
+
+        Returns
+        -------
+        Any
+            The decoded value.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._decode)
+
+    def __await__(self):
+        return self.load().__await__()
+
+    def __len__(self):
+        return len(self.data) - 1
 
+    def __repr__(self):
+        return f"<DeferredJSON size={len(self)}>"
 
-async def init_connection(connection):
+
+async def load_json(value):
+    """
+    Get the decoded value of a ``JSONB`` column.
+
+    Parameters
+    ----------
+    value: Any
+        The value of the column, as returned by the codec.
+
+    Returns
+    -------
+    Any
+        The value itself, or the decoded value if it is :class:`DeferredJSON`.
+    """
+    if isinstance(value, DeferredJSON):
+        return await value.load()
+    return value
+
+
+class JSONCodec(object):
+    """
+    A codec for ``JSONB`` columns in the binary wire format.
+
+    Values are sent and received as a version byte followed by UTF-8
+    encoded JSON, which saves the server the conversion to and from
+    text. Large values can be returned as :class:`DeferredJSON` instead,
+    so they are decoded off the event loop when they are awaited.
+
+    Parameters
+    ----------
+    serializer: Optional[Union[str, JSONSerializer]]
+        The serializer to use, see :func:`get_serializer`.
+    offload_threshold: Optional[int]
+        The size in bytes above which values are returned as
+        :class:`DeferredJSON`. ``None`` decodes all values immediately.
+
+    Raises
+    ------
+    ValueError
+        When there is no serializer with the given name.
+    """
+
+    __slots__ = ("serializer", "offload_threshold", "_dumps", "_loads")
+
+    def __init__(self, serializer=None, offload_threshold=None):
+        self.serializer = get_serializer(serializer)
+        self.offload_threshold = offload_threshold
+        self._dumps = self.serializer.dumps
+        self._loads = self.serializer.loads
+
+    def encode(self, value):
+        """
+        Encode a value into the binary ``JSONB`` format.
+
+        Parameters
+        ----------
+        value: Any
+            The value to encode.
+
+        Returns
+        -------
+        bytes
+            The encoded value.
+        """
+        return JSONB_VERSION + self._dumps(value)
+
+    def decode(self, data):
+        """
+        Decode a value from the binary ``JSONB`` format.
+
+        Parameters
+        ----------
+        data: bytes
+            The encoded value.
+
+        Raises
+        ------
+        ValueError
+            When the value has an unsupported format version.
+
+        Returns
+        -------
+        Union[Any, DeferredJSON]
+            The decoded value, or a :class:`DeferredJSON` for values
+            larger than the offload threshold.
+        """
+        if data[:1] != JSONB_VERSION:
+            raise ValueError(f"Unsupported JSONB format version {data[:1]!r}!")
+
+        threshold = self.offload_threshold
+        if threshold is not None and len(data) > threshold:
+            return DeferredJSON(data, self._loads)
+
+        return self._loads(data[1:])
+
+    async def register(self, connection):
+        """
+        Register the codec for ``JSONB`` columns of a connection.
+
+        Parameters
+        ----------
+        connection: asyncpg.connection.Connection
+            The connection to register the codec with.
+        """
+        await connection.set_type_codec(
+            "jsonb",
+            schema="pg_catalog",
+            encoder=self.encode,
+            decoder=self.decode,
+            format="binary",
+        )
+
+    def __repr__(self):
+        return f"<JSONCodec serializer={self.serializer.name!r}>"
+
+
+async def init_connection(connection, codec=None):
     """
     Initialize an :class:`asyncpg.connection.Connection` with
     custom type encoding and decoding for ``JSONB`` columns.
@@ -13,23 +305,748 @@ async def init_connection(connection):
     ----------
     connection: asyncpg.connection.Connection
         The connection to initalize.
+    codec: Optional[JSONCodec]
+        The codec for ``JSONB`` columns. Defaults to a :class:`JSONCodec`
+        with the default serializer.
+    """
+    await (codec or JSONCodec()).register(connection)
+
+
+class PoolStats(object):
     """
-    await connection.set_type_codec(
-        "jsonb",
-        schema="pg_catalog",
-        encoder=json.dumps,
-        decoder=json.loads,
-        format="text",
+    Counters collected by a :class:`Pool` about acquiring connections.
+
+    Parameters
+    ----------
+    buckets: Optional[Tuple[float, ...]]
+        The sorted upper bounds in seconds of the buckets of the wait
+        histogram. Defaults to :data:`WAIT_BUCKETS`.
+
+    Attributes
+    ----------
+    acquired: int
+        The number of connections acquired from the pool.
+    timeouts: int
+        The number of acquires that timed out.
+    wait_time: float
+        The total time in seconds spent waiting for connections.
+    max_wait_time: float
+        The longest time in seconds spent waiting for a connection.
+    buckets: Tuple[float, ...]
+        The upper bounds of the buckets of the wait histogram.
+    histogram: List[int]
+        The number of acquires per bucket. The last entry counts acquires
+        that took longer than the last bound, including timeouts.
+    """
+
+    __slots__ = (
+        "acquired",
+        "timeouts",
+        "wait_time",
+        "max_wait_time",
+        "buckets",
+        "histogram",
     )
 
+    def __init__(self, buckets=WAIT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.reset()
+
+    @property
+    def average_wait_time(self):
+        """
+        float: The average time in seconds spent waiting for a connection.
+        """
+        return self.wait_time / self.acquired if self.acquired else 0.0
+
+    def record_wait(self, elapsed, timeout=False):
+        """
+        Record the time spent waiting for a connection.
+
+        Parameters
+        ----------
+        elapsed: float
+            The time in seconds spent waiting.
+        timeout: Optional[bool]
+            Whether the acquire timed out. Defaults to ``False``.
+        """
+        if timeout:
+            self.timeouts += 1
+        else:
+            self.acquired += 1
+            self.wait_time += elapsed
+            self.max_wait_time = max(self.max_wait_time, elapsed)
+
+        self.histogram[bisect.bisect_left(self.buckets, elapsed)] += 1
+
+    def reset(self):
+        """
+        Reset all counters.
+        """
+        self.acquired = 0
+        self.timeouts = 0
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.histogram = [0] * (len(self.buckets) + 1)
+
+    def to_dict(self):
+        """
+        Get the statistics as a dictionary.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The statistics, with the histogram keyed by bucket bound.
+        """
+        bounds = [*self.buckets, float("inf")]
+        return dict(
+            acquired=self.acquired,
+            timeouts=self.timeouts,
+            wait_time=self.wait_time,
+            average_wait_time=self.average_wait_time,
+            max_wait_time=self.max_wait_time,
+            histogram=dict(zip(bounds, self.histogram)),
+        )
+
+    def __repr__(self):
+        return f"<PoolStats acquired={self.acquired} timeouts={self.timeouts}>"
 
-async def init_db(user, password, host, port, database):
+
+def normalize_query(query):
     """
-    Initialize an :class:`asyncpg.pool.Pool` with the given credentials.
+    Normalize a query into a statement for aggregation.
 
-    Every connection created using the returned pool uses custom encoders
-    and decoders for ``JSONB`` columns, returning and accepting dictionaries
-    and lists respectively.
+    Whitespace is collapsed and literals are replaced with ``?``, so
+    queries that only differ in formatting or inlined values share a
+    statement. Parameters such as ``$1`` are kept.
+
+    Parameters
+    ----------
+    query: str
+        The query to normalize.
+
+    Returns
+    -------
+    str
+        The normalized statement.
+    """
+    return _WHITESPACE.sub(" ", _LITERALS.sub("?", query)).strip()
+
+
+class StatementStats(object):
+    """
+    Latency of a single normalized statement.
+
+    Attributes
+    ----------
+    statement: str
+        The normalized statement.
+    calls: int
+        The number of times the statement was executed.
+    errors: int
+        The number of executions that raised an exception.
+    total_time: float
+        The total execution time in seconds.
+    max_time: float
+        The longest execution time in seconds.
+    origins: Dict[str, int]
+        The number of executions by the ``cog/command`` that made them.
+    """
+
+    __slots__ = (
+        "statement",
+        "calls",
+        "errors",
+        "total_time",
+        "max_time",
+        "origins",
+    )
+
+    def __init__(self, statement):
+        self.statement = statement
+        self.calls = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.origins = dict()
+
+    @property
+    def average_time(self):
+        """
+        float: The average execution time in seconds.
+        """
+        return self.total_time / self.calls if self.calls else 0.0
+
+    def to_dict(self):
+        """
+        Get the statistics as a dictionary.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The statistics, including the :attr:`average_time`.
+        """
+        return dict(
+            statement=self.statement,
+            calls=self.calls,
+            errors=self.errors,
+            total_time=self.total_time,
+            average_time=self.average_time,
+            max_time=self.max_time,
+            origins=dict(self.origins),
+        )
+
+    def __repr__(self):
+        return f"<StatementStats calls={self.calls} statement={self.statement!r}>"
+
+
+class QueryStats(object):
+    """
+    Latency of database queries, aggregated by normalized statement.
+
+    Instances of this class are created by every :class:`Pool` and
+    registered as query logger of each connection of the pool, see
+    :meth:`asyncpg.connection.Connection.add_query_logger`. Queries that
+    take longer than the slow query threshold are logged as warnings
+    to ``senko.db``, along with the cog and command that made them.
+
+    Parameters
+    ----------
+    slow_query_threshold: Optional[float]
+        The execution time in seconds from which queries are logged.
+        ``None`` disables the slow query log.
+
+    Attributes
+    ----------
+    slow_query_threshold: Optional[float]
+        The execution time in seconds from which queries are logged.
+    statements: Dict[str, StatementStats]
+        The statistics of each normalized statement.
+    """
+
+    __slots__ = ("slow_query_threshold", "statements", "_normalized")
+
+    def __init__(self, slow_query_threshold=None):
+        self.slow_query_threshold = slow_query_threshold
+        self.statements = dict()
+
+        # Query -> statement, as most queries are the same few strings.
+        self._normalized = dict()
+
+    def _normalize(self, query):
+        statement = self._normalized.get(query)
+        if statement is None:
+            if len(self._normalized) >= _MAX_NORMALIZED:
+                self._normalized.clear()
+            statement = self._normalized[query] = normalize_query(query)
+        return statement
+
+    def record(self, record):
+        """
+        Record an executed query.
+
+        Parameters
+        ----------
+        record: asyncpg.connection.LoggedQuery
+            The query passed to the query loggers of a connection.
+        """
+        statement = self._normalize(record.query)
+        stats = self.statements.get(statement)
+        if stats is None:
+            stats = self.statements[statement] = StatementStats(statement)
+
+        elapsed = record.elapsed
+        stats.calls += 1
+        stats.total_time += elapsed
+        stats.max_time = max(stats.max_time, elapsed)
+        if record.exception is not None:
+            stats.errors += 1
+
+        origin = query_origin.get()
+        origin = "/".join(origin) if origin is not None else "-"
+        stats.origins[origin] = stats.origins.get(origin, 0) + 1
+
+        threshold = self.slow_query_threshold
+        if threshold is not None and elapsed >= threshold:
+            log.warning(
+                f"Slow query ({elapsed * 1000:.1f} ms) by {origin}: {statement}"
+            )
+
+    def top(self, count=10, key="total_time"):
+        """
+        Get the statements with the highest value of a statistic.
+
+        Parameters
+        ----------
+        count: Optional[int]
+            The number of statements to return. Defaults to ``10``.
+        key: Optional[str]
+            The attribute of :class:`StatementStats` to sort by, such as
+            ``"calls"``, ``"average_time"`` or ``"max_time"``. Defaults
+            to ``"total_time"``.
+
+        Returns
+        -------
+        List[StatementStats]
+            The statements in descending order.
+        """
+        statements = sorted(
+            self.statements.values(),
+            key=lambda stats: getattr(stats, key),
+            reverse=True,
+        )
+        return statements[:count]
+
+    def reset(self):
+        """
+        Forget all recorded queries.
+        """
+        self.statements.clear()
+
+    def to_dict(self):
+        """
+        Get the statistics as a dictionary.
+
+        Returns
+        -------
+        Dict[str, Dict[str, Any]]
+            The statistics of each statement.
+        """
+        return {key: stats.to_dict() for key, stats in self.statements.items()}
+
+    def __repr__(self):
+        return f"<QueryStats statements={len(self.statements)}>"
+
+
+class _PoolAcquireContext(object):
+    """
+    The result of :meth:`Pool.acquire`, which can be awaited or used as an
+    asynchronous context manager like the one returned by asyncpg.
+    """
+
+    __slots__ = ("pool", "timeout", "connection")
+
+    def __init__(self, pool, timeout):
+        self.pool = pool
+        self.timeout = timeout
+        self.connection = None
+
+    async def __aenter__(self):
+        if self.connection is not None:
+            raise asyncpg.InterfaceError("a connection is already acquired")
+        self.connection = await self.pool._acquire(self.timeout)
+        return self.connection
+
+    async def __aexit__(self, *args):
+        connection, self.connection = self.connection, None
+        await self.pool.release(connection)
+
+    def __await__(self):
+        return self.pool._acquire(self.timeout).__await__()
+
+
+class Pool(object):
+    """
+    A wrapper of an :class:`asyncpg.pool.Pool` that applies a default
+    acquire timeout and records how long acquiring connections takes.
+
+    Pools are created by :func:`init_db` and should not be created directly.
+
+    Only the public interface of asyncpg is used: connections are acquired
+    through :meth:`asyncpg.pool.Pool.acquire`, and every connection of the
+    pool reports its queries to :attr:`query_stats` through a query logger
+    added when the connection is initialized. Attributes that are not
+    defined by this class are looked up on the wrapped pool.
+
+    The pool connects to the primary database and may hold pools of read
+    replicas in :attr:`replicas`. All queries made through the pool itself
+    go to the primary. Read-only queries can be routed to a replica with
+    :meth:`read`. After a write, :meth:`pin` routes the reads of the
+    written key to the primary for :attr:`pin_duration` seconds, so reads
+    never see data older than the write while replicas catch up.
+
+    Parameters
+    ----------
+    pool: asyncpg.pool.Pool
+        The pool to wrap.
+    acquire_timeout: Optional[float]
+        The default timeout in seconds for acquiring a connection, used
+        when :meth:`acquire` is called without a timeout. ``None`` waits
+        indefinitely.
+    query_stats: Optional[QueryStats]
+        The statistics the connections of the pool report their queries
+        to. Defaults to new statistics without a slow query log.
+    dsn: Optional[str]
+        The connection URI of the database, used by :meth:`connect`.
+    connect_kwargs: Optional[Dict[str, Any]]
+        Keyword arguments to pass into :func:`asyncpg.connect` in
+        :meth:`connect`.
+
+    Attributes
+    ----------
+    pool: asyncpg.pool.Pool
+        The wrapped pool.
+    acquire_timeout: Optional[float]
+        The default timeout in seconds for acquiring a connection.
+    stats: PoolStats
+        The acquire statistics of the pool.
+    query_stats: QueryStats
+        The query statistics of the pool.
+    replicas: List[Pool]
+        The pools of the read replicas.
+    pin_duration: float
+        The number of seconds for which reads of a key are routed to the
+        primary after it was written.
+    """
+
+    def __init__(
+        self,
+        pool,
+        *,
+        acquire_timeout=None,
+        query_stats=None,
+        dsn=None,
+        connect_kwargs=None,
+    ):
+        self.pool = pool
+        self._dsn = dsn
+        self._connect_kwargs = connect_kwargs or dict()
+        self.acquire_timeout = acquire_timeout
+        self.stats = PoolStats()
+        self.query_stats = query_stats if query_stats is not None else QueryStats()
+
+        self.replicas = []
+        self.pin_duration = 0.0
+        self._next_replica = 0
+
+        # Key -> monotonic time until which reads go to the primary.
+        self._pins = dict()
+        self._pin_sweep = _MIN_PIN_SWEEP
+
+    @classmethod
+    async def create(
+        cls,
+        dsn,
+        *,
+        init=None,
+        acquire_timeout=None,
+        slow_query_threshold=None,
+        **kwargs,
+    ):
+        r"""
+        Create a pool with :func:`asyncpg.create_pool`.
+
+        Parameters
+        ----------
+        dsn: str
+            The connection URI of the database.
+        init: Optional[Callable[[asyncpg.connection.Connection], Awaitable]]
+            A function to initialize new connections with.
+        acquire_timeout: Optional[float]
+            The default timeout in seconds for acquiring a connection.
+        slow_query_threshold: Optional[float]
+            The execution time in seconds from which queries are logged.
+            ``None`` disables the slow query log.
+        \*\*kwargs
+            Further keyword arguments to pass into
+            :func:`asyncpg.create_pool`.
+
+        Returns
+        -------
+        Pool
+            The connection pool.
+        """
+        query_stats = QueryStats(slow_query_threshold)
+
+        async def init_connection(connection):
+            connection.add_query_logger(query_stats.record)
+            if init is not None:
+                await init(connection)
+
+        pool = await asyncpg.create_pool(dsn, init=init_connection, **kwargs)
+        connect_kwargs = {k: v for k, v in kwargs.items() if k not in _POOL_OPTIONS}
+        return cls(
+            pool,
+            acquire_timeout=acquire_timeout,
+            query_stats=query_stats,
+            dsn=dsn,
+            connect_kwargs=connect_kwargs,
+        )
+
+    def __getattr__(self, name):
+        # Only called for attributes that are not defined by this class.
+        if name == "pool":
+            raise AttributeError(name)
+        return getattr(self.pool, name)
+
+    def __repr__(self):
+        return f"<Pool pool={self.pool!r} replicas={len(self.replicas)}>"
+
+    @property
+    def in_use(self):
+        """int: The number of connections currently acquired."""
+        return self.pool.get_size() - self.pool.get_idle_size()
+
+    @property
+    def idle(self):
+        """int: The number of open connections that are not acquired."""
+        return self.pool.get_idle_size()
+
+    async def _acquire(self, timeout):
+        if timeout is None:
+            timeout = self.acquire_timeout
+
+        start = time.perf_counter()
+        try:
+            connection = await self.pool.acquire(timeout=timeout)
+        except asyncio.TimeoutError:
+            self.stats.record_wait(time.perf_counter() - start, timeout=True)
+            raise
+
+        self.stats.record_wait(time.perf_counter() - start)
+        return connection
+
+    def acquire(self, *, timeout=None):
+        """
+        Acquire a connection from the pool.
+
+        Can be awaited, in which case the connection must be passed to
+        :meth:`release` afterwards, or used as an asynchronous context
+        manager that releases the connection when it exits.
+
+        Parameters
+        ----------
+        timeout: Optional[float]
+            The timeout in seconds for acquiring the connection. Defaults
+            to :attr:`acquire_timeout`.
+
+        Returns
+        -------
+        AsyncContextManager[asyncpg.connection.Connection]
+            An awaitable context manager that yields the acquired
+            connection.
+        """
+        return _PoolAcquireContext(self, timeout)
+
+    async def connect(self):
+        """
+        Open a dedicated connection to the database of the pool.
+
+        The connection does not take a slot of the pool, so it suits
+        connections that are held for a long time, such as connections
+        that listen for notifications. It is not initialized like the
+        connections of the pool and must be closed by the caller.
+
+        Raises
+        ------
+        RuntimeError
+            When the pool does not know the connection URI of its database.
+
+        Returns
+        -------
+        asyncpg.connection.Connection
+            The new connection.
+        """
+        if self._dsn is None:
+            raise RuntimeError("The database of this pool is unknown!")
+        return await asyncpg.connect(self._dsn, **self._connect_kwargs)
+
+    async def release(self, connection, *, timeout=None):
+        """
+        Release a connection that was acquired with :meth:`acquire`.
+
+        Parameters
+        ----------
+        connection: asyncpg.connection.Connection
+            The connection to release.
+        timeout: Optional[float]
+            The timeout in seconds for resetting the connection.
+        """
+        await self.pool.release(connection, timeout=timeout)
+
+    async def execute(self, query, *args, timeout=None):
+        """
+        Run a statement on a connection of the pool.
+
+        See :meth:`asyncpg.connection.Connection.execute`.
+        """
+        async with self.acquire() as conn:
+            return await conn.execute(query, *args, timeout=timeout)
+
+    async def executemany(self, command, args, *, timeout=None):
+        """
+        Run a statement for each sequence of arguments on a connection of
+        the pool.
+
+        See :meth:`asyncpg.connection.Connection.executemany`.
+        """
+        async with self.acquire() as conn:
+            return await conn.executemany(command, args, timeout=timeout)
+
+    async def fetch(self, query, *args, timeout=None, record_class=None):
+        """
+        Run a query on a connection of the pool and return all results.
+
+        See :meth:`asyncpg.connection.Connection.fetch`.
+        """
+        async with self.acquire() as conn:
+            return await conn.fetch(
+                query, *args, timeout=timeout, record_class=record_class
+            )
+
+    async def fetchval(self, query, *args, column=0, timeout=None):
+        """
+        Run a query on a connection of the pool and return a value of the
+        first row.
+
+        See :meth:`asyncpg.connection.Connection.fetchval`.
+        """
+        async with self.acquire() as conn:
+            return await conn.fetchval(query, *args, column=column, timeout=timeout)
+
+    async def fetchrow(self, query, *args, timeout=None, record_class=None):
+        """
+        Run a query on a connection of the pool and return the first row.
+
+        See :meth:`asyncpg.connection.Connection.fetchrow`.
+        """
+        async with self.acquire() as conn:
+            return await conn.fetchrow(
+                query, *args, timeout=timeout, record_class=record_class
+            )
+
+    def read(self, key=None):
+        """
+        Get the pool to run a read-only query on.
+
+        Replicas are used in turns. Reads of keys that were written within
+        the last :attr:`pin_duration` seconds, see :meth:`pin`, go to the
+        primary.
+
+        Examples
+        --------
+
+        .. code-block:: python3
+
+            async with bot.db.read(guild.id).acquire() as conn:
+                row = await conn.fetchrow(query, guild.id)
+
+        Parameters
+        ----------
+        key: Optional[Hashable]
+            The key whose data is read, usually the ID of a guild.
+
+        Returns
+        -------
+        Pool
+            A replica pool, or this pool if there are no replicas or the
+            key was written recently.
+        """
+        replicas = self.replicas
+        if not replicas:
+            return self
+
+        if key is not None:
+            until = self._pins.get(key)
+            if until is not None:
+                if until > time.monotonic():
+                    return self
+                del self._pins[key]
+
+        self._next_replica = (self._next_replica + 1) % len(replicas)
+        return replicas[self._next_replica]
+
+    def pin(self, key):
+        """
+        Route reads of a key to the primary for :attr:`pin_duration` seconds.
+
+        Should be called whenever data of the key is written.
+
+        Parameters
+        ----------
+        key: Hashable
+            The key whose data was written, usually the ID of a guild.
+        """
+        if not self.replicas or self.pin_duration <= 0:
+            return
+
+        pins = self._pins
+        now = time.monotonic()
+        pins[key] = now + self.pin_duration
+
+        # Drop expired pins once the number of pins has doubled.
+        if len(pins) >= self._pin_sweep:
+            for expired in [k for k, until in pins.items() if until <= now]:
+                del pins[expired]
+            self._pin_sweep = max(_MIN_PIN_SWEEP, 2 * len(pins))
+
+    def metrics(self):
+        """
+        Get the current state and acquire statistics of the pool.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The size of the pool, its bounds, the number of connections
+            in use and idle, the :class:`PoolStats` as a dictionary and
+            the metrics of each replica.
+        """
+        return dict(
+            size=self.pool.get_size(),
+            min_size=self.pool.get_min_size(),
+            max_size=self.pool.get_max_size(),
+            in_use=self.in_use,
+            idle=self.idle,
+            **self.stats.to_dict(),
+            replicas=[replica.metrics() for replica in self.replicas],
+        )
+
+    async def close(self):
+        """
+        Close the pool and the pools of all replicas.
+        """
+        for replica in self.replicas:
+            await replica.close()
+        await self.pool.close()
+
+    def terminate(self):
+        """
+        Terminate the pool and the pools of all replicas.
+        """
+        for replica in self.replicas:
+            replica.terminate()
+        self.pool.terminate()
+
+
+async def init_db(
+    user,
+    password,
+    host,
+    port,
+    database,
+    *,
+    min_size=10,
+    max_size=10,
+    max_queries=50000,
+    max_inactive_connection_lifetime=300.0,
+    statement_cache_size=100,
+    acquire_timeout=None,
+    slow_query_threshold=None,
+    json_serializer=None,
+    json_offload_threshold=None,
+    replicas=None,
+    replica_pin_duration=5.0,
+):
+    """
+    Initialize a :class:`Pool` with the given credentials.
+
+    Every connection created using the returned pool uses a
+    :class:`JSONCodec` for ``JSONB`` columns, returning and accepting
+    dictionaries and lists respectively.
+
+    The keyword-only options tune the pool and are usually taken from
+    :data:`config.database_pool`. Their defaults match those of
+    :func:`asyncpg.create_pool`.
 
     Parameters
     ----------
@@ -43,11 +1060,82 @@ async def init_db(user, password, host, port, database):
         The port to connect to.
     database: str
         The database to connect to.
+    min_size: Optional[int]
+        The number of connections the pool is initialized with and keeps
+        open. Defaults to ``10``.
+    max_size: Optional[int]
+        The maximum number of connections in the pool. Defaults to ``10``.
+    max_queries: Optional[int]
+        The number of queries after which a connection is replaced.
+        Defaults to ``50000``.
+    max_inactive_connection_lifetime: Optional[float]
+        The number of seconds after which idle connections are closed.
+        ``0`` keeps them open. Defaults to ``300.0``.
+    statement_cache_size: Optional[int]
+        The number of prepared statements cached per connection. ``0``
+        disables the cache, which is required behind transaction-pooling
+        proxies such as PgBouncer. Defaults to ``100``.
+    acquire_timeout: Optional[float]
+        The default timeout in seconds for acquiring a connection. Defaults
+        to ``None``, which waits indefinitely.
+    slow_query_threshold: Optional[float]
+        The execution time in seconds from which queries are logged as
+        slow. Defaults to ``None``, which disables the slow query log.
+    json_serializer: Optional[str]
+        The name of the serializer for ``JSONB`` columns, see
+        :func:`get_serializer`. Defaults to ``orjson`` if it is installed
+        and ``json`` otherwise.
+    json_offload_threshold: Optional[int]
+        The size in bytes above which ``JSONB`` values are returned as
+        :class:`DeferredJSON`. Defaults to ``None``, which decodes all
+        values immediately.
+    replicas: Optional[List[Dict[str, str]]]
+        The credentials of read replicas, usually taken from
+        :data:`config.database_replicas`. Missing credentials are taken
+        from the primary. Replica pools use the same options as the
+        primary pool. Defaults to ``None``, which uses no replicas.
+    replica_pin_duration: Optional[float]
+        The number of seconds for which reads of a key go to the primary
+        after it was written, see :meth:`Pool.pin`. Should exceed the usual
+        replication lag. Defaults to ``5.0``.
+
+    Raises
+    ------
+    ValueError
+        When there is no serializer with the given name.
 
     Returns
     -------
-    asyncpg.pool.Pool
+    Pool
         The connection pool.
     """
-    uri = f"postgresql://{user}:{password}@{host}:{port}/{database}"
-    return await asyncpg.create_pool(uri, init=init_connection)
+    codec = JSONCodec(json_serializer, json_offload_threshold)
+
+    def create_pool(user, password, host, port, database):
+        uri = f"postgresql://{user}:{password}@{host}:{port}/{database}"
+        return Pool.create(
+            uri,
+            init=functools.partial(init_connection, codec=codec),
+            min_size=min_size,
+            max_size=max_size,
+            max_queries=max_queries,
+            max_inactive_connection_lifetime=max_inactive_connection_lifetime,
+            statement_cache_size=statement_cache_size,
+            acquire_timeout=acquire_timeout,
+            slow_query_threshold=slow_query_threshold,
+        )
+
+    credentials = dict(
+        user=user, password=password, host=host, port=port, database=database
+    )
+    pool = await create_pool(**credentials)
+
+    try:
+        for overrides in replicas or ():
+            pool.replicas.append(await create_pool(**{**credentials, **overrides}))
+    except BaseException:
+        await pool.close()
+        raise
+
+    pool.pin_duration = replica_pin_duration
+    return pool
@@ -0,0 +1,64 @@
+__all__ = ("PrefixMatcher",)
+
+
+class PrefixMatcher(object):
+    """
+    Matches message content against a set of command prefixes in one pass.
+
+    Prefixes are indexed by their first character and sorted from longest
+    to shortest within each index entry, so matching a message only tests
+    the prefixes that start like it, and longer prefixes such as ``!!``
+    win over their own prefixes such as ``!``. The cost of matching does
+    not grow with the number of prefixes that start differently.
+
+    The bot uses a matcher for the mentions of the bot and the prefix of
+    a guild. Matchers are immutable. When the prefix of a guild changes,
+    the matcher of the new prefix is used, see
+    :meth:`senko.Senko.get_prefix_matcher`.
+
+    Parameters
+    ----------
+    prefixes: Iterable[str]
+        The prefixes to match. Duplicates are ignored.
+
+    Attributes
+    ----------
+    prefixes: Tuple[str, ...]
+        The prefixes to match, in their original order.
+    """
+
+    __slots__ = ("prefixes", "_index", "_empty")
+
+    def __init__(self, prefixes):
+        self.prefixes = tuple(dict.fromkeys(prefixes))
+
+        index = dict()
+        for prefix in sorted(self.prefixes, key=len, reverse=True):
+            if prefix:
+                index.setdefault(prefix[0], []).append(prefix)
+
+        self._index = {char: tuple(group) for char, group in index.items()}
+        self._empty = "" in self.prefixes
+
+    def match(self, content):
+        """
+        Get the prefix that the content starts with.
+
+        Parameters
+        ----------
+        content: str
+            The content to match.
+
+        Returns
+        -------
+        Optional[str]
+            The longest matching prefix, or ``None`` if no prefix matches.
+        """
+        for prefix in self._index.get(content[:1], ()):
+            if content.startswith(prefix):
+                return prefix
+
+        return "" if self._empty else None
+
+    def __repr__(self):
+        return f"<PrefixMatcher prefixes={self.prefixes!r}>"
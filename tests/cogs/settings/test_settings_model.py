@@ -0,0 +1,107 @@
+import asyncio
+import os
+import types
+
+import pytest
+
+from cogs.settings import (
+    BadSetting,
+    ChannelSettings,
+    SettingsCog,
+    SettingsLoader,
+    UnknownSetting,
+    UserSettings,
+)
+
+SCHEMA = os.path.join(
+    os.path.dirname(__file__), "..", "..", "..", "data", "schema", "settings.sql"
+)
+
+
+@pytest.mark.parametrize("model", [UserSettings, ChannelSettings])
+def test_schema_file(model):
+    with open(SCHEMA) as file:
+        assert model.schema() in file.read()
+
+
+def test_validate():
+    UserSettings.validate(dict(locale="de_DE", timezone="Europe/Berlin"))
+    UserSettings.validate(dict(locale=None, timezone=None))
+
+    with pytest.raises(BadSetting):
+        UserSettings.validate(dict(timezone="Nowhere/Nothing"))
+    with pytest.raises(BadSetting):
+        UserSettings.validate(dict(locale=""))
+    with pytest.raises(UnknownSetting):
+        ChannelSettings.validate(dict(timezone="UTC"))
+
+
+def test_get_many(fake_db, fake_bot):
+    conn = fake_db([[(1, "de_DE", None)]])
+    loader = SettingsLoader(fake_bot(conn), UserSettings)
+
+    async def run():
+        users = await loader.get_many([1, 2])
+        assert users[1].locale == "de_DE" and users[1].timezone is None
+        assert users[2].locale is None
+
+        # Both users are cached, including the one without a row.
+        await loader.get_many([1, 2])
+        assert len(conn.queries) == 1
+
+    asyncio.run(run())
+
+
+def test_write_many(fake_db, fake_bot):
+    conn = fake_db()
+    loader = SettingsLoader(fake_bot(conn), UserSettings)
+    items = {
+        1: dict(locale="de_DE"),
+        2: dict(locale=None),
+        3: dict(timezone="UTC", locale="x"),
+    }
+    asyncio.run(loader.write_many(items))
+
+    assert [rows for _, rows in conn.queries] == [
+        [(1, "de_DE"), (2, None)],
+        [(3, "x", "UTC")],
+    ]
+    assert conn.queries[0][0] == (
+        'INSERT INTO "user_settings" ("user", "locale") VALUES ($1, $2) '
+        'ON CONFLICT ("user") DO UPDATE SET "locale"=EXCLUDED."locale";'
+    )
+
+
+def test_get_options_single_query(fake_db, settings_cog):
+    conn = fake_db([[(None, "de_DE", None), ("fr_FR",), None]])
+    cog = settings_cog(conn)
+
+    guild = types.SimpleNamespace(id=1)
+    channel = types.SimpleNamespace(id=2, guild=guild)
+    user = types.SimpleNamespace(id=3)
+
+    async def run():
+        assert await cog.get_options(channel, user) == ("sen!", "fr_FR", "utc")
+        assert await cog.get_options(channel, user) == ("sen!", "fr_FR", "utc")
+
+    asyncio.run(run())
+    assert len(conn.queries) == 1
+    assert cog.guild_store.get(1) == (None, "de_DE", None)
+
+
+def test_get_guild_options_single_query(fake_db, settings_cog):
+    conn = fake_db([[("!", None, None)], [None]])
+    cog = settings_cog(conn)
+
+    async def run():
+        for guild_id in (1, 2):
+            guild = types.SimpleNamespace(id=guild_id)
+            await cog.get_guild_options(guild)
+            await cog.get_guild_options(guild)
+
+    asyncio.run(run())
+
+    # Guilds without settings use the defaults, without creating a row.
+    assert [query.split()[0] for query, _ in conn.queries] == ["SELECT", "SELECT"]
+    assert cog.guild_store.get(1) == ("!", None, None)
+    assert cog.guild_store.get(2) == (None, None, None)
@@ -0,0 +1,63 @@
+import asyncio
+import datetime
+import os
+import types
+
+import pytest
+
+SCHEMA = os.path.join(
+    os.path.dirname(__file__), "..", "..", "..", "data", "schema", "settings.sql"
+)
+
+
+def test_prune_batches(fake_db, settings_cog):
+    conn = fake_db([(2, 10), (1, 20), (0, None)])
+    cog = settings_cog(conn)
+    retention = datetime.timedelta(days=30)
+
+    assert asyncio.run(cog.prune_guild_settings(retention, batch_size=2)) == 3
+    assert [args[0] for _, args in conn.queries] == [-1, 10, 20]
+    assert all(args[2] == 2 for _, args in conn.queries)
+    assert "guild_settings_archive" not in conn.queries[0][0]
+
+
+def test_prune_archive(fake_db, settings_cog):
+    conn = fake_db([(0, None)])
+    cog = settings_cog(conn)
+
+    retention = datetime.timedelta(days=1)
+
+    assert asyncio.run(cog.prune_guild_settings(retention, archive=True)) == 0
+    assert "guild_settings_archive" in conn.queries[0][0]
+
+
+@pytest.mark.db
+@pytest.mark.asyncio
+async def test_prune_rejoined_guild(database, settings_cog):
+    """Test that a guild that rejoined is kept, in any session time zone."""
+    with open(SCHEMA) as file:
+        await database.execute(file.read())
+
+    cog = settings_cog(database)
+    guild = types.SimpleNamespace(id=4242)
+    left = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(hours=2)
+    count = 'SELECT COUNT(*) FROM "guild_settings" WHERE "guild"=$1;'
+
+    async with database.acquire() as conn:
+        await conn.execute("SET TIME ZONE 'Asia/Tokyo';")
+        try:
+            await conn.execute(
+                'INSERT INTO "guild_settings" ("guild", "last_left") VALUES ($1, $2);',
+                guild.id,
+                left,
+            )
+            await cog._init_guild_settings(guild, connection=conn)
+
+            retention = datetime.timedelta(hours=1)
+            assert await cog.prune_guild_settings(retention, connection=conn) == 0
+            assert await conn.fetchval(count, guild.id) == 1
+        finally:
+            await conn.execute(
+                'DELETE FROM "guild_settings" WHERE "guild"=$1;', guild.id
+            )
+            await conn.execute("RESET TIME ZONE;")
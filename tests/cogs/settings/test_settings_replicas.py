@@ -0,0 +1,29 @@
+import asyncio
+import types
+
+ROW = dict(
+    guild=1, prefix="!", locale=None, timezone=None, first_joined=0, last_joined=0
+)
+
+
+def test_replica_hit(fake_db, settings_cog):
+    primary, replica = fake_db(), fake_db([ROW])
+    primary.read = lambda key: replica
+    cog = settings_cog(primary)
+
+    settings = asyncio.run(cog.get_guild_settings(types.SimpleNamespace(id=1)))
+    assert settings.prefix == "!"
+    assert primary.queries == [] and len(replica.queries) == 1
+
+
+def test_replica_miss_reads_primary(fake_db, settings_cog):
+    # The replica has not caught up with the row created on the primary.
+    primary, replica = fake_db([ROW]), fake_db([None])
+    primary.read = lambda key: replica
+    cog = settings_cog(primary)
+
+    settings = asyncio.run(cog.get_guild_settings(types.SimpleNamespace(id=1)))
+    assert settings.prefix == "!"
+    assert [query for query, _ in primary.queries] == [
+        'SELECT * FROM "guild_settings" WHERE "guild"=$1;'
+    ]
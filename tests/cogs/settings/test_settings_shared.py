@@ -0,0 +1,145 @@
+import asyncio
+import multiprocessing
+import uuid
+from multiprocessing import resource_tracker
+
+import pytest
+
+from cogs.settings import GuildSettingsStore, SharedSettingsTable
+
+
+@pytest.fixture
+def table():
+    table = SharedSettingsTable(f"senko_test_{uuid.uuid4().hex[:8]}", capacity=64)
+    yield table
+    table.unlink()
+    table.close()
+
+
+def _read(name, guild_id, queue):
+    table = SharedSettingsTable(name, capacity=64)
+    queue.put(table.get(guild_id))
+    table.close()
+
+
+def test_put_get(table):
+    assert table.capacity == 64
+    assert table.put(1, "!", None, "Europe/Berlin")
+    assert table.put(2, None, None, None)
+    assert table.get(1) == ("!", None, "Europe/Berlin")
+    assert table.get(2) == (None, None, None)
+    assert table.get(3) is None
+
+    table.discard(1)
+    assert table.get(1) is None
+    assert table.get(2) == (None, None, None)
+
+    # Values that do not fit remove the guild.
+    assert not table.put(2, "x" * 41, None, None)
+    assert table.get(2) is None
+
+
+def test_attach(table):
+    table.put(1, "?", "de_DE", None)
+
+    other = SharedSettingsTable(table.name, capacity=64)
+    assert other.get(1) == ("?", "de_DE", None)
+    other.put(1, "!", None, None)
+    assert table.get(1) == ("!", None, None)
+    other.close()
+
+    with pytest.raises(RuntimeError):
+        SharedSettingsTable(table.name, capacity=128)
+
+
+def test_other_process(table):
+    table.put(42, "?", None, "UTC")
+
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=_read, args=(table.name, 42, queue))
+    process.start()
+    process.join(30)
+    assert queue.get(timeout=5) == ("?", None, "UTC")
+
+
+def test_torn_record(table):
+    table.put(1, "?", None, None)
+    offset = next(table._slots(1))
+
+    # An odd sequence number marks a record that is being written.
+    buf = table._shm.buf
+    buf[offset] += 1
+    assert table.get(1) is None
+    buf[offset] += 1
+    assert table.get(1) == ("?", None, None)
+
+
+def test_store_write_through(table):
+    store = GuildSettingsStore(table)
+    store.put(1, "?", None, None)
+    store.put_many([(2, None, None, None), (3, None, "de_DE", None)])
+    assert table.get(1) == ("?", None, None)
+    assert table.get(3) == (None, "de_DE", None)
+
+    other = GuildSettingsStore(table)
+    assert other.missing([1, 2, 3, 4]) == [4]
+    assert other.get(3) == (None, "de_DE", None)
+    assert len(other) == 3
+
+    other.discard(1)
+    assert table.get(1) is None
+
+
+def test_resource_tracker(monkeypatch):
+    registered = []
+    monkeypatch.setattr(
+        resource_tracker, "register", lambda name, kind: registered.append(name)
+    )
+    monkeypatch.setattr(
+        resource_tracker, "unregister", lambda name, kind: registered.remove(name)
+    )
+
+    # The block is not left registered, so the resource tracker does not
+    # unlink it when the process exits, and unlinking it stays balanced.
+    table = SharedSettingsTable(f"senko_test_{uuid.uuid4().hex[:8]}", capacity=64)
+    other = SharedSettingsTable(table.name, capacity=64)
+    assert registered == []
+
+    other.close()
+    table.unlink()
+    table.close()
+    assert registered == []
+
+
+def test_put_many(table, monkeypatch):
+    locks = []
+    locked = table._locked
+    monkeypatch.setattr(table, "_locked", lambda: locks.append(1) or locked())
+
+    table.put(3, "?", None, None)
+    locks.clear()
+    table.put_many(
+        [(1, "!", None, None), (2, None, "de_DE", None), (3, "x" * 41, None, None)]
+    )
+
+    assert locks == [1]
+    assert table.get(1) == ("!", None, None)
+    assert table.get(2) == (None, "de_DE", None)
+    assert table.get(3) is None
+
+
+def test_cog_closes_table(table, settings_cog):
+    shared_memory = dict(name=table.name, capacity=64)
+    cog = settings_cog(config=dict(settings_shared_memory=shared_memory))
+    shared = cog.shared
+    cog.guild_store.put(1, "!", None, None)
+
+    asyncio.run(cog.close())
+    assert cog.shared is None
+    assert shared._shm.buf is None
+
+    # The store keeps working without the shared table.
+    cog.guild_store.put(2, "?", None, None)
+    assert cog.guild_store.get(1) == ("!", None, None)
+    assert table.get(2) is None
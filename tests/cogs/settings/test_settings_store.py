@@ -0,0 +1,86 @@
+import random
+
+from cogs.settings import GuildSettingsStore
+from cogs.settings.store import DEFAULT
+
+
+def test_put_get():
+    store = GuildSettingsStore()
+    assert store.get(1) is None
+
+    store.put(1, None, None, None)
+    store.put(2, "?", None, None)
+    assert store.get(1) == DEFAULT
+    assert store.get(2) == ("?", None, None)
+    assert 1 in store and 2 in store and 3 not in store
+    assert len(store) == 2
+
+    # Guilds move between the default array and the overrides.
+    store.put(1, None, "de_DE", None)
+    store.put(2, None, None, None)
+    assert store.get(1) == (None, "de_DE", None)
+    assert store.get(2) == DEFAULT
+    assert len(store) == 2
+
+
+def test_put_many():
+    store = GuildSettingsStore()
+    store.put(5, "!", None, None)
+    store.put(7, None, None, None)
+
+    items = [(i, None, None, None) for i in range(10, 0, -1) if i != 3]
+    items += [(3, "?", None, None), (7, None, None, "UTC")]
+    store.put_many(items)
+    store._compact()
+    assert list(store._defaults) == [1, 2, 4, 5, 6, 8, 9, 10]
+    assert store.get(3) == ("?", None, None)
+    assert store.get(5) == DEFAULT
+    assert store.get(7) == (None, None, "UTC")
+    assert len(store) == 10
+
+
+def test_buffered_defaults():
+    rng = random.Random(0)
+    store = GuildSettingsStore()
+    expected = dict()
+
+    # Enough changes to rebuild the default array several times.
+    for _ in range(20):
+        chunk = [(rng.randrange(5000), None, None, None) for _ in range(500)]
+        chunk += [(rng.randrange(5000), "?", None, None) for _ in range(50)]
+        store.put_many(chunk)
+        expected.update((guild_id, values) for guild_id, *values in chunk)
+
+        for guild_id in rng.sample(range(5000), 20):
+            store.discard(guild_id)
+            expected.pop(guild_id, None)
+
+    assert len(store) == len(expected)
+    for guild_id in range(5000):
+        values = expected.get(guild_id)
+        assert store.get(guild_id) == (None if values is None else tuple(values))
+
+    store._compact()
+    assert list(store._defaults) == sorted(
+        guild_id for guild_id, values in expected.items() if tuple(values) == DEFAULT
+    )
+
+
+def test_discard_clear():
+    store = GuildSettingsStore()
+    store.put_many([(1, None, None, None), (2, "?", None, None)])
+    store.discard(1)
+    store.discard(2)
+    store.discard(3)
+    assert len(store) == 0
+
+    store.put(1, None, None, None)
+    store.clear()
+    assert store.get(1) is None
+
+
+def test_interned_values():
+    store = GuildSettingsStore()
+    store.put(1, "".join(["?", "?"]), None, None)
+    store.put(2, "".join(["?", "?"]), None, None)
+    assert store.get(1)[0] is store.get(2)[0]
@@ -0,0 +1,143 @@
+import asyncio
+import datetime
+import json
+import types
+
+from cogs.settings import SettingsSync, SettingsWriter
+
+
+class Cog(object):
+    """
+    Records the changes applied by a :class:`~cogs.settings.SettingsSync`.
+    """
+
+    def __init__(self, fail=False):
+        self.bot = types.SimpleNamespace()
+        self.fail = fail
+        self.applied = []
+        self.evicted = []
+
+    def _apply_guild_settings(self, guild_id, fields):
+        if self.fail:
+            raise TypeError("unexpected field")
+        self.applied.append((guild_id, fields))
+
+    def _evict_guild_settings(self, guild_id):
+        self.evicted.append(guild_id)
+
+
+def payload(origin, guild, fields):
+    return json.dumps(
+        dict(origin=origin, guild=guild, fields=SettingsSync.encode(fields))
+    )
+
+
+def test_encode_decode():
+    now = datetime.datetime.now(datetime.timezone.utc)
+    fields = dict(prefix="?", locale=None, last_joined=now)
+    assert (
+        SettingsSync.decode(json.loads(json.dumps(SettingsSync.encode(fields))))
+        == fields
+    )
+
+
+def test_apply_notification():
+    cog = Cog()
+    sync = SettingsSync(cog)
+    sync._on_notification(
+        None, 1, SettingsSync.CHANNEL, payload("other", 1, dict(prefix="?"))
+    )
+    assert cog.applied == [(1, dict(prefix="?"))]
+
+
+def test_ignore_own_and_malformed():
+    cog = Cog()
+    sync = SettingsSync(cog)
+    sync._on_notification(
+        None, 1, SettingsSync.CHANNEL, payload(sync.origin, 1, dict(prefix="?"))
+    )
+    sync._on_notification(None, 1, SettingsSync.CHANNEL, "not json")
+    sync._on_notification(
+        None, 1, SettingsSync.CHANNEL, json.dumps(dict(origin="other"))
+    )
+    assert cog.applied == [] and cog.evicted == []
+
+
+def test_evict_on_failure():
+    cog = Cog(fail=True)
+    sync = SettingsSync(cog)
+    sync._on_notification(
+        None, 1, SettingsSync.CHANNEL, payload("other", 2, dict(unknown=1))
+    )
+    assert cog.evicted == [2]
+
+
+class Listener(object):
+    """
+    A dedicated connection that records its listeners.
+    """
+
+    def __init__(self):
+        self.listeners = []
+        self.closed = False
+
+    async def add_listener(self, channel, callback):
+        self.listeners.append(channel)
+
+    async def remove_listener(self, channel, callback):
+        self.listeners.remove(channel)
+
+    def add_termination_listener(self, callback):
+        pass
+
+    def remove_termination_listener(self, callback):
+        pass
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+def test_listen_dedicated_connection():
+    conn = Listener()
+
+    async def connect():
+        return conn
+
+    async def acquire():
+        raise AssertionError("The listener must not take a pool connection!")
+
+    cog = Cog()
+    cog.bot.db = types.SimpleNamespace(connect=connect, acquire=acquire)
+    sync = SettingsSync(cog)
+
+    async def run():
+        await sync._listen(reload=False)
+        assert sync.listening and conn.listeners == [SettingsSync.CHANNEL]
+        await sync.stop()
+
+    asyncio.run(run())
+    assert conn.closed and conn.listeners == []
+
+
+def test_notify_after_flush(fake_db):
+    conn = fake_db()
+    cog = Cog()
+
+    async def run():
+        cog.bot = types.SimpleNamespace(loop=asyncio.get_running_loop(), db=conn)
+        writer = SettingsWriter(cog.bot, delay=60)
+        writer.sync = SettingsSync(cog)
+
+        writer.update(1, prefix="?", last_left=None)
+        assert conn.queries == []
+
+        await writer.flush()
+
+    asyncio.run(run())
+    statements = [query.split()[0] for query, _ in conn.queries]
+    assert statements == ["UPDATE", "SELECT"]
+    assert json.loads(conn.queries[1][1][1])["fields"] == dict(prefix="?")
+    assert conn.log == ["start", "commit"]
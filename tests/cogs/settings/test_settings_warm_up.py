@@ -0,0 +1,82 @@
+import asyncio
+import types
+
+GUILDS = [
+    types.SimpleNamespace(id=guild_id, shard_id=guild_id % 2)
+    for guild_id in range(1, 7)
+]
+
+
+def row(guild_id, prefix=None, locale=None, timezone=None):
+    return dict(guild=guild_id, prefix=prefix, locale=locale, timezone=timezone)
+
+
+def selects(conn):
+    return [args[0] for query, args in conn.queries if query.startswith("SELECT")]
+
+
+def inserts(conn):
+    return [args[0] for query, args in conn.queries if query.startswith("INSERT")]
+
+
+def test_warm_up_chunks(fake_db, settings_cog):
+    conn = fake_db([[row(1, prefix="!")], [], [row(5, locale="de_DE")]])
+    cog = settings_cog(conn, guilds=GUILDS)
+    cog.WARM_UP_CHUNK_SIZE = 2
+
+    guilds = [types.SimpleNamespace(id=guild_id) for guild_id in range(1, 6)]
+    assert asyncio.run(cog.load_guild_settings(guilds)) == 5
+    assert selects(conn) == [[1, 2], [3, 4], [5]]
+    assert inserts(conn) == [[2], [3, 4]]
+    assert conn.acquired == 1
+
+    assert len(cog.guild_store) == 5
+    assert cog.guild_store.get(1) == ("!", None, None)
+    assert cog.guild_store.get(3) == (None, None, None)
+    assert cog.guild_store.get(5) == (None, "de_DE", None)
+
+
+def test_warm_up_skips_known(fake_db, settings_cog):
+    conn = fake_db()
+    cog = settings_cog(conn, guilds=GUILDS)
+    cog.guild_store.put(1, "!", None, None)
+    cog.guild_store.put(3, "?", None, None)
+
+    # Guilds 1, 3 and 5 are on shard 1.
+    asyncio.run(cog.on_shard_ready(1))
+    assert selects(conn) == [[5]]
+
+    # Only guilds of shards that were not warmed up yet are loaded.
+    asyncio.run(cog.on_ready())
+    assert selects(conn) == [[5], [2, 4, 6]]
+
+    asyncio.run(cog.on_shard_ready(1))
+    assert len(selects(conn)) == 2
+    assert cog.guild_store.get(1) == ("!", None, None)
+
+    guilds = [types.SimpleNamespace(id=guild_id) for guild_id in (1, 3)]
+    assert asyncio.run(cog.load_guild_settings(guilds, refresh=True)) == 2
+    assert selects(conn)[-1] == [1, 3]
+    assert cog.guild_store.get(1) == (None, None, None)
+
+
+def test_warm_up_guild_cache_cap(fake_db, settings_cog):
+    conn = fake_db()
+    cog = settings_cog(conn, guilds=GUILDS)
+    maxsize = cog.guild_cache.maxsize
+    count = 2 * maxsize + 1
+    guilds = [types.SimpleNamespace(id=guild_id) for guild_id in range(1, count + 1)]
+
+    async def run():
+        assert await cog.load_guild_settings(guilds) == count
+        queries = len(conn.queries)
+
+        # Warmed up guilds are served from the store, without queries and
+        # without filling the settings object cache.
+        for guild in guilds:
+            assert await cog.get_guild_options(guild) == ("sen!", "en_GB", "utc")
+        assert len(conn.queries) == queries
+
+    asyncio.run(run())
+    assert len(cog.guild_store) == count
+    assert len(cog.guild_cache) <= maxsize
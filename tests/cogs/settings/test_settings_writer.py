@@ -0,0 +1,93 @@
+import asyncio
+import types
+
+import pytest
+
+from cogs.settings import SettingsWriter
+
+
+def make_writer(**options):
+    bot = types.SimpleNamespace(loop=asyncio.get_event_loop(), db=None)
+    return SettingsWriter(bot, **options)
+
+
+def test_coalesce_and_flush(fake_db):
+    async def run():
+        writer = make_writer(delay=60)
+        writer.update(1, prefix="!")
+        writer.update(1, prefix="?", locale="de_DE")
+        writer.update(2, locale="en_GB", prefix=None)
+        writer.update(3, timezone="UTC")
+        writer.join(3, when=0)
+
+        assert 1 in writer and len(writer) == 3
+        assert writer.get(1) == {"prefix": "?", "locale": "de_DE"}
+
+        conn = fake_db()
+        assert await writer.flush(conn) == 3
+        assert len(writer) == 0
+        assert writer.get(1) == {}
+        return conn.queries
+
+    statements = asyncio.run(run())
+    assert statements[0][1] == ([3], [0])
+    assert statements[1] == (
+        'UPDATE "guild_settings" SET "locale"=$2, "prefix"=$3 WHERE "guild"=$1;',
+        [(1, "de_DE", "?"), (2, "en_GB", None)],
+    )
+    assert statements[2] == (
+        'UPDATE "guild_settings" SET "timezone"=$2 WHERE "guild"=$1;',
+        [(3, "UTC")],
+    )
+
+
+def test_failed_flush_requeues(fake_db):
+    async def run():
+        writer = make_writer(delay=60)
+        writer.join(1, when=0)
+        with pytest.raises(RuntimeError):
+            await writer.flush(fake_db(fail=True))
+
+        assert writer.get(1) == {"last_joined": 0}
+        assert await writer.flush(fake_db()) == 1
+
+    asyncio.run(run())
+
+
+def test_size_threshold():
+    async def run():
+        writer = make_writer(max_pending=2, delay=60)
+        flushed = []
+
+        async def flush(connection=None):
+            flushed.append(dict(writer._pending))
+            writer._pending.clear()
+
+        writer.flush = flush
+        writer.update(1, prefix="!")
+        await asyncio.sleep(0)
+        assert flushed == []
+
+        writer.update(2, prefix="?")
+        await asyncio.sleep(0)
+        assert flushed == [{1: {"prefix": "!"}, 2: {"prefix": "?"}}]
+
+    asyncio.run(run())
+
+
+def test_cog_close_once(settings_cog):
+    class Writer(object):
+        closed = 0
+
+        async def close(self):
+            self.closed += 1
+
+    cog = settings_cog()
+    cog.writer = Writer()
+
+    async def run():
+        await cog.close()
+        await cog.close()
+
+    asyncio.run(run())
+    assert cog.writer.closed == 1
@@ -1,6 +1,8 @@
 # Configuration file for pytest.
+import asyncio
 import os
 import sys
+import types
 import pytest
 
 path = os.path.abspath(os.path.dirname(__file__))
@@ -8,6 +10,139 @@ path = os.path.join(path, "..")
 sys.path.append(path)
 
 from senko import init_db
+from cogs.settings import SettingsCog
+
+
+class FakeTransaction(object):
+    """
+    A transaction of a :class:`FakeConnection`.
+
+    Can be used as an asynchronous context manager, or controlled with
+    :meth:`start`, :meth:`commit` and :meth:`rollback`. Each step is
+    recorded in the ``log`` of the connection.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    async def start(self):
+        self.connection.log.append("start")
+
+    async def commit(self):
+        self.connection.log.append("commit")
+
+    async def rollback(self):
+        self.connection.log.append("rollback")
+
+    async def __aenter__(self):
+        await self.start()
+        return self.connection
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            await self.commit()
+        else:
+            await self.rollback()
+
+
+class FakeConnection(object):
+    """
+    A fake database connection that is its own connection pool.
+
+    Queries are recorded in ``queries`` with normalized whitespace and
+    answered with the prepared ``results`` in order. Acquiring the
+    connection yields to the event loop once, like a real pool.
+
+    Parameters
+    ----------
+    results: Iterable[Any]
+        The results to answer ``fetch``, ``fetchrow`` and ``fetchval``
+        calls with. Once exhausted, queries return ``[]``.
+    fail: bool
+        Whether statements run with ``execute`` raise an error.
+    """
+
+    def __init__(self, results=(), fail=False):
+        self.results = list(results)
+        self.fail = fail
+        self.queries = []
+        self.log = []
+        self.acquired = 0
+        self.released = []
+
+    async def acquire(self):
+        self.acquired += 1
+        await asyncio.sleep(0)
+        return self
+
+    async def release(self, connection):
+        self.released.append(connection)
+
+    def transaction(self, **kwargs):
+        return FakeTransaction(self)
+
+    def _record(self, query, args):
+        self.queries.append((" ".join(query.split()), args))
+
+    async def fetch(self, query, *args):
+        self._record(query, args)
+        return self.results.pop(0) if self.results else []
+
+    fetchrow = fetch
+    fetchval = fetch
+
+    async def execute(self, query, *args):
+        if self.fail:
+            raise RuntimeError("statement failed")
+        self._record(query, args)
+
+    async def executemany(self, query, rows):
+        if self.fail:
+            raise RuntimeError("statement failed")
+        self._record(query, list(rows))
+
+
+@pytest.fixture
+def fake_db():
+    """
+    A fixture that passes the :class:`FakeConnection` class, to create
+    fake database connections and pools with.
+    """
+    return FakeConnection
+
+
+@pytest.fixture
+def fake_bot():
+    """
+    A fixture that passes a factory of fake bots for cogs and helpers
+    that only use the database, configuration and event loop of the bot.
+
+    The factory takes the database pool, a dictionary of configuration
+    fields to add to the default ``prefix``, ``locale`` and ``timezone``,
+    and further attributes of the bot.
+    """
+
+    def make_bot(db=None, config=None, *, loop=None, **attrs):
+        config = types.SimpleNamespace(
+            prefix="sen!", locale="en_GB", timezone="utc", **(config or {})
+        )
+        return types.SimpleNamespace(db=db, config=config, loop=loop, **attrs)
+
+    return make_bot
+
+
+@pytest.fixture
+def settings_cog(fake_bot):
+    """
+    A fixture that passes a factory of :class:`cogs.settings.SettingsCog`
+    instances for fake bots, taking the same arguments as :func:`fake_bot`.
+    """
+
+    def make_cog(*args, **kwargs):
+        return SettingsCog(fake_bot(*args, **kwargs))
+
+    return make_cog
+
 
 # Database Fixture
 @pytest.fixture(scope="function")
@@ -26,11 +161,7 @@ async def database(event_loop):
     The ``test`` user must have full rights to the ``test`` database.
     """
     credentials = dict(
-        user="test",
-        password="test",
-        host="localhost",
-        port=5432,
-        database="test"
+        user="test", password="test", host="localhost", port=5432, database="test"
     )
 
     pool = await init_db(**credentials)
@@ -0,0 +1,71 @@
+import asyncio
+import types
+
+import pytest
+
+from senko import PartialContext
+
+
+def make_context(pool):
+    bot = types.SimpleNamespace(db=pool, _connection=None)
+    return PartialContext(bot, None, None, None, "sen!"), pool
+
+
+def test_acquire_once(fake_db):
+    async def run():
+        ctx, pool = make_context(fake_db())
+        assert ctx.connection is None
+
+        first = await ctx.acquire()
+        second = await ctx.acquire()
+        assert first is second is ctx.connection
+        assert pool.acquired == 1
+
+        await ctx.release()
+        assert ctx.connection is None
+        assert pool.released == [first]
+
+    asyncio.run(run())
+
+
+def test_transaction(fake_db):
+    async def run():
+        ctx, pool = make_context(fake_db())
+
+        async with ctx.transaction() as conn:
+            assert conn is ctx.connection
+
+        with pytest.raises(ValueError):
+            async with ctx.transaction():
+                raise ValueError()
+
+        assert conn.log == ["start", "commit", "start", "rollback"]
+        assert pool.acquired == 1
+
+    asyncio.run(run())
+
+
+def test_acquire_after_finish(fake_db):
+    async def run():
+        ctx, _ = make_context(fake_db())
+        ctx._finished = True
+
+        with pytest.raises(RuntimeError):
+            await ctx.acquire()
+
+    asyncio.run(run())
+
+
+def test_concurrent_acquire(fake_db):
+    async def run():
+        ctx, pool = make_context(fake_db())
+
+        # The pool yields to the event loop before returning a connection.
+        first, second = await asyncio.gather(ctx.acquire(), ctx.acquire())
+        assert first is second is ctx.connection
+        assert pool.acquired == 1
+
+        await ctx.release()
+        assert pool.released == [first]
+
+    asyncio.run(run())
@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from senko import db
+
+DOCUMENT = {"text": "Senko", "int": 123, "bool": True, "float": 1.5, "list": [1, None]}
+
+
+@pytest.mark.parametrize("serializer", sorted(db.SERIALIZERS))
+def test_codec_roundtrip(serializer):
+    codec = db.JSONCodec(serializer)
+    data = codec.encode(DOCUMENT)
+
+    assert data[:1] == db.JSONB_VERSION
+    assert codec.decode(data) == DOCUMENT
+
+
+def test_codec_version():
+    codec = db.JSONCodec("json")
+
+    with pytest.raises(ValueError):
+        codec.decode(b'\x02{"a":1}')
+
+
+def test_codec_non_str_keys():
+    for serializer in db.SERIALIZERS:
+        codec = db.JSONCodec(serializer)
+        assert codec.decode(codec.encode({1: "a"})) == {"1": "a"}
+
+
+def test_get_serializer():
+    expected = "orjson" if db.orjson is not None else "json"
+    assert db.get_serializer().name == expected
+    assert db.get_serializer("json") is db.SERIALIZERS["json"]
+
+    with pytest.raises(ValueError):
+        db.get_serializer("yaml")
+
+
+def test_codec_offload():
+    codec = db.JSONCodec("json", offload_threshold=64)
+    small = codec.encode({"a": 1})
+    large = codec.encode({"a": "x" * 100})
+
+    assert codec.decode(small) == {"a": 1}
+
+    value = codec.decode(large)
+    assert isinstance(value, db.DeferredJSON)
+    assert len(value) == len(large) - 1
+
+    async def run():
+        assert await value == {"a": "x" * 100}
+        assert await db.load_json(value) == {"a": "x" * 100}
+        assert await db.load_json({"a": 1}) == {"a": 1}
+
+    asyncio.run(run())
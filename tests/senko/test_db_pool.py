@@ -0,0 +1,209 @@
+import asyncio
+
+import asyncpg
+import pytest
+
+from senko import db
+
+
+class AsyncpgPool(object):
+    """
+    Stands in for an :class:`asyncpg.pool.Pool` without connecting.
+    """
+
+    def __init__(self, dsn=None, error=None, **kwargs):
+        self.dsn = dsn
+        self.kwargs = kwargs
+        self.error = error
+        self.timeouts = []
+        self.released = []
+
+    async def acquire(self, *, timeout=None):
+        self.timeouts.append(timeout)
+        await asyncio.sleep(0)
+        if self.error is not None:
+            raise self.error
+        return self
+
+    async def release(self, connection, *, timeout=None):
+        self.released.append(connection)
+
+    async def fetchval(self, query, *args, column=0, timeout=None):
+        return 1
+
+    def get_size(self):
+        return 4
+
+    def get_idle_size(self):
+        return 1
+
+
+def make_pool(acquire_timeout=None, error=None):
+    pool = db.Pool(AsyncpgPool(error=error), acquire_timeout=acquire_timeout)
+    pool.pin_duration = 5.0
+    return pool
+
+
+def test_stats_histogram():
+    stats = db.PoolStats(buckets=(0.01, 0.1))
+    stats.record_wait(0.005)
+    stats.record_wait(0.05)
+    stats.record_wait(0.5)
+    stats.record_wait(1.0, timeout=True)
+
+    assert stats.acquired == 3
+    assert stats.timeouts == 1
+    assert stats.histogram == [1, 1, 2]
+    assert stats.max_wait_time == 0.5
+    assert stats.average_wait_time == pytest.approx(0.555 / 3)
+    assert stats.to_dict()["histogram"] == {0.01: 1, 0.1: 1, float("inf"): 2}
+
+    stats.reset()
+    assert stats.acquired == 0 and stats.histogram == [0, 0, 0]
+
+
+def test_acquire_default_timeout():
+    pool = make_pool(acquire_timeout=2.5)
+
+    async def run():
+        connection = await pool.acquire()
+        await pool.release(connection)
+        async with pool.acquire(timeout=1.0) as conn:
+            assert conn is pool.pool
+        assert await pool.fetchval("SELECT 1;") == 1
+
+    asyncio.run(run())
+    assert pool.pool.timeouts == [2.5, 1.0, 2.5]
+    assert pool.pool.released == [pool.pool] * 3
+    assert pool.stats.acquired == 3
+
+
+def test_acquire_timeout():
+    pool = make_pool(acquire_timeout=0.1, error=asyncio.TimeoutError())
+
+    async def run():
+        with pytest.raises(asyncio.TimeoutError):
+            await pool.acquire()
+        with pytest.raises(asyncio.TimeoutError):
+            async with pool.acquire():
+                pass
+
+    asyncio.run(run())
+    assert pool.stats.timeouts == 2
+    assert pool.stats.acquired == 0
+    assert pool.pool.released == []
+
+
+def test_delegation():
+    pool = make_pool()
+    assert pool.get_size() == 4
+    assert pool.in_use == 3 and pool.idle == 1
+
+
+def test_init_db_options(monkeypatch):
+    pools = []
+
+    async def create_pool(dsn, **kwargs):
+        pools.append(AsyncpgPool(dsn, **kwargs))
+        return pools[-1]
+
+    class Connection(object):
+        loggers = []
+
+        def add_query_logger(self, callback):
+            self.loggers.append(callback)
+
+    async def init_connection(connection, codec=None):
+        connection.codec = codec
+
+    monkeypatch.setattr(asyncpg, "create_pool", create_pool)
+    monkeypatch.setattr(db, "init_connection", init_connection)
+    credentials = dict(user="u", password="p", host="h", port=1, database="d")
+    pool = asyncio.run(
+        db.init_db(
+            **credentials, max_size=20, statement_cache_size=0, acquire_timeout=5
+        )
+    )
+
+    assert isinstance(pool, db.Pool) and pool.pool is pools[0]
+    assert pool.acquire_timeout == 5
+    kwargs = pools[0].kwargs
+    assert kwargs["max_size"] == 20
+    assert kwargs["statement_cache_size"] == 0
+    assert {"loop", "connection_class", "record_class"}.isdisjoint(kwargs)
+
+    # New connections report to the query statistics and get the codec.
+    connection = Connection()
+    asyncio.run(kwargs["init"](connection))
+    assert connection.loggers == [pool.query_stats.record]
+    assert isinstance(connection.codec, db.JSONCodec)
+
+    # Dedicated connections use the connection options, but not the pool size.
+    async def connect(dsn, **kwargs):
+        return dsn, kwargs
+
+    monkeypatch.setattr(asyncpg, "connect", connect)
+    dsn, kwargs = asyncio.run(pool.connect())
+    assert dsn == "postgresql://u:p@h:1/d"
+    assert kwargs["statement_cache_size"] == 0
+    assert "max_size" not in kwargs
+
+
+def test_init_db_replicas(monkeypatch):
+    async def create_pool(dsn, **kwargs):
+        return AsyncpgPool(dsn, **kwargs)
+
+    monkeypatch.setattr(asyncpg, "create_pool", create_pool)
+    credentials = dict(user="u", password="p", host="h", port=1, database="d")
+    replicas = [dict(host="r1"), dict(host="r2", port=2)]
+    pool = asyncio.run(
+        db.init_db(**credentials, replicas=replicas, replica_pin_duration=3)
+    )
+
+    assert pool.pool.dsn == "postgresql://u:p@h:1/d"
+    assert [r.pool.dsn for r in pool.replicas] == [
+        "postgresql://u:p@r1:1/d",
+        "postgresql://u:p@r2:2/d",
+    ]
+    assert pool.pin_duration == 3
+
+
+def test_read_routing(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(db.time, "monotonic", lambda: now[0])
+
+    pool = make_pool()
+    assert pool.read(1) is pool
+
+    replicas = [make_pool(), make_pool()]
+    pool.replicas = replicas
+    assert {id(pool.read(1)), id(pool.read(1))} == {id(r) for r in replicas}
+
+    # Reads of a written guild go to the primary until the pin expires.
+    pool.pin(1)
+    assert pool.read(1) is pool
+    assert pool.read(2) in replicas
+
+    now[0] += 5.0
+    assert pool.read(1) in replicas
+    assert 1 not in pool._pins
+
+
+@pytest.mark.db
+@pytest.mark.asyncio
+async def test_replica_pool():
+    """Test routing to a replica, using the test database as its own replica."""
+    credentials = dict(
+        user="test", password="test", host="localhost", port=5432, database="test"
+    )
+    pool = await db.init_db(**credentials, replicas=[dict()], replica_pin_duration=60)
+    try:
+        replica = pool.read(1)
+        assert replica is pool.replicas[0]
+        async with replica.acquire() as conn:
+            assert await conn.fetchval("SELECT 1;") == 1
+
+        pool.pin(1)
+        assert pool.read(1) is pool
+    finally:
+        await pool.close()
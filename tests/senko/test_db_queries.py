@@ -0,0 +1,54 @@
+import logging
+import types
+
+from senko import db
+
+
+def logged(query, elapsed, exception=None):
+    return types.SimpleNamespace(query=query, elapsed=elapsed, exception=exception)
+
+
+def test_normalize_query():
+    query = """
+    SELECT * FROM "guild_settings"
+    WHERE "guild"=$1 AND "prefix"='sen!' LIMIT 10;
+    """
+    expected = 'SELECT * FROM "guild_settings" WHERE "guild"=$1 AND "prefix"=? LIMIT ?;'
+    assert db.normalize_query(query) == expected
+
+
+def test_query_stats():
+    stats = db.QueryStats()
+    stats.record(logged("SELECT  1;", 0.5))
+    stats.record(logged("SELECT 2;", 1.5, exception=ValueError()))
+    stats.record(logged("SELECT $1;", 0.1))
+
+    one = stats.statements["SELECT ?;"]
+    assert one.calls == 2
+    assert one.errors == 1
+    assert one.total_time == 2.0
+    assert one.max_time == 1.5
+    assert one.average_time == 1.0
+    assert one.origins == {"-": 2}
+
+    assert [s.statement for s in stats.top(1)] == ["SELECT ?;"]
+    assert [s.statement for s in stats.top(key="max_time")][-1] == "SELECT $1;"
+
+    stats.reset()
+    assert stats.to_dict() == {}
+
+
+def test_query_origin_and_slow_log(caplog):
+    stats = db.QueryStats(slow_query_threshold=1.0)
+
+    token = db.query_origin.set(("settings", "prefix"))
+    try:
+        with caplog.at_level(logging.WARNING, logger="senko.db"):
+            stats.record(logged("SELECT 1;", 0.5))
+            stats.record(logged("SELECT 1;", 2.0))
+    finally:
+        db.query_origin.reset(token)
+
+    assert stats.statements["SELECT ?;"].origins == {"settings/prefix": 2}
+    assert len(caplog.records) == 1
+    assert "settings/prefix" in caplog.records[0].getMessage()
@@ -0,0 +1,91 @@
+import asyncio
+import types
+
+import utils
+from senko import Senko, command_prefix
+
+
+class SettingsCog(object):
+    """
+    Counts the settings lookups of the bot.
+    """
+
+    def __init__(self, loaded=True):
+        self.loaded = loaded
+        self.guild_calls = 0
+        self.calls = 0
+
+    async def get_guild_options(self, guild, fetch=True):
+        assert not fetch
+        self.guild_calls += 1
+        return ("?", "en_GB", "utc") if self.loaded else None
+
+    async def get_options(self, channel, user):
+        self.calls += 1
+        return "?", "de_DE", "utc"
+
+
+def make_bot(cog, config):
+    # Skip connecting, only the context creation is tested.
+    bot_class = type("Bot", (Senko,), dict(config=config))
+    bot = bot_class.__new__(bot_class)
+    bot.command_prefix = command_prefix
+    bot.strip_after_prefix = False
+    bot._skip_check = lambda author_id, self_id: author_id == self_id
+    bot.all_commands = dict()
+    bot._BotBase__cogs = {"settings": cog}
+    bot._connection = types.SimpleNamespace(user=types.SimpleNamespace(id=1))
+    bot._prefix_matchers = utils.caching.LRUCache(16)
+    bot.locales = types.SimpleNamespace(get=lambda locale_id: locale_id)
+    bot.get_command = lambda name, locale=None: None
+    return bot
+
+
+def make_message(content):
+    guild = types.SimpleNamespace(id=10)
+    return types.SimpleNamespace(
+        content=content,
+        author=types.SimpleNamespace(id=2, bot=False),
+        channel=types.SimpleNamespace(id=20, guild=guild),
+        guild=guild,
+        _state=None,
+    )
+
+
+def test_settings_resolved_once(fake_bot):
+    cog = SettingsCog()
+    bot = make_bot(cog, fake_bot().config)
+
+    ctx = asyncio.run(bot.get_context(make_message("?help")))
+
+    # The guild prefix is read from the store, and get_context and
+    # command_prefix share a single lookup of the other settings.
+    assert cog.guild_calls == 1
+    assert cog.calls == 1
+    assert ctx.prefix == "?"
+    assert ctx.locale == "de_DE"
+
+
+def test_no_user_settings_without_prefix(fake_bot):
+    cog = SettingsCog()
+    bot = make_bot(cog, fake_bot().config)
+
+    ctx = asyncio.run(bot.get_context(make_message("hello")))
+
+    assert cog.guild_calls == 1
+    assert cog.calls == 0
+    assert ctx.locale == "en_GB"
+
+
+def test_unloaded_guild_single_lookup(fake_bot):
+    cog = SettingsCog(loaded=False)
+    bot = make_bot(cog, fake_bot().config)
+
+    ctx = asyncio.run(bot.get_context(make_message("?help")))
+    assert cog.calls == 1
+    assert ctx.prefix == "?"
+    assert ctx.locale == "de_DE"
+
+    ctx = asyncio.run(bot.get_context(make_message("hello")))
+    assert cog.calls == 2
+    assert ctx.prefix is None
@@ -0,0 +1,21 @@
+from senko import PrefixMatcher
+
+
+def test_match():
+    matcher = PrefixMatcher(["<@1> ", "<@!1> ", "!", "!!", "sen!", "!"])
+    assert matcher.prefixes == ("<@1> ", "<@!1> ", "!", "!!", "sen!")
+
+    assert matcher.match("!help") == "!"
+    assert matcher.match("!!help") == "!!"
+    assert matcher.match("sen!help") == "sen!"
+    assert matcher.match("<@!1> help") == "<@!1> "
+    assert matcher.match("<@1> help") == "<@1> "
+    assert matcher.match("<@2> help") is None
+    assert matcher.match("help") is None
+    assert matcher.match("") is None
+
+
+def test_empty_prefix():
+    matcher = PrefixMatcher(["", "!"])
+    assert matcher.match("!help") == "!"
+    assert matcher.match("help") == ""
@@ -0,0 +1,113 @@
+import asyncio
+import gzip
+import io
+
+import click
+import pytest
+
+import admin
+
+
+def test_frames(tmp_path):
+    path = tmp_path / "export.gz"
+    with open(path, "wb") as file:
+        admin.write_frame(file, admin.MAGIC + b"{}")
+        second = admin.write_frame(file, b"a" * 100, last=10, rows=2)
+        admin.write_frame(file, b"b" * 50, last=20, rows=1)
+
+    with gzip.open(path, "rb") as file:
+        frames = list(admin.read_frames(file))
+
+    assert [frame[1:] for frame in frames] == [
+        (0, 0, admin.MAGIC + b"{}"),
+        (10, 2, b"a" * 100),
+        (20, 1, b"b" * 50),
+    ]
+
+    # Truncating after a frame keeps the file readable.
+    with open(path, "r+b") as file:
+        file.truncate(second)
+
+    with gzip.open(path, "rb") as file:
+        frames = list(admin.read_frames(file))
+    assert [frame[1] for frame in frames] == [0, 10]
+
+    # Frames can be read from a saved position.
+    with gzip.open(path, "rb") as file:
+        file.seek(frames[0][0])
+        assert [frame[3] for frame in admin.read_frames(file)] == [b"a" * 100]
+
+
+def test_truncated_frame():
+    data = admin.FRAME.pack(10, 0, 0) + b"short"
+    with pytest.raises(click.ClickException):
+        list(admin.read_frames(io.BytesIO(data)))
+
+
+def test_state(tmp_path):
+    path = str(tmp_path / "export.gz.export-state")
+    assert admin.load_state(path) is None
+
+    admin.save_state(path, offset=10, last=5, rows=3)
+    assert admin.load_state(path) == dict(offset=10, last=5, rows=3)
+
+
+class Connection(object):
+    """
+    Answers the queries of an export, with chunks of fake ``COPY`` data.
+    """
+
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+        self.copies = []
+
+    def acquire(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def close(self):
+        pass
+
+    async def fetch(self, query, *args):
+        return [("id",), ("data",)]
+
+    async def fetchval(self, query, last, limit):
+        index = len(self.copies)
+        return 10 * (index + 1) if index < len(self.chunks) else None
+
+    async def copy_from_query(self, query, *args, output, format=None):
+        # Like asyncpg, file-like outputs are written to and anything else
+        # is awaited as a coroutine function.
+        if hasattr(output, "write"):
+
+            async def sink(data):
+                output.write(data)
+
+        else:
+            sink = output
+
+        self.copies.append(args)
+        for data in self.chunks[len(self.copies) - 1]:
+            await asyncio.wait_for(sink(data), timeout=None)
+        return "COPY 2"
+
+
+def test_export_table(tmp_path, monkeypatch):
+    conn = Connection([[b"ab", b"cd"], [b"ef"]])
+
+    async def connect():
+        return conn
+
+    monkeypatch.setattr(admin, "connect", connect)
+    path = str(tmp_path / "export.gz")
+    asyncio.run(admin.export_table(path, "table", "id", 10, resume=False))
+
+    assert conn.copies == [(admin.FIRST_KEY, 10), (10, 20)]
+    with gzip.open(path, "rb") as file:
+        frames = [frame[1:] for frame in admin.read_frames(file)][1:]
+    assert frames == [(10, 2, b"abcd"), (20, 2, b"ef")]
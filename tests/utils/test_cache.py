@@ -1,10 +1,12 @@
 # pylint: disable=global-variable-undefined
 import time
+import asyncio
 import pytest
 
-from utils.caching import Cache, LRUCache, TTLCache
+from utils import caching
+from utils.caching import Cache, LRUCache, TTLCache, TinyLFUCache
 
-@pytest.mark.parametrize("cache", [Cache(1), LRUCache(1), TTLCache(1, ttl=60)])
+@pytest.mark.parametrize("cache", [Cache(1), LRUCache(1), TTLCache(1, ttl=60), TinyLFUCache(1)])
 def test_insert(cache):
     assert len(cache) == 0
     assert cache.size == 0
@@ -25,7 +27,7 @@ def test_insert(cache):
     assert 2 in cache
     assert 1 not in cache
 
-@pytest.mark.parametrize("cache", [Cache(2), LRUCache(2), TTLCache(2, ttl=60)])
+@pytest.mark.parametrize("cache", [Cache(2), LRUCache(2), TTLCache(2, ttl=60), TinyLFUCache(2)])
 def test_evict(cache):
     cache.put(1, 1)
     cache.put(2, 2)
@@ -36,7 +38,7 @@ def test_evict(cache):
     assert 2 not in cache or 1 not in cache
     assert 3 in cache
 
-@pytest.mark.parametrize("cache", [Cache(2), LRUCache(2), TTLCache(2, ttl=60)])
+@pytest.mark.parametrize("cache", [Cache(2), LRUCache(2), TTLCache(2, ttl=60), TinyLFUCache(2)])
 def test_clear(cache):
     cache.put(1, 1)
     cache.put(2, 2)
@@ -47,7 +49,7 @@ def test_clear(cache):
     assert cache.size == 0
 
 
-@pytest.mark.parametrize("cache", [Cache(2), LRUCache(2), TTLCache(2, ttl=60)])
+@pytest.mark.parametrize("cache", [Cache(2), LRUCache(2), TTLCache(2, ttl=60), TinyLFUCache(2)])
 def test_pop(cache):
     cache.put(1, 1)
     cache.put(2, 2)
@@ -64,7 +66,7 @@ def test_pop(cache):
     with pytest.raises(KeyError):
         cache.pop(2)
 
-@pytest.mark.parametrize("cache", [Cache(2), LRUCache(2), TTLCache(2, ttl=60)])
+@pytest.mark.parametrize("cache", [Cache(2), LRUCache(2), TTLCache(2, ttl=60), TinyLFUCache(2)])
 def test_remove(cache):
     cache.put(1, 1)
     cache.put(2, 2)
@@ -93,4 +95,215 @@ def test_ttl_behavior():
     time.sleep(0.05)
     assert ttl.get(1) is None
     assert ttl.get(2) is None
-    assert ttl.size == 0
\ No newline at end of file
+    assert ttl.size == 0
+
+def test_ttl_refresh():
+    ttl = TTLCache(4, ttl=60)
+    ttl.put(1, 1)
+    ttl.put(2, 2)
+    ttl._times[1] -= 120
+
+    # Re-adding an item refreshes its time-to-live.
+    ttl._times[2] -= 120
+    ttl.put(2, 3)
+
+    assert 1 not in ttl
+    assert ttl.get(2) == 3
+    assert ttl.size == 1
+
+
+def test_ttl_evict_keeps_times_in_sync():
+    ttl = TTLCache(2, ttl=60)
+    ttl.put(1, 1)
+    ttl.put(2, 2)
+    ttl.get(1)
+    ttl.put(3, 3)
+
+    assert 2 not in ttl
+    assert set(ttl._times) == {1, 3}
+    assert ttl.pop(1) == 1
+    assert ttl.remove(3) == 3
+    assert len(ttl._times) == 0
+
+
+def test_tinylfu_admission():
+    cache = TinyLFUCache(100)
+
+    # Make the first 50 keys popular.
+    for _ in range(5):
+        for i in range(50):
+            cache.put(i, i)
+            cache.get(i)
+
+    # A scan of one-off keys must not flush the popular keys.
+    for i in range(1000, 2000):
+        cache.put(i, i)
+
+    assert sum(1 for i in range(50) if i in cache) == 50
+    assert len(cache) == 100
+
+
+def test_tinylfu_remove():
+    cache = TinyLFUCache(10)
+    for i in range(10):
+        cache.put(i, i)
+        cache.get(i)
+
+    assert cache.pop(0) == 0
+    assert cache.remove(9) == 9
+    assert cache.remove(9) is None
+    assert len(cache) == 8
+
+    cache.clear()
+    assert len(cache) == 0
+    cache.put(1, 1)
+    assert cache[1] == 1
+
+
+def sizeof_value(key, value):
+    return value
+
+
+@pytest.mark.parametrize("cls", [Cache, LRUCache, TinyLFUCache, lambda *a, **kw: TTLCache(*a, ttl=60, **kw)])
+def test_maxbytes(cls):
+    cache = cls(100, maxbytes=10, sizeof=sizeof_value)
+    cache.put(1, 4)
+    cache.put(2, 4)
+    assert cache.nbytes == 8
+
+    cache.put(3, 4)
+    assert cache.nbytes <= 10
+    assert len(cache) == 2
+    assert 3 in cache
+
+    # Updating an item accounts for its new size.
+    cache.put(3, 1)
+    assert cache.nbytes == 5
+
+    cache.pop(3)
+    assert cache.nbytes == 4
+
+    cache.clear()
+    assert cache.nbytes == 0
+
+
+@pytest.mark.parametrize("cls", [Cache, LRUCache, TinyLFUCache, lambda *a, **kw: TTLCache(*a, ttl=60, **kw)])
+def test_maxbytes_oversized(cls):
+    cache = cls(100, maxbytes=10, sizeof=sizeof_value)
+    cache.put(1, 4)
+    cache.put(2, 11)
+    assert 2 not in cache
+    assert cache.nbytes <= 10
+
+
+def test_maxbytes_lru_order():
+    cache = LRUCache(100, maxbytes=12, sizeof=sizeof_value)
+    cache.put(1, 4)
+    cache.put(2, 4)
+    cache.put(3, 4)
+    cache.get(1)
+    cache.put(4, 4)
+
+    assert 1 in cache
+    assert 2 not in cache
+
+
+def test_maxbytes_default_sizeof():
+    cache = Cache(100, maxbytes=10_000)
+    cache.put("key", "value")
+    assert cache.nbytes == caching.getsizeof("key", "value")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_clock():
+    clock = FakeClock()
+    ttl = TTLCache(4, ttl=10, clock=clock)
+    ttl.put(1, 1)
+    clock.now = 5
+    ttl.put(2, 2)
+
+    clock.now = 11
+    assert 1 not in ttl
+    assert ttl.get(2) == 2
+
+    clock.now = 16
+    assert ttl.size == 0
+
+
+def test_ttl_expire_limit():
+    clock = FakeClock()
+    ttl = TTLCache(100, ttl=10, clock=clock)
+    for i in range(10):
+        ttl.put(i, i)
+
+    clock.now = 20
+    assert ttl.expire(limit=3) == 3
+    assert len(ttl._data) == 7
+    assert ttl.expire() == 7
+    assert ttl.expire() == 0
+
+
+def test_reaper_sweep():
+    clock = FakeClock()
+    added = TTLCache(100, ttl=10, clock=clock)
+    named = TTLCache(100, ttl=10, clock=clock, name="test.reaper")
+    for i in range(50):
+        added.put(i, i)
+        named.put(i, i)
+
+    reaper = caching.CacheReaper(batch_size=8)
+    reaper.add(added)
+
+    clock.now = 20
+    assert asyncio.run(reaper.sweep()) == 100
+    assert len(added._data) == 0
+    assert len(named._data) == 0
+    caching.unregister_cache("test.reaper")
+
+
+@pytest.mark.parametrize("cache", [Cache(8), LRUCache(8), TTLCache(8, ttl=60), TinyLFUCache(8)])
+def test_bulk(cache):
+    cache.put_many({1: 1, 2: 2})
+    cache.put_many([(3, 3), (4, 4)])
+    assert len(cache) == 4
+
+    found, missing = cache.get_many([1, 3, 5, 6])
+    assert found == {1: 1, 3: 3}
+    assert missing == [5, 6]
+
+    assert cache.invalidate_many([1, 2, 5]) == 2
+    assert 1 not in cache
+    assert 2 not in cache
+    assert len(cache) == 2
+
+
+def test_bulk_lru_order():
+    lru = LRUCache(3)
+    lru.put_many([(1, 1), (2, 2), (3, 3)])
+    lru.get_many([1])
+    lru.put_many([(4, 4)])
+    assert 1 in lru
+    assert 2 not in lru
+
+
+def test_bulk_ttl_expiry():
+    clock = FakeClock()
+    ttl = TTLCache(8, ttl=10, clock=clock, stats=True)
+    ttl.put_many([(1, 1), (2, 2)])
+    clock.now = 5
+    ttl.put_many([(3, 3)])
+
+    clock.now = 12
+    found, missing = ttl.get_many([1, 2, 3])
+    assert found == {3: 3}
+    assert missing == [1, 2]
+    assert ttl.stats.evictions["expiry"] == 2
+    assert ttl.stats.hits == 1
+    assert ttl.stats.misses == 2
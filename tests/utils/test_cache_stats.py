@@ -0,0 +1,149 @@
+import time
+import pytest
+
+from utils import caching
+from utils.caching import Cache, LRUCache, TTLCache
+
+
+@pytest.mark.parametrize(
+    "cache",
+    [Cache(2, stats=True), LRUCache(2, stats=True), TTLCache(2, ttl=60, stats=True)],
+)
+def test_hits_and_misses(cache):
+    cache.put(1, 1)
+    cache.get(1)
+    cache.get(2)
+    cache[1]
+    with pytest.raises(KeyError):
+        cache[2]
+
+    stats = cache.stats
+    assert stats.hits == 2
+    assert stats.misses == 2
+    assert stats.hit_ratio == 0.5
+
+
+@pytest.mark.parametrize(
+    "cache",
+    [Cache(2, stats=True), LRUCache(2, stats=True), TTLCache(2, ttl=60, stats=True)],
+)
+def test_capacity_evictions(cache):
+    for i in range(5):
+        cache.put(i, i)
+
+    stats = cache.stats
+    assert stats.evictions["capacity"] == 3
+    assert stats.size == 2
+    assert stats.peak_size == 2
+
+
+def test_expiry_evictions():
+    cache = TTLCache(4, ttl=60, stats=True)
+    cache.put(1, 1)
+    cache.put(2, 2)
+    cache._times[1] -= 120
+    cache._times[2] -= 120
+
+    assert cache.get(1) is None
+    assert cache.stats.evictions["expiry"] == 2
+    assert cache.stats.evictions["capacity"] == 0
+    assert cache.stats.peak_size == 2
+
+
+def test_stats_disabled():
+    cache = Cache(2)
+    cache.put(1, 1)
+    cache.get(1)
+    assert cache.stats is None
+
+
+def test_registry():
+    cache = LRUCache(2, name="test.registry", stats=True)
+    cache.put(1, 1)
+    cache.get(1)
+
+    assert caching.get_cache("test.registry") is cache
+    assert caching.dump_stats()["test.registry"]["hits"] == 1
+
+    caching.unregister_cache("test.registry")
+    assert caching.get_cache("test.registry") is None
+
+
+def test_registry_weak():
+    cache = Cache(2, name="test.weak")
+    assert "test.weak" in caching.get_caches()
+    del cache
+    assert "test.weak" not in caching.get_caches()
+
+
+def test_cached_function_stats():
+    @caching.cached_function(Cache(8), name="test.function", timed=True)
+    def cached(arg):
+        time.sleep(0.01)
+        return arg
+
+    cached(1)
+    cached(1)
+    cached(2)
+
+    stats = cached.stats
+    assert stats.hits == 1
+    assert stats.misses == 2
+    assert stats.miss_time >= 0.02
+    assert stats.size == 2
+    assert stats.peak_size == 2
+    assert stats.evictions is None
+    assert caching.dump_stats()["test.function"]["misses"] == 2
+    assert caching.dump_stats()["test.function"]["size"] == 2
+    assert caching.dump_stats()["test.function"]["evictions"] is None
+
+
+def test_cached_function_evictions():
+    cache = caching.LRUCache(1, stats=True)
+
+    @caching.cached_function(cache, stats=True)
+    def cached(arg):
+        return arg
+
+    cached(1)
+    cached(2)
+
+    # Evictions are only recorded by the cache.
+    assert cached.stats.evictions is None
+    assert cache.stats.evictions["capacity"] == 1
+
+
+def test_cached_method_stats():
+    class Object:
+        def __init__(self):
+            self.cache = Cache(8)
+
+        @caching.cached_method(lambda self: self.cache, stats=True)
+        def get(self, arg):
+            return arg
+
+    a, b = Object(), Object()
+    a.get(1)
+    a.get(1)
+    b.get(1)
+
+    assert Object.get.stats.hits == 1
+    assert Object.get.stats.misses == 2
+    assert Object.get.stats.miss_time == 0.0
+    assert Object.get.stats.size is None
+    assert Object.get.stats.peak_size is None
+
+
+def test_cached_property_stats():
+    class Object:
+        @caching.cached_property(stats=True)
+        def value(self):
+            return 1
+
+    o = Object()
+    o.value
+    o.value
+
+    stats = Object.__dict__["value"].stats
+    assert stats.hits == 1
+    assert stats.misses == 1
@@ -0,0 +1,94 @@
+import asyncio
+import pytest
+
+from utils import caching
+from utils.caching import Cache, LRUCache, TTLCache, TinyLFUCache, tags
+
+
+@pytest.mark.parametrize(
+    "cls", [Cache, LRUCache, TinyLFUCache, lambda n: TTLCache(n, ttl=60)]
+)
+def test_invalidate_tag(cls):
+    a, b = cls(8), cls(8)
+    a.put(1, 1, tags=["guild:1"])
+    a.put(2, 2, tags=["guild:2"])
+    b.put(1, 1, tags=["guild:1", "locale:de"])
+    b.put(3, 3)
+
+    assert caching.invalidate_tag("guild:1") == 2
+    assert 1 not in a
+    assert 1 not in b
+    assert 2 in a
+    assert 3 in b
+
+    # Removed items are unlinked from their other tags.
+    assert "locale:de" not in tags._index
+    assert caching.invalidate_tag("guild:1") == 0
+    assert caching.invalidate_tags(["guild:2"]) == 1
+
+
+def test_index_cleanup():
+    cache = LRUCache(2)
+    cache.put(1, 1, tags=["test:evict"])
+    cache.put(2, 2)
+    cache.put(3, 3)
+    assert "test:evict" not in tags._index
+
+    cache.put(2, 2, tags=["test:pop"])
+    cache.pop(2)
+    assert "test:pop" not in tags._index
+
+    cache.put(2, 2, tags=["test:clear"])
+    cache.clear()
+    assert "test:clear" not in tags._index
+
+
+def test_retag():
+    cache = Cache(8)
+    cache.put(1, 1, tags=["test:old"])
+    cache.put(1, 2, tags=["test:new"])
+    assert caching.invalidate_tag("test:old") == 0
+    assert caching.invalidate_tag("test:new") == 1
+
+    cache.put(1, 1, tags="test:string")
+    assert caching.invalidate_tag("test:string") == 1
+
+
+def test_expired_items_unlinked():
+    now = [0]
+    cache = TTLCache(8, ttl=10, clock=lambda: now[0])
+    cache.put(1, 1, tags=["test:expire"])
+    now[0] = 20
+    cache.expire()
+    assert "test:expire" not in tags._index
+
+
+def test_cached_function_tags():
+    calls = []
+
+    @caching.cached_function(Cache(8), tags=lambda guild: [f"test-guild:{guild}"])
+    def cached(guild):
+        calls.append(guild)
+        return guild
+
+    cached(1)
+    cached(1)
+    caching.invalidate_tag("test-guild:1")
+    cached(1)
+    assert calls == [1, 1]
+
+
+def test_async_cached_function_tags():
+    calls = []
+
+    @caching.cached_function(
+        Cache(8), tags=lambda guild: [f"test-guild:{guild}"], coalesce=True
+    )
+    async def cached(guild):
+        calls.append(guild)
+        return guild
+
+    asyncio.run(cached(1))
+    caching.invalidate_tag("test-guild:1")
+    asyncio.run(cached(1))
+    assert calls == [1, 1]
@@ -100,3 +100,135 @@ def test_async_cached_function_ignore_args():
     assert asyncio.run(cached(1)) == 1
     assert asyncio.run(cached(2)) == 1
 
+
+# coalescing tests
+
+def test_async_cached_function_coalesce():
+    calls = []
+
+    @caching.cached_function(caching.Cache(128), coalesce=True)
+    async def cached(arg):
+        calls.append(arg)
+        await asyncio.sleep(0)
+        return arg
+
+    async def main():
+        return await asyncio.gather(*(cached(i % 2) for i in range(10)))
+
+    assert asyncio.run(main()) == [i % 2 for i in range(10)]
+    assert sorted(calls) == [0, 1]
+    assert asyncio.run(cached(0)) == 0
+    assert len(calls) == 2
+
+def test_async_cached_function_coalesce_parallel_keys():
+    running = set()
+    overlap = []
+
+    @caching.cached_function(caching.Cache(128), coalesce=True)
+    async def cached(arg):
+        running.add(arg)
+        await asyncio.sleep(0.01)
+        overlap.append(len(running))
+        running.discard(arg)
+        return arg
+
+    async def main():
+        return await asyncio.gather(cached(1), cached(2), cached(3))
+
+    assert asyncio.run(main()) == [1, 2, 3]
+    assert max(overlap) == 3
+
+def test_async_cached_function_coalesce_exception():
+    calls = []
+
+    @caching.cached_function(caching.Cache(128), coalesce=True)
+    async def cached(arg):
+        calls.append(arg)
+        await asyncio.sleep(0)
+        raise ValueError(arg)
+
+    async def main():
+        return await asyncio.gather(*(cached(1) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, ValueError) for r in results)
+    assert calls == [1]
+    assert len(cached.cache) == 0
+
+def test_coalesce_requires_coroutine_function():
+    with pytest.raises(TypeError):
+        @caching.cached_function(caching.Cache(128), coalesce=True)
+        def cached(arg):
+            return arg
+
+# stale-while-revalidate tests
+
+@pytest.mark.sleep
+def test_async_cached_function_stale_while_revalidate():
+    global _value
+    _value = 1
+
+    @caching.cached_function(caching.Cache(128), soft_ttl=0.02, hard_ttl=10)
+    async def cached():
+        return _value
+
+    async def main():
+        global _value
+        assert await cached() == 1
+        _value = 2
+        await asyncio.sleep(0.03)
+
+        # Stale value is served while a refresh is scheduled.
+        assert await cached() == 1
+        await asyncio.sleep(0)
+        assert await cached() == 2
+
+    asyncio.run(main())
+
+@pytest.mark.sleep
+def test_async_cached_function_hard_ttl():
+    global _value
+    _value = 1
+
+    @caching.cached_function(caching.Cache(128), soft_ttl=0.01, hard_ttl=0.02)
+    async def cached():
+        return _value
+
+    async def main():
+        global _value
+        assert await cached() == 1
+        _value = 2
+        await asyncio.sleep(0.03)
+        assert await cached() == 2
+
+    asyncio.run(main())
+
+@pytest.mark.sleep
+def test_async_cached_function_refresh_failure(caplog):
+    calls = []
+
+    @caching.cached_function(caching.Cache(128), soft_ttl=0.01, hard_ttl=10)
+    async def cached():
+        calls.append(None)
+        if len(calls) > 1:
+            raise ValueError("refresh failed")
+        return 1
+
+    async def main():
+        assert await cached() == 1
+        await asyncio.sleep(0.02)
+        assert await cached() == 1
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert await cached() == 1
+
+    asyncio.run(main())
+    assert len(calls) >= 2
+    assert "Could not refresh" in caplog.text
+
+def test_stale_while_revalidate_options():
+    with pytest.raises(TypeError):
+        caching.cached_function(caching.Cache(128), hard_ttl=10)(nullkey)
+
+    with pytest.raises(ValueError):
+        caching.cached_function(caching.Cache(128), soft_ttl=10, hard_ttl=1)(nullkey)
@@ -150,4 +150,25 @@ def test_async_cached_method_ignore_args(event_loop):
     o2.value = 2
     assert asyncio.run(o2.get(1)) == 1
     assert asyncio.run(o2.get(2)) == 1
-    
\ No newline at end of file
+    
+def test_async_cached_method_coalesce():
+
+    class Object:
+        def __init__(self):
+            self.calls = 0
+            self.cache = caching.Cache(128)
+
+        @caching.cached_method(lambda self: self.cache, coalesce=True)
+        async def get(self, arg):
+            self.calls += 1
+            await asyncio.sleep(0)
+            return arg
+
+    o1, o2 = Object(), Object()
+
+    async def main():
+        return await asyncio.gather(*(o.get(1) for o in (o1, o2) for _ in range(5)))
+
+    assert asyncio.run(main()) == [1] * 10
+    assert o1.calls == 1
+    assert o2.calls == 1
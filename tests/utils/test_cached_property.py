@@ -44,3 +44,22 @@ def test_cached_property_ttl():
     assert obj.cached == 1
     time.sleep(0.05)
     assert obj.cached == 2
+
+def test_cached_property_clock():
+    now = [0.0]
+
+    class Obj:
+        def __init__(self, value):
+            self.value = value
+
+        @cached_property(ttl=10, clock=lambda: now[0])
+        def cached(self):
+            return self.value
+
+    obj = Obj(1)
+    assert obj.cached == 1
+    obj.value += 1
+    now[0] = 10
+    assert obj.cached == 1
+    now[0] = 10.5
+    assert obj.cached == 2
@@ -0,0 +1,30 @@
+import types
+
+import utils
+
+
+class Router(object):
+    def __init__(self):
+        self.replica = object()
+        self.pinned = []
+
+    def read(self, key):
+        return self if key in self.pinned else self.replica
+
+    def pin(self, key):
+        self.pinned.append(key)
+
+
+def test_plain_pool():
+    pool = types.SimpleNamespace()
+    assert utils.db.read_pool(pool, 1) is pool
+    utils.db.pin_reads(pool, 1, 2)
+
+
+def test_routed_pool():
+    pool = Router()
+    assert utils.db.read_pool(pool, 1) is pool.replica
+
+    utils.db.pin_reads(pool, 1, 2)
+    assert pool.pinned == [1, 2]
+    assert utils.db.read_pool(pool, 1) is pool
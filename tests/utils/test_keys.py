@@ -0,0 +1,85 @@
+import pytest
+
+from utils import caching
+from utils.caching import make_key, normalize, normalized_key
+
+
+class Collider:
+    """An object whose instances all share the same hash."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def __hash__(self):
+        return 1
+
+    def __eq__(self, other):
+        return isinstance(other, Collider) and self.value == other.value
+
+
+def test_make_key_fast_paths():
+    assert make_key(1) == 1
+    assert make_key("a") == "a"
+
+    args = (object(), 1)
+    assert make_key(*args) == args
+
+
+def test_make_key_distinct():
+    assert make_key(1) != make_key((1,))
+    assert make_key(1, 2) != make_key((1, 2))
+    assert make_key(1, a=2) != make_key(1, 2)
+    assert make_key(Collider(1)) != make_key(Collider(2))
+
+
+def test_make_key_kwargs_order():
+    assert make_key(1, a=1, b=2) == make_key(1, b=2, a=1)
+
+
+def test_make_key_unhashable():
+    with pytest.raises(TypeError):
+        hash(make_key([1, 2]))
+
+
+def test_normalize():
+    assert normalize([1, [2, 3]]) == (list, (1, (list, (2, 3))))
+    assert normalize({"a": [1]}) == (dict, frozenset({("a", (list, (1,)))}))
+    assert normalize({1, 2}) == (set, frozenset({1, 2}))
+    assert normalize(1) == 1
+
+
+def test_normalize_container_types():
+    assert normalize([1, 2]) != normalize((1, 2))
+    assert normalized_key([1, 2]) != normalized_key((1, 2))
+    assert normalize({1: 2}) != normalize({(1, 2)})
+    assert normalized_key({1: 2}) != normalized_key({(1, 2)})
+    assert normalize({1, 2}) != normalize(frozenset({1, 2}))
+
+
+def test_normalized_key():
+    assert normalized_key([1, 2], a={"b": 1}) == normalized_key([1, 2], a={"b": 1})
+    assert normalized_key([1, 2]) != normalized_key([2, 1])
+    hash(normalized_key([1, 2], a={"b": [1]}))
+
+
+def test_cached_function_collisions():
+
+    @caching.cached_function(caching.Cache(128))
+    def cached(value):
+        return value.value
+
+    assert cached(Collider(1)) == 1
+    assert cached(Collider(2)) == 2
+
+
+def test_cached_function_normalized_key():
+    calls = []
+
+    @caching.cached_function(caching.Cache(128), key=normalized_key)
+    def cached(values):
+        calls.append(values)
+        return sum(values)
+
+    assert cached([1, 2]) == 3
+    assert cached([1, 2]) == 3
+    assert len(calls) == 1
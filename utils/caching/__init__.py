@@ -1,4 +1,9 @@
-from .cache import Cache
+from .cache import Cache, getsizeof
 from .lru import LRUCache
 from .ttl import TTLCache
-from .decorators import *
\ No newline at end of file
+from .tinylfu import TinyLFUCache
+from .stats import CacheStats
+from .reaper import CacheReaper
+from .registry import *
+from .decorators import *
+from .tags import *
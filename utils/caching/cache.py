@@ -1,5 +1,33 @@
+import sys
 import collections
 
+from . import registry, tags as _tags
+from .stats import CacheStats, CAPACITY
+
+
+def getsizeof(key, value):
+    """
+    Estimate the size of a cache item in bytes.
+
+    This is the default size estimator of caches with a ``maxbytes``
+    budget. It returns the sum of the shallow sizes of the key and value
+    as reported by :func:`sys.getsizeof`, so the size of objects referenced
+    by the value is not included.
+
+    Parameters
+    ----------
+    key: Any
+        The key of the item.
+    value: Any
+        The value of the item.
+
+    Returns
+    -------
+    int
+        The estimated size of the item in bytes.
+    """
+    return sys.getsizeof(key) + sys.getsizeof(value)
+
 
 class Cache(object):
     """
@@ -8,6 +36,11 @@ class Cache(object):
     When adding an item would exceed the cache's ``maxsize``,
     the first item in the cache is evicted.
 
+    When a ``maxbytes`` budget is set, items are evicted according to the
+    cache's eviction policy until the estimated size of all items is within
+    the budget again. Items that exceed the budget on their own are not
+    added to the cache.
+
     Implements the following operations:
 
     .. container:: operations
@@ -36,11 +69,33 @@ class Cache(object):
     ----------
     maxsize: int
         The maximum size of the cache.
+    maxbytes: Optional[int]
+        An optional budget for the estimated size of all items in bytes.
+        Defaults to ``None``, disabling the budget.
+    sizeof: Optional[Callable[[Any, Any], int]]
+        A callable that takes the key and value of an item and returns its
+        estimated size in bytes. Only used when ``maxbytes`` is set. Defaults
+        to :func:`~utils.caching.getsizeof`.
+    name: Optional[str]
+        An optional name to register the cache under.
+        See :func:`~utils.caching.register_cache`.
+    stats: Optional[bool]
+        Whether to collect statistics. Defaults to ``False``.
     """
 
-    def __init__(self, maxsize):
+    def __init__(self, maxsize, *, maxbytes=None, sizeof=None, name=None, stats=False):
         self._data = collections.OrderedDict()
         self._maxsize = maxsize
+        self._maxbytes = maxbytes
+        self._sizeof = sizeof or getsizeof
+        self._sizes = None if maxbytes is None else dict()
+        self._nbytes = 0
+        self._tags = None  # Any : FrozenSet[str]
+        self._name = name
+        self._stats = CacheStats(name) if stats else None
+
+        if name is not None:
+            registry.register_cache(name, self)
 
     # Properties.
 
@@ -58,6 +113,39 @@ class Cache(object):
         """
         return self._maxsize
 
+    @property
+    def maxbytes(self):
+        """
+        Optional[int]: The budget for the estimated size of all items in bytes.
+        """
+        return self._maxbytes
+
+    @property
+    def nbytes(self):
+        """
+        int: The estimated size of all items in bytes. Always ``0`` for
+        caches without a ``maxbytes`` budget.
+        """
+        return self._nbytes
+
+    @property
+    def name(self):
+        """
+        Optional[str]: The name the cache is registered under.
+        """
+        return self._name
+
+    @property
+    def stats(self):
+        """
+        Optional[~utils.caching.CacheStats]: The statistics of the cache,
+        or ``None`` if the cache does not collect statistics.
+        """
+        if self._stats is not None:
+            self._stats.size = self.size
+
+        return self._stats
+
     # Private methods.
 
     def _evict(self):
@@ -66,7 +154,73 @@ class Cache(object):
         a new item is about to be added to the cache, which would cause
         the cache to exceed its ``maxsize``.
         """
-        self._data.popitem(last=False)
+        key, _ = self._data.popitem(last=False)
+        self._removed(key)
+
+        if self._stats is not None:
+            self._stats.record_eviction(CAPACITY)
+
+    def _added(self, key, value, tags=None):
+        """
+        Called whenever an item was added to or updated in the cache.
+
+        Updates the tags of the item, accounts for the size of the item,
+        evicting items until the cache is within its ``maxbytes`` budget,
+        and updates the peak size.
+        """
+        if tags or self._tags:
+            self._retag(key, tags)
+
+        if self._sizes is not None:
+            size = self._sizeof(key, value)
+            self._nbytes += size - self._sizes.get(key, 0)
+            self._sizes[key] = size
+
+            while self._nbytes > self._maxbytes and len(self._data) > 1:
+                self._evict()
+
+            if self._nbytes > self._maxbytes:
+                self.remove(key)
+
+        stats = self._stats
+        if stats is not None and len(self._data) > stats.peak_size:
+            stats.peak_size = len(self._data)
+
+    def _record_lookups(self, hits, misses):
+        """
+        Record the hits and misses of a bulk lookup.
+        """
+        if self._stats is not None:
+            self._stats.hits += hits
+            self._stats.misses += misses
+
+    def _removed(self, key):
+        """
+        Called whenever an item was removed from the cache.
+        """
+        if self._sizes is not None:
+            self._nbytes -= self._sizes.pop(key, 0)
+
+        if self._tags:
+            tags = self._tags.pop(key, None)
+            if tags:
+                _tags._unlink(self, key, tags)
+
+    def _retag(self, key, tags):
+        """
+        Replace the tags of an item.
+        """
+        if self._tags is None:
+            self._tags = dict()
+
+        old = self._tags.pop(key, None)
+        if old:
+            _tags._unlink(self, key, old)
+
+        if tags:
+            tags = frozenset((tags,) if isinstance(tags, str) else tags)
+            self._tags[key] = tags
+            _tags._link(self, key, tags)
 
     # Public methods.
 
@@ -91,10 +245,16 @@ class Cache(object):
             ``key`` is not found in the cache.
         """
         try:
-            return self._data[key]
+            value = self._data[key]
         except KeyError:
+            if self._stats is not None:
+                self._stats.misses += 1
             return fallback
 
+        if self._stats is not None:
+            self._stats.hits += 1
+        return value
+
     def has(self, key):
         """
         Check whether the cache contains an item.
@@ -115,7 +275,7 @@ class Cache(object):
         except KeyError:
             return False
 
-    def put(self, key, value):
+    def put(self, key, value, tags=None):
         """
         Add an item to the cache.
 
@@ -125,11 +285,16 @@ class Cache(object):
             The key to store the item under.
         value: Any
             The value of the tem.
+        tags: Optional[Iterable[str]]
+            Tags to add to the item, such as ``"guild:123"``. Tagged items
+            can be removed from all caches at once through
+            :func:`~utils.caching.invalidate_tag`. Replaces existing tags.
         """
         if key not in self._data and len(self._data) + 1 > self._maxsize:
             self._evict()
         
         self._data[key] = value
+        self._added(key, value, tags)
 
     def clear(self):
         """
@@ -137,6 +302,15 @@ class Cache(object):
         """
         self._data.clear()
 
+        if self._tags:
+            for key, tags in self._tags.items():
+                _tags._unlink(self, key, tags)
+            self._tags.clear()
+
+        if self._sizes is not None:
+            self._sizes.clear()
+            self._nbytes = 0
+
     def pop(self, key):
         """
         Remove an item from the cache and return its value.
@@ -156,7 +330,9 @@ class Cache(object):
         Any
             The value of the removed item.
         """
-        return self._data.pop(key)
+        value = self._data.pop(key)
+        self._removed(key)
+        return value
 
     def remove(self, key, fallback=None):
         """
@@ -175,12 +351,107 @@ class Cache(object):
             The value of the removed item, or ``fallback`` if ``key``
             is not in the cache.
         """
-        return self._data.pop(key, fallback)
+        try:
+            value = self._data.pop(key)
+        except KeyError:
+            return fallback
+
+        self._removed(key)
+        return value
+
+    # Bulk methods.
+
+    def get_many(self, keys):
+        """
+        Get multiple items from the cache.
+
+        Examples
+        --------
+
+        .. code-block:: python3
+
+            found, missing = cache.get_many(guild_ids)
+            rows = await fetch_settings(missing)
+            cache.put_many((row["guild"], row) for row in rows)
+
+        Parameters
+        ----------
+        keys: Iterable[Any]
+            The keys to look up in the cache.
+
+        Returns
+        -------
+        Tuple[Dict[Any, Any], List[Any]]
+            A dictionary of the found keys and their values, and
+            a list of the keys that were not found in the cache.
+        """
+        data = self._data
+        found = dict()
+        missing = []
+
+        for key in keys:
+            try:
+                found[key] = data[key]
+            except KeyError:
+                missing.append(key)
+
+        self._record_lookups(len(found), len(missing))
+        return found, missing
+
+    def put_many(self, items, tags=None):
+        """
+        Add multiple items to the cache.
+
+        Parameters
+        ----------
+        items: Union[Mapping[Any, Any], Iterable[Tuple[Any, Any]]]
+            A mapping or an iterable of key-value pairs to add.
+        tags: Optional[Iterable[str]]
+            Tags to add to every item.
+        """
+        if hasattr(items, "items"):
+            items = items.items()
+
+        for key, value in items:
+            self.put(key, value, tags)
+
+    def invalidate_many(self, keys):
+        """
+        Remove multiple items from the cache.
+
+        Keys that are not in the cache are ignored.
+
+        Parameters
+        ----------
+        keys: Iterable[Any]
+            The keys to remove from the cache.
+
+        Returns
+        -------
+        int
+            The number of removed items.
+        """
+        removed = 0
+        for key in keys:
+            if key in self._data:
+                self.pop(key)
+                removed += 1
+
+        return removed
 
     # Magic methods.
 
     def __getitem__(self, key):
-        return self._data[key]
+        try:
+            value = self._data[key]
+        except KeyError:
+            if self._stats is not None:
+                self._stats.misses += 1
+            raise
+
+        if self._stats is not None:
+            self._stats.hits += 1
+        return value
 
     def __setitem__(self, key, value):
         self.put(key, value)
@@ -1,30 +1,55 @@
 import time
+import asyncio
 import inspect
+import logging
 import functools
 
-__all__ = ("hash_key", "cached_function", "cached_method", "cached_property")
+from . import registry
+from .stats import CacheStats
+
+__all__ = (
+    "hash_key",
+    "make_key",
+    "normalize",
+    "key_builder",
+    "normalized_key",
+    "cached_function",
+    "cached_method",
+    "cached_property",
+)
 
 # pylint: disable=function-redefined
 
 _marker = (object(),)
 
+# Types that are returned as they are when passed as the sole argument.
+_fast_types = {int, str}
+
+log = logging.getLogger(__name__)
+
 
 def hash_key(*args, **kwargs):
     r"""
-    Get a unique key for a combination of positional and
+    Get a hash value for a combination of positional and
     keyword arguments.
 
+    .. warning::
+
+        Different combinations of arguments may share the same hash
+        value, which causes them to share the same cache entry. Use
+        :func:`~utils.caching.make_key` instead.
+
     Parameters
     ----------
     \*args
         Positional arguments.
     \*\*kwargs
         Keyword arguments.
-    
+
     Returns
     -------
     int
-        A unique hash value generated for the provided
+        A hash value generated for the provided
         positional and keyword arguments.
     """
     key = args
@@ -34,7 +59,407 @@ def hash_key(*args, **kwargs):
     return hash(key)
 
 
-def cached_function(cache, key=hash_key, lock=None):
+def make_key(*args, **kwargs):
+    r"""
+    Get a unique key for a combination of positional and
+    keyword arguments.
+
+    Keys compare equal exactly when the arguments compare equal. The
+    order of keyword arguments does not matter. A sole :class:`int` or
+    :class:`str` argument is used as the key as it is, and the tuple of
+    positional arguments is used as the key when there are no keyword
+    arguments, so common calls do not allocate a new key.
+
+    All arguments must be hashable. Use :func:`~utils.caching.normalized_key`
+    for functions that take unhashable arguments.
+
+    Parameters
+    ----------
+    \*args
+        Positional arguments.
+    \*\*kwargs
+        Keyword arguments.
+
+    Returns
+    -------
+    Hashable
+        A key for the provided positional and keyword arguments.
+    """
+    if kwargs:
+        return args + _marker + tuple(sorted(kwargs.items()))
+
+    if len(args) == 1 and type(args[0]) in _fast_types:
+        return args[0]
+
+    return args
+
+
+def normalize(value):
+    """
+    Convert a value into a hashable value.
+
+    Lists and tuples are converted into tuples, sets into frozensets and
+    dictionaries into frozensets of their items. Their contents are
+    normalized recursively. Each converted container is paired with its
+    type, so containers of different types with the same contents, such
+    as ``[1, 2]`` and ``(1, 2)``, do not collide. Other values are returned
+    as they are.
+
+    Parameters
+    ----------
+    value: Any
+        The value to normalize.
+
+    Returns
+    -------
+    Hashable
+        The normalized value.
+    """
+    t = type(value)
+    if t is list or t is tuple:
+        return (t, tuple(normalize(v) for v in value))
+    if t is dict:
+        return (t, frozenset((k, normalize(v)) for k, v in value.items()))
+    if t is set:
+        return (t, frozenset(normalize(v) for v in value))
+    return value
+
+
+def key_builder(encoder):
+    """
+    Create a key function that encodes all arguments before building
+    the key with :func:`~utils.caching.make_key`.
+
+    Parameters
+    ----------
+    encoder: Callable[[Any], Hashable]
+        A callable that takes an argument and returns a hashable
+        representation of it.
+
+    Returns
+    -------
+    Callable[[Any, ...], Hashable]
+        The key function.
+    """
+
+    def key(*args, **kwargs):
+        args = tuple(encoder(a) for a in args)
+        if kwargs:
+            kwargs = {k: encoder(v) for k, v in kwargs.items()}
+        return make_key(*args, **kwargs)
+
+    return key
+
+
+#: A key function that supports unhashable arguments such as lists and
+#: dictionaries by normalizing them with :func:`~utils.caching.normalize`.
+normalized_key = key_builder(normalize)
+
+
+def _make_stats(func, name, stats, timed, sized=True):
+    """
+    Create the statistics for a caching decorator.
+
+    Returns ``None`` when neither ``stats`` nor ``timed`` are enabled.
+    Evictions are recorded by the cache, so they are not tracked here.
+    """
+    if not (stats or timed):
+        return None
+
+    return CacheStats(name or func.__qualname__, sized=sized, evicting=False)
+
+
+def _check_options(func, lock, coalesce, soft_ttl, hard_ttl):
+    """
+    Ensure that coalescing and stale-while-revalidate are only enabled
+    for coroutine functions without a lock.
+    """
+    if soft_ttl is None and hard_ttl is not None:
+        raise TypeError("A hard_ttl requires a soft_ttl!")
+
+    if soft_ttl is not None and hard_ttl is not None and hard_ttl < soft_ttl:
+        raise ValueError("The hard_ttl must not be shorter than the soft_ttl!")
+
+    if not (coalesce or soft_ttl is not None):
+        return
+
+    if not inspect.iscoroutinefunction(func):
+        raise TypeError(f"Cannot coalesce calls to {func!r}, which is not a coroutine function!")
+
+    if lock is not None:
+        raise TypeError("Coalescing calls cannot be combined with a lock!")
+
+
+def _make_wrapper(
+    func,
+    lookup,
+    lock,
+    stats,
+    timed,
+    coalesce=False,
+    soft_ttl=None,
+    hard_ttl=None,
+    clock=None,
+    tags=None,
+):
+    """
+    Create the memoizing wrapper for a function.
+
+    Parameters
+    ----------
+    func: Callable
+        The function to wrap.
+    lookup: Callable[[tuple, dict], Tuple[~utils.caching.Cache, Any]]
+        A callable that takes the positional and keyword arguments of
+        a call and returns the cache and key to use for the call.
+    lock: Optional[Union[asyncio.Lock, threading.Lock]]
+        An optional lock to hold while interacting with the cache.
+    stats: Optional[~utils.caching.CacheStats]
+        Optional statistics to record hits and misses in.
+    timed: bool
+        Whether to record the time spent computing missing values.
+    coalesce: bool
+        Whether concurrent misses for the same key share one computation.
+        Only supported for coroutine functions.
+    soft_ttl: Optional[float]
+        The age in seconds after which cached values are refreshed in the
+        background. Enables coalescing. Values are stored together with
+        the time they were computed at.
+    hard_ttl: Optional[float]
+        The age in seconds after which cached values are no longer
+        returned and callers wait for a fresh value.
+    clock: Optional[Callable[[], float]]
+        The clock to determine the age of cached values with.
+        Defaults to :func:`time.monotonic`.
+    tags: Optional[Callable[..., Iterable[str]]]
+        A callable that takes the arguments of a call and returns the
+        tags to add to the cached value.
+    """
+    timer = time.perf_counter
+    clock = clock or time.monotonic
+
+    if tags is None:
+        def store(c, k, v, args, kwargs):
+            c[k] = v
+    else:
+        def store(c, k, v, args, kwargs):
+            c.put(k, v, tags=tags(*args, **kwargs))
+
+    # Track the size of the cache, which only changes when storing values.
+    if stats is not None and stats.sized:
+        put = store
+
+        def store(c, k, v, args, kwargs):
+            put(c, k, v, args, kwargs)
+            stats.size = size = len(c)
+            if size > stats.peak_size:
+                stats.peak_size = size
+
+    # Asynchronous wrapper with stale-while-revalidate
+    if soft_ttl is not None:
+        pending = dict()  # (Cache, key) : asyncio.Task
+        max_age = float("inf") if hard_ttl is None else hard_ttl
+
+        async def compute(c, k, args, kwargs):
+            start = timer()
+            v = await func(*args, **kwargs)
+            if timed:
+                stats.miss_time += timer() - start
+            store(c, k, (v, clock()), args, kwargs)
+            return v
+
+        def refreshed(task):
+            # Stale values are kept when a background refresh fails,
+            # so the failure is only reported.
+            if not task.cancelled() and task.exception() is not None:
+                name = func.__qualname__
+                log.error(f"Could not refresh cached value of {name!r}!", exc_info=task.exception())
+
+        def schedule(c, k, args, kwargs):
+            task = asyncio.ensure_future(compute(c, k, args, kwargs))
+            pending[c, k] = task
+            task.add_done_callback(lambda _: pending.pop((c, k), None))
+            return task
+
+        async def wrapper(*args, **kwargs):
+            c, k = lookup(args, kwargs)
+            try:
+                v, computed = c[k]
+            except KeyError:
+                pass
+            else:
+                age = clock() - computed
+                if age < max_age:
+                    if stats is not None:
+                        stats.hits += 1
+
+                    # Serve the stale value and refresh it in the background.
+                    if age >= soft_ttl and (c, k) not in pending:
+                        schedule(c, k, args, kwargs).add_done_callback(refreshed)
+
+                    return v
+
+            if stats is not None:
+                stats.misses += 1
+
+            try:
+                task = pending[c, k]
+            except KeyError:
+                task = schedule(c, k, args, kwargs)
+
+            return await asyncio.shield(task)
+
+    # Asynchronous wrapper with request coalescing
+    elif coalesce:
+        pending = dict()  # (Cache, key) : asyncio.Task
+
+        async def compute(c, k, args, kwargs):
+            start = timer()
+            v = await func(*args, **kwargs)
+            if timed:
+                stats.miss_time += timer() - start
+            store(c, k, v, args, kwargs)
+            return v
+
+        async def wrapper(*args, **kwargs):
+            c, k = lookup(args, kwargs)
+            try:
+                v = c[k]
+            except KeyError:
+                pass
+            else:
+                if stats is not None:
+                    stats.hits += 1
+                return v
+
+            if stats is not None:
+                stats.misses += 1
+
+            # Join the computation for the key if one is in flight. The
+            # computation is shielded, so cancelling a waiter does not
+            # cancel the computation for the other waiters.
+            try:
+                task = pending[c, k]
+            except KeyError:
+                task = asyncio.ensure_future(compute(c, k, args, kwargs))
+                pending[c, k] = task
+                task.add_done_callback(lambda _: pending.pop((c, k), None))
+
+            return await asyncio.shield(task)
+
+    # Asynchronous wrapper with lock
+    elif inspect.iscoroutinefunction(func) and lock is not None:
+        async def wrapper(*args, **kwargs):
+            c, k = lookup(args, kwargs)
+            try:
+                async with lock:
+                    v = c[k]
+            except KeyError:
+                pass
+            else:
+                if stats is not None:
+                    stats.hits += 1
+                return v
+
+            if stats is not None:
+                stats.misses += 1
+
+            async with lock:
+                start = timer()
+                v = await func(*args, **kwargs)
+                if timed:
+                    stats.miss_time += timer() - start
+                store(c, k, v, args, kwargs)
+            return v
+
+    # Asynchronous wrapper without lock
+    elif inspect.iscoroutinefunction(func):
+        async def wrapper(*args, **kwargs):
+            c, k = lookup(args, kwargs)
+            try:
+                v = c[k]
+            except KeyError:
+                pass
+            else:
+                if stats is not None:
+                    stats.hits += 1
+                return v
+
+            if stats is not None:
+                stats.misses += 1
+
+            start = timer()
+            v = await func(*args, **kwargs)
+            if timed:
+                stats.miss_time += timer() - start
+            store(c, k, v, args, kwargs)
+            return v
+
+    # Synchronous wrapper with lock
+    elif lock is not None:
+        def wrapper(*args, **kwargs):
+            c, k = lookup(args, kwargs)
+            try:
+                with lock:
+                    v = c[k]
+            except KeyError:
+                pass
+            else:
+                if stats is not None:
+                    stats.hits += 1
+                return v
+
+            if stats is not None:
+                stats.misses += 1
+
+            with lock:
+                start = timer()
+                v = func(*args, **kwargs)
+                if timed:
+                    stats.miss_time += timer() - start
+                store(c, k, v, args, kwargs)
+            return v
+
+    # Synchronous wrapper without lock
+    else:
+        def wrapper(*args, **kwargs):
+            c, k = lookup(args, kwargs)
+            try:
+                v = c[k]
+            except KeyError:
+                pass
+            else:
+                if stats is not None:
+                    stats.hits += 1
+                return v
+
+            if stats is not None:
+                stats.misses += 1
+
+            start = timer()
+            v = func(*args, **kwargs)
+            if timed:
+                stats.miss_time += timer() - start
+            store(c, k, v, args, kwargs)
+            return v
+
+    return functools.update_wrapper(wrapper, func)
+
+
+def cached_function(
+    cache,
+    key=make_key,
+    lock=None,
+    *,
+    name=None,
+    stats=False,
+    timed=False,
+    coalesce=False,
+    soft_ttl=None,
+    hard_ttl=None,
+    clock=None,
+    tags=None,
+):
     """
     Decorator that adds caching to a decorated function.
 
@@ -60,6 +485,10 @@ def cached_function(cache, key=hash_key, lock=None):
         # You're cool, Maxee!
         # You're cool, Maxee!
 
+    The decorated function has a ``cache`` attribute that holds the
+    cache, and a ``stats`` attribute that holds the collected
+    :class:`~utils.caching.CacheStats` or ``None``.
+
     Parameters
     ----------
     cache: ~senko.utils.caching.Cache
@@ -67,65 +496,91 @@ def cached_function(cache, key=hash_key, lock=None):
     key: Optional[Callable[[Any, ...], Any]
         A callable that takes any set of positional and
         keyword arguments and returns a unique key. Defaults
-        to :func:`~senko.utils.caching.hash_key`.
+        to :func:`~utils.caching.make_key`.
     lock: Optional[Union[asyncio.Lock, threading.Lock]]
         An optional lock to use when interacting with the cache.
         Must be a lock corresponding to the type of the decorated
         function. Defaults to ``None``, disabling the lock.
+    name: Optional[str]
+        An optional name to register the decorated function under.
+        See :func:`~utils.caching.register_cache`.
+    stats: Optional[bool]
+        Whether to collect hit and miss statistics. Defaults to ``False``.
+    timed: Optional[bool]
+        Whether to record the time spent computing missing values.
+        Enables ``stats``. Defaults to ``False``.
+    coalesce: Optional[bool]
+        Whether concurrent calls that miss the same key share a single
+        call to the decorated coroutine function, while calls for other
+        keys proceed in parallel. When the call raises an exception, it
+        is propagated to all waiting callers and nothing is cached. Only
+        supported for coroutine functions and cannot be combined with
+        ``lock``. Defaults to ``False``.
+    soft_ttl: Optional[float]
+        Enables stale-while-revalidate. Once a cached value is older than
+        ``soft_ttl`` seconds, it is still returned, but a single refresh
+        is scheduled in the background. When the refresh fails, the error
+        is logged and the stale value is kept. Implies ``coalesce``. The
+        cache stores values together with the time they were computed at.
+        Defaults to ``None``, disabling stale-while-revalidate.
+    hard_ttl: Optional[float]
+        The age in seconds after which a cached value is no longer
+        returned and callers wait for a fresh value instead. Requires
+        ``soft_ttl``. Defaults to ``None``, allowing stale values to be
+        returned regardless of their age.
+    clock: Optional[Callable[[], float]]
+        A callable that returns the current time in seconds, used to
+        determine the age of cached values. Defaults to :func:`time.monotonic`.
+    tags: Optional[Callable[..., Iterable[str]]]
+        A callable that takes the same arguments as the decorated function
+        and returns the tags to add to the cached value, such as
+        ``lambda guild: [f"guild:{guild.id}"]``. See
+        :func:`~utils.caching.invalidate_tag`. Defaults to ``None``.
+
+    Raises
+    ------
+    TypeError
+        When ``coalesce`` is enabled for a regular function or together
+        with a ``lock``, or when a ``hard_ttl`` is set without a ``soft_ttl``.
+    ValueError
+        When ``hard_ttl`` is shorter than ``soft_ttl``.
     """
 
     def decorator(func):
+        _check_options(func, lock, coalesce, soft_ttl, hard_ttl)
+        s = _make_stats(func, name, stats, timed)
 
-        # Asynchronous wrapper with lock
-        if inspect.iscoroutinefunction(func) and lock is not None:
-            async def wrapper(*args, **kwargs):
-                k = key(*args, **kwargs)
-                try:
-                    async with lock:
-                        return cache[k]
-                except KeyError:
-                    async with lock:
-                        cache[k] = v = await func(*args, **kwargs)
-                    return v
+        def lookup(args, kwargs):
+            return cache, key(*args, **kwargs)
 
-        # Asynchronous wrapper without lock:
-        if inspect.iscoroutinefunction(func):
-            async def wrapper(*args, **kwargs):
-                k = key(*args, **kwargs)
-                try:
-                    return cache[k]
-                except KeyError:
-                    cache[k] = v = await func(*args, **kwargs)
-                    return v
+        wrapper = _make_wrapper(
+            func, lookup, lock, s, timed, coalesce, soft_ttl, hard_ttl, clock, tags
+        )
+        wrapper.cache = cache
+        wrapper.stats = s
 
-        # Synchronous wrapper with lock
-        elif lock is not None:
-            def wrapper(*args, **kwargs):
-                k = key(*args, **kwargs)
-                try:
-                    with lock:
-                        return cache[k]
-                except:
-                    with lock:
-                        cache[k] = v = func(*args, **kwargs)
-                    return v
+        if name is not None:
+            registry.register_cache(name, wrapper)
 
-        # Synchronous wrapper without lock
-        else:
-            def wrapper(*args, **kwargs):
-                k = key(*args, **kwargs)
-                try:
-                    return cache[k]
-                except:
-                    cache[k] = v = func(*args, **kwargs)
-                    return v
-
-        return functools.update_wrapper(wrapper, func)
+        return wrapper
 
     return decorator
 
 
-def cached_method(cache, key=hash_key, lock=None, slot=None):
+def cached_method(
+    cache,
+    key=make_key,
+    lock=None,
+    *,
+    name=None,
+    stats=False,
+    timed=False,
+    coalesce=False,
+    soft_ttl=None,
+    hard_ttl=None,
+    clock=None,
+    tags=None,
+):
     """
     Decorator that adds caching to a decorated method.
 
@@ -139,12 +594,12 @@ def cached_method(cache, key=hash_key, lock=None, slot=None):
         class Example:
             def __init__(self):
                 self._cache = caching.LRUCache(128)
-            
+
             @caching.cached_method(lambda self: self._cache)
             def greeting(self, name):
                 print("Generating highly personalized greeting.")
                 return f"Hello {name}!"
-        
+
         example = Example()
         print(example.greeting("Maxee"))
         print(example.greeting("Maxee"))
@@ -154,6 +609,10 @@ def cached_method(cache, key=hash_key, lock=None, slot=None):
         # Hello Maxee!
         # Hello Maxee!
 
+    The decorated method has a ``stats`` attribute that holds the
+    :class:`~utils.caching.CacheStats` collected across all instances,
+    or ``None``.
+
     Parameters
     ----------
     cache: Callable[[Any], ~senko.utils.caching.Cache]
@@ -161,65 +620,74 @@ def cached_method(cache, key=hash_key, lock=None, slot=None):
         as its sole parameter and returns a cache instance.
     key: Optional[Callable[[Any, ...], Any]
         A callable that takes any set of positional and
-        keyword arguments and returns a unique key. Defaults
-        to :func:`~senko.utils.caching.hash_key`.
+        keyword arguments, excluding the instance, and returns
+        a unique key. Defaults to :func:`~utils.caching.make_key`.
     lock: Optional[Union[asyncio.Lock, threading.Lock]]
         An optional lock to use when interacting with the cache.
         Must be a lock corresponding to the type of the decorated
         method. Defaults to ``None``, disabling the lock.
+    name: Optional[str]
+        An optional name to register the decorated method under.
+        See :func:`~utils.caching.register_cache`.
+    stats: Optional[bool]
+        Whether to collect hit and miss statistics. Defaults to ``False``.
+    timed: Optional[bool]
+        Whether to record the time spent computing missing values.
+        Enables ``stats``. Defaults to ``False``.
+    coalesce: Optional[bool]
+        Whether concurrent calls that miss the same key share a single
+        call to the decorated coroutine function, while calls for other
+        keys proceed in parallel. When the call raises an exception, it
+        is propagated to all waiting callers and nothing is cached. Only
+        supported for coroutine functions and cannot be combined with
+        ``lock``. Defaults to ``False``.
+    soft_ttl: Optional[float]
+        Enables stale-while-revalidate. Once a cached value is older than
+        ``soft_ttl`` seconds, it is still returned, but a single refresh
+        is scheduled in the background. When the refresh fails, the error
+        is logged and the stale value is kept. Implies ``coalesce``. The
+        cache stores values together with the time they were computed at.
+        Defaults to ``None``, disabling stale-while-revalidate.
+    hard_ttl: Optional[float]
+        The age in seconds after which a cached value is no longer
+        returned and callers wait for a fresh value instead. Requires
+        ``soft_ttl``. Defaults to ``None``, allowing stale values to be
+        returned regardless of their age.
+    clock: Optional[Callable[[], float]]
+        A callable that returns the current time in seconds, used to
+        determine the age of cached values. Defaults to :func:`time.monotonic`.
+    tags: Optional[Callable[..., Iterable[str]]]
+        A callable that takes the same arguments as the decorated function
+        and returns the tags to add to the cached value, such as
+        ``lambda guild: [f"guild:{guild.id}"]``. See
+        :func:`~utils.caching.invalidate_tag`. Defaults to ``None``.
+
+    Raises
+    ------
+    TypeError
+        When ``coalesce`` is enabled for a regular function or together
+        with a ``lock``, or when a ``hard_ttl`` is set without a ``soft_ttl``.
+    ValueError
+        When ``hard_ttl`` is shorter than ``soft_ttl``.
     """
 
     def decorator(func):
+        _check_options(func, lock, coalesce, soft_ttl, hard_ttl)
+        # Instances have caches of their own, so there is no single size.
+        s = _make_stats(func, name, stats, timed, sized=False)
 
-        # Asynchronous wrapper with lock
-        if inspect.iscoroutinefunction(func) and lock is not None:
-            async def wrapper(self, *args, **kwargs):
-                c = cache(self)
-                k = key(self, *args, **kwargs)
-                try:
-                    async with lock:
-                        return c[k]
-                except KeyError:
-                    async with lock:
-                        c[k] = v = await func(self, *args, **kwargs)
-                    return v
-
-        # Asynchronous wrapper without lock:
-        if inspect.iscoroutinefunction(func):
-            async def wrapper(self, *args, **kwargs):
-                c = cache(self)
-                k = key(*args, **kwargs)
-                try:
-                    return c[k]
-                except KeyError:
-                    c[k] = v = await func(self, *args, **kwargs)
-                    return v
+        def lookup(args, kwargs):
+            return cache(args[0]), key(*args[1:], **kwargs)
 
-        # Synchronous wrapper with lock
-        elif lock is not None:
-            def wrapper(self, *args, **kwargs):
-                c = cache(self)
-                k = key(*args, **kwargs)
-                try:
-                    with lock:
-                        return c[k]
-                except:
-                    with lock:
-                        c[k] = v = func(self, *args, **kwargs)
-                    return v
+        wrapper = _make_wrapper(
+            func, lookup, lock, s, timed, coalesce, soft_ttl, hard_ttl, clock, tags
+        )
+        wrapper.stats = s
 
-        # Synchronous wrapper without lock
-        else:
-            def wrapper(self, *args, **kwargs): 
-                c = cache(self)
-                k = key(*args, **kwargs)
-                try:
-                    return c[k]
-                except:
-                    c[k] = v = func(self, *args, **kwargs)
-                    return v
+        if name is not None:
+            registry.register_cache(name, wrapper)
 
-        return functools.update_wrapper(wrapper, func)
+        return wrapper
 
     return decorator
 
@@ -255,42 +723,72 @@ class cached_property(object):
                 \"\"\"
                 # This function is ran exactly once when accessed.
                 return a + b
-    
+
     Parameters
     ----------
-    slot: Optional[str] 
+    slot: Optional[str]
         Optional name of an attribute slot to use to store the cached
         property value in. Defaults to ``__<function name>_cache__``.
     ttl: Optional[float]
         An optional delay in seconds after which the next call to the
         property will call the decorated function again to determine
         the return value. Defaults to ``None``, disabling the timeout.
+    clock: Optional[Callable[[], float]]
+        A callable that returns the current time in seconds.
+        Defaults to :func:`time.monotonic`.
+    name: Optional[str]
+        An optional name to register the property under.
+        See :func:`~utils.caching.register_cache`.
+    stats: Optional[bool]
+        Whether to collect hit and miss statistics across all instances.
+        The statistics are available through the ``stats`` attribute of
+        the property. Defaults to ``False``.
+    timed: Optional[bool]
+        Whether to record the time spent computing missing values.
+        Enables ``stats``. Defaults to ``False``.
     """
 
-    def __init__(self, slot=None, ttl=None):
+    def __init__(self, slot=None, ttl=None, *, clock=None, name=None, stats=False, timed=False):
         self._attr = slot
         self._func = None
         self._ttl = ttl
+        self._clock = clock or time.monotonic
+        self._name = name
+        self._timed = timed
+        self._stats = stats or timed
+        self.stats = None
+
+    def _compute(self, instance, now):
+        stats = self.stats
+        if stats is None:
+            value = self._func(instance)
+        else:
+            stats.misses += 1
+            start = time.perf_counter()
+            value = self._func(instance)
+            if self._timed:
+                stats.miss_time += time.perf_counter() - start
+
+        setattr(instance, self._attr, (value, now))
+        return value
 
     def __get__(self, instance, owner):
-        now = time.time()
-        value, last = getattr(instance, self._attr, (None, 0))
+        cached = getattr(instance, self._attr, None)
 
-        # Handle no timeout.
-        if self._ttl is None and last == 0:
-            value = self._func(instance)
-            setattr(instance, self._attr, (value, now))
+        # Handle values that were not computed yet.
+        if cached is None:
+            return self._compute(instance, self._clock())
 
-        elif self._ttl is None:
-            value = getattr(instance, self._attr)[0]
+        value, last = cached
 
         # Handle timeout.
-        elif now - last > self._ttl:
-            value = self._func(instance)
-            setattr(instance, self._attr, (value, now))
+        if self._ttl is not None:
+            now = self._clock()
+            if now - last > self._ttl:
+                return self._compute(instance, now)
 
-        else:
-            value = getattr(instance, self._attr)[0]
+        if self.stats is not None:
+            self.stats.hits += 1
 
         return value
 
@@ -298,4 +796,13 @@ class cached_property(object):
         self._func = func
         self._attr = self._attr or f"__{func.__name__}_cache__"
         self.__doc__ = getattr(func, "__doc__")
+
+        if self._stats:
+            self.stats = CacheStats(
+                self._name or func.__qualname__, sized=False, evicting=False
+            )
+
+        if self._name is not None:
+            registry.register_cache(self._name, self)
+
         return self
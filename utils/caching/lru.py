@@ -1,4 +1,5 @@
 from .cache import Cache
+from .stats import CAPACITY
 
 
 class LRUCache(Cache):
@@ -18,26 +19,81 @@ class LRUCache(Cache):
     ----------
     maxsize: int
         The maximum size of the cache.
+    maxbytes: Optional[int]
+        An optional budget for the estimated size of all items in bytes.
+    sizeof: Optional[Callable[[Any, Any], int]]
+        An optional callable that estimates the size of an item in bytes.
+    name: Optional[str]
+        An optional name to register the cache under.
+    stats: Optional[bool]
+        Whether to collect statistics. Defaults to ``False``.
     """
 
     def _evict(self):
-        self._data.popitem(last=False)
+        key, _ = self._data.popitem(last=False)
+        self._removed(key)
+
+        if self._stats is not None:
+            self._stats.record_eviction(CAPACITY)
 
     def get(self, key, fallback=None):
         try:
             self._data.move_to_end(key)
-            return self._data[key]
         except KeyError:
+            if self._stats is not None:
+                self._stats.misses += 1
             return fallback
 
-    def put(self, key, value):
+        if self._stats is not None:
+            self._stats.hits += 1
+        return self._data[key]
+
+    def put(self, key, value, tags=None):
         if key not in self._data and len(self._data) + 1 > self._maxsize:
             self._evict()
 
         self._data[key] = value
         self._data.move_to_end(key)
+        self._added(key, value, tags)
+
+    def get_many(self, keys):
+        data = self._data
+        found = dict()
+        missing = []
+
+        for key in keys:
+            try:
+                data.move_to_end(key)
+            except KeyError:
+                missing.append(key)
+            else:
+                found[key] = data[key]
+
+        self._record_lookups(len(found), len(missing))
+        return found, missing
+
+    def put_many(self, items, tags=None):
+        if hasattr(items, "items"):
+            items = items.items()
+
+        data = self._data
+        for key, value in items:
+            if key not in data and len(data) + 1 > self._maxsize:
+                self._evict()
+
+            data[key] = value
+            data.move_to_end(key)
+            self._added(key, value, tags)
 
     def __getitem__(self, key):
-        self._data.move_to_end(key)
+        try:
+            self._data.move_to_end(key)
+        except KeyError:
+            if self._stats is not None:
+                self._stats.misses += 1
+            raise
+
+        if self._stats is not None:
+            self._stats.hits += 1
         return self._data[key]
 
@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import weakref
+
+from . import registry
+
+__all__ = ("CacheReaper",)
+
+log = logging.getLogger(__name__)
+
+
+class CacheReaper(object):
+    """
+    Periodically removes expired items from caches.
+
+    Caches only remove expired items when they are accessed, so idle
+    caches keep expired items, and every object they reference, alive.
+    The reaper sweeps caches in the background to release them.
+
+    Every cache with an ``expire`` method, such as :class:`~.TTLCache`,
+    that is either added to the reaper or registered under a name is
+    swept. Sweeps remove at most ``batch_size`` items at a time and yield
+    to the event loop between batches, so large caches never stall the loop.
+
+    The reaper only holds weak references to added caches.
+
+    Examples
+    --------
+
+    .. code-block:: python3
+
+        reaper = utils.caching.CacheReaper(interval=30)
+        reaper.add(cache)
+        reaper.start()
+
+    Parameters
+    ----------
+    interval: Optional[float]
+        The delay between sweeps in seconds. Defaults to ``60``.
+    batch_size: Optional[int]
+        The maximum number of items to remove before yielding to
+        the event loop. Defaults to ``256``.
+    """
+
+    def __init__(self, interval=60.0, batch_size=256):
+        self._interval = interval
+        self._batch_size = batch_size
+        self._caches = weakref.WeakSet()
+        self._task = None
+
+    @property
+    def running(self):
+        """
+        bool: Whether the reaper is running.
+        """
+        return self._task is not None and not self._task.done()
+
+    def add(self, cache):
+        """
+        Add a cache to sweep.
+
+        Parameters
+        ----------
+        cache: ~utils.caching.TTLCache
+            The cache to sweep. Must have an ``expire`` method.
+        """
+        self._caches.add(cache)
+
+    def discard(self, cache):
+        """
+        Stop sweeping a cache.
+
+        Has no effect if the cache was not added. Caches that are
+        registered under a name are still swept.
+
+        Parameters
+        ----------
+        cache: ~utils.caching.TTLCache
+            The cache to stop sweeping.
+        """
+        self._caches.discard(cache)
+
+    def _targets(self):
+        """
+        Get the caches to sweep.
+        """
+        targets = list(self._caches)
+        for cache in registry.get_caches().values():
+            if callable(getattr(cache, "expire", None)) and cache not in targets:
+                targets.append(cache)
+
+        return targets
+
+    async def sweep(self):
+        """
+        Remove expired items from all caches.
+
+        Returns
+        -------
+        int
+            The number of removed items.
+        """
+        total = 0
+        for cache in self._targets():
+            while True:
+                removed = cache.expire(limit=self._batch_size)
+                total += removed
+                await asyncio.sleep(0)
+
+                if removed < self._batch_size:
+                    break
+
+        return total
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                removed = await self.sweep()
+            except Exception as exc:
+                log.exception("An error occured while sweeping caches!", exc_info=exc)
+            else:
+                if removed:
+                    log.debug(f"Removed {removed} expired cache item(s).")
+
+    def start(self, loop=None):
+        """
+        Start sweeping caches in the background.
+
+        Has no effect if the reaper is already running.
+
+        Parameters
+        ----------
+        loop: Optional[asyncio.AbstractEventLoop]
+            The event loop to run the reaper on. Defaults to
+            the current event loop.
+        """
+        if self.running:
+            return
+
+        loop = loop or asyncio.get_event_loop()
+        self._task = loop.create_task(self._run())
+
+    def stop(self):
+        """
+        Stop sweeping caches.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
@@ -0,0 +1,97 @@
+import weakref
+
+__all__ = (
+    "register_cache",
+    "unregister_cache",
+    "get_cache",
+    "get_caches",
+    "dump_stats",
+)
+
+# Maps names to caches and decorated functions. Entries are dropped as soon
+# as the registered object is garbage collected.
+_registry = weakref.WeakValueDictionary()
+
+
+def register_cache(name, cache):
+    """
+    Register a cache under a name.
+
+    Caches and caching decorators created with a ``name`` are registered
+    automatically. Registering another cache under an existing name replaces
+    the previous entry.
+
+    The registry only holds weak references to registered objects.
+
+    Parameters
+    ----------
+    name: str
+        The name to register the cache under.
+    cache: Union[~utils.caching.Cache, Callable]
+        The cache or cached function to register. Must have a ``stats``
+        attribute.
+    """
+    _registry[name] = cache
+
+
+def unregister_cache(name):
+    """
+    Remove a cache from the registry.
+
+    Has no effect if no cache is registered under the given name.
+
+    Parameters
+    ----------
+    name: str
+        The name of the cache to unregister.
+    """
+    _registry.pop(name, None)
+
+
+def get_cache(name):
+    """
+    Get a registered cache by its name.
+
+    Parameters
+    ----------
+    name: str
+        The name of the cache.
+
+    Returns
+    -------
+    Optional[Union[~utils.caching.Cache, Callable]]
+        The registered cache, or ``None`` if no cache is registered
+        under the given name.
+    """
+    return _registry.get(name)
+
+
+def get_caches():
+    """
+    Get all registered caches.
+
+    Returns
+    -------
+    Dict[str, Union[~utils.caching.Cache, Callable]]
+        A mapping of names to registered caches.
+    """
+    return dict(_registry.items())
+
+
+def dump_stats():
+    """
+    Get the statistics of all registered caches that collect statistics.
+
+    Returns
+    -------
+    Dict[str, Dict[str, Any]]
+        A mapping of cache names to the output of
+        :meth:`~utils.caching.CacheStats.to_dict`.
+    """
+    result = dict()
+    for name, cache in list(_registry.items()):
+        stats = getattr(cache, "stats", None)
+        if stats is not None:
+            result[name] = stats.to_dict()
+
+    return result
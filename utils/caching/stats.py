@@ -0,0 +1,142 @@
+__all__ = ("CacheStats",)
+
+#: Eviction reason for items removed to make room for new items.
+CAPACITY = "capacity"
+
+#: Eviction reason for items removed because their time-to-live expired.
+EXPIRY = "expiry"
+
+
+class CacheStats(object):
+    """
+    Counters collected by a cache or caching decorator.
+
+    Statistics are opt-in. Instances of this class are created by caches
+    and caching decorators when they are created with ``stats=True`` and
+    are available through their ``stats`` attribute.
+
+    Parameters
+    ----------
+    name: Optional[str]
+        The name of the cache the statistics belong to.
+    sized: Optional[bool]
+        Whether the size of the cache is tracked. Caching decorators that
+        use a different cache per instance do not track it. Defaults to
+        ``True``.
+    evicting: Optional[bool]
+        Whether evictions are tracked. Caching decorators do not evict items
+        themselves and do not track them, the evictions are recorded in the
+        statistics of their cache instead. Defaults to ``True``.
+
+    Attributes
+    ----------
+    name: Optional[str]
+        The name of the cache the statistics belong to.
+    hits: int
+        The number of lookups that found an item.
+    misses: int
+        The number of lookups that did not find an item.
+    evictions: Optional[Dict[str, int]]
+        The number of evicted items by reason. Items are either evicted to
+        stay within the capacity of the cache (``"capacity"``) or because
+        their time-to-live expired (``"expiry"``). ``None`` if evictions
+        are not tracked.
+    size: Optional[int]
+        The size of the cache when the statistics were last accessed, or
+        ``None`` if the size is not tracked.
+    peak_size: Optional[int]
+        The largest size the cache has reached, or ``None`` if the size
+        is not tracked.
+    miss_time: float
+        The total time in seconds spent computing missing values. Only
+        recorded by caching decorators created with ``timed=True``.
+    """
+
+    __slots__ = (
+        "name",
+        "hits",
+        "misses",
+        "evictions",
+        "size",
+        "peak_size",
+        "miss_time",
+        "sized",
+        "evicting",
+        "__weakref__",
+    )
+
+    def __init__(self, name=None, sized=True, evicting=True):
+        self.name = name
+        self.sized = sized
+        self.evicting = evicting
+        self.reset()
+
+    @property
+    def lookups(self):
+        """
+        int: The total number of lookups.
+        """
+        return self.hits + self.misses
+
+    @property
+    def hit_ratio(self):
+        """
+        float: The ratio of lookups that found an item, or ``0.0`` if no
+        lookups have been made yet.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def average_miss_time(self):
+        """
+        float: The average time in seconds spent computing a missing value.
+        """
+        return self.miss_time / self.misses if self.misses else 0.0
+
+    def record_eviction(self, reason, count=1):
+        """
+        Record evicted items.
+
+        Parameters
+        ----------
+        reason: str
+            The reason the items were evicted for.
+        count: Optional[int]
+            The number of evicted items. Defaults to ``1``.
+        """
+        self.evictions[reason] = self.evictions.get(reason, 0) + count
+
+    def reset(self):
+        """
+        Reset all counters.
+        """
+        self.hits = 0
+        self.misses = 0
+        self.evictions = {CAPACITY: 0, EXPIRY: 0} if self.evicting else None
+        self.size = 0 if self.sized else None
+        self.peak_size = 0 if self.sized else None
+        self.miss_time = 0.0
+
+    def to_dict(self):
+        """
+        Get the statistics as a dictionary.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The statistics, including the :attr:`hit_ratio`.
+        """
+        return dict(
+            name=self.name,
+            hits=self.hits,
+            misses=self.misses,
+            hit_ratio=self.hit_ratio,
+            evictions=None if self.evictions is None else dict(self.evictions),
+            size=self.size,
+            peak_size=self.peak_size,
+            miss_time=self.miss_time,
+        )
+
+    def __repr__(self):
+        return f"<CacheStats name={self.name!r} hits={self.hits} misses={self.misses}>"
@@ -0,0 +1,88 @@
+import weakref
+
+__all__ = ("invalidate_tag", "invalidate_tags")
+
+# Maps tags to the caches holding tagged items and the keys of those items,
+# so invalidating a tag only touches caches that actually hold the tag.
+_index = dict()  # str : WeakKeyDictionary[Cache, Set[Any]]
+
+
+def _link(cache, key, tags):
+    """
+    Add a tagged cache item to the index.
+    """
+    for tag in tags:
+        try:
+            caches = _index[tag]
+        except KeyError:
+            caches = _index[tag] = weakref.WeakKeyDictionary()
+
+        try:
+            caches[cache].add(key)
+        except KeyError:
+            caches[cache] = {key}
+
+
+def _unlink(cache, key, tags):
+    """
+    Remove a tagged cache item from the index.
+    """
+    for tag in tags:
+        caches = _index.get(tag)
+        if caches is None:
+            continue
+
+        keys = caches.get(cache)
+        if keys is None:
+            continue
+
+        keys.discard(key)
+        if not keys:
+            del caches[cache]
+            if not caches:
+                del _index[tag]
+
+
+def invalidate_tag(tag):
+    """
+    Remove all items with the given tag from all caches.
+
+    Items are tagged when they are added to a cache, for example with
+    ``cache.put(key, value, tags=["guild:123"])``.
+
+    Parameters
+    ----------
+    tag: str
+        The tag to invalidate.
+
+    Returns
+    -------
+    int
+        The number of removed items.
+    """
+    caches = _index.pop(tag, None)
+    if caches is None:
+        return 0
+
+    removed = 0
+    for cache, keys in list(caches.items()):
+        removed += cache.invalidate_many(list(keys))
+
+    return removed
+
+
+def invalidate_tags(tags):
+    """
+    Remove all items with any of the given tags from all caches.
+
+    Parameters
+    ----------
+    tags: Iterable[str]
+        The tags to invalidate.
+
+    Returns
+    -------
+    int
+        The number of removed items.
+    """
+    return sum(invalidate_tag(tag) for tag in tags)
@@ -0,0 +1,305 @@
+import collections
+
+from .cache import Cache
+from .stats import CAPACITY
+
+# Seeds used to derive the row indices of the frequency sketch.
+_SEEDS = (0x9E3779B1, 0x85EBCA77, 0xC2B2AE3D, 0x27D4EB2F)
+
+
+class FrequencySketch(object):
+    """
+    A count-min sketch that estimates how often keys have been seen.
+
+    Counters saturate at ``15`` and are halved once the number of recorded
+    accesses reaches ten times the capacity of the sketch, so that old
+    popularity fades over time.
+
+    Parameters
+    ----------
+    capacity: int
+        The number of keys the sketch should be able to tell apart.
+    """
+
+    __slots__ = ("_table", "_width", "_mask", "_additions", "_sample_size")
+
+    def __init__(self, capacity):
+        width = 16
+        while width < 4 * capacity:
+            width <<= 1
+
+        self._width = width
+        self._mask = width - 1
+        self._table = bytearray(width * len(_SEEDS))
+        self._additions = 0
+        self._sample_size = 10 * max(capacity, 1)
+
+    def _indices(self, key):
+        h = hash(key)
+        width = self._width
+        mask = self._mask
+        return [
+            row * width + ((((h ^ seed) * 0x2545F491) >> 16) & mask)
+            for row, seed in enumerate(_SEEDS)
+        ]
+
+    def frequency(self, key):
+        """
+        Estimate how often a key has been seen.
+
+        Parameters
+        ----------
+        key: Any
+            The key to estimate the frequency of.
+
+        Returns
+        -------
+        int
+            The estimated frequency, between ``0`` and ``15``.
+        """
+        table = self._table
+        return min(table[i] for i in self._indices(key))
+
+    def increment(self, key):
+        """
+        Record an access to a key.
+
+        Parameters
+        ----------
+        key: Any
+            The key that was accessed.
+        """
+        table = self._table
+        added = False
+        for i in self._indices(key):
+            if table[i] < 15:
+                table[i] += 1
+                added = True
+
+        if added:
+            self._additions += 1
+            if self._additions >= self._sample_size:
+                self._reset()
+
+    def _reset(self):
+        """
+        Halve all counters.
+        """
+        self._table = bytearray(c >> 1 for c in self._table)
+        self._additions //= 2
+
+
+class TinyLFUCache(Cache):
+    """
+    A Window TinyLFU cache implementation.
+
+    New items enter a small LRU window. Items leaving the window must
+    compete with the least recently used item of the main cache for
+    admission, and are only admitted if they have been requested more
+    often. Access frequencies are estimated with a compact count-min
+    sketch. This keeps bursts of one-off keys from flushing popular
+    items out of the cache, which a plain :class:`~.LRUCache` does not.
+
+    The main cache is a segmented LRU. Items are admitted into its
+    probationary segment and promoted into its protected segment when
+    they are accessed again.
+
+    When adding an item would exceed the cache's ``maxsize``, either the
+    item leaving the window or the least recently used item of the main
+    cache is evicted, depending on their estimated frequencies.
+
+    Inherits from :class:`~.Cache`.
+
+    Parameters
+    ----------
+    maxsize: int
+        The maximum size of the cache.
+    maxbytes: Optional[int]
+        An optional budget for the estimated size of all items in bytes.
+    sizeof: Optional[Callable[[Any, Any], int]]
+        An optional callable that estimates the size of an item in bytes.
+    name: Optional[str]
+        An optional name to register the cache under.
+    stats: Optional[bool]
+        Whether to collect statistics. Defaults to ``False``.
+    """
+
+    def __init__(self, maxsize, *, maxbytes=None, sizeof=None, name=None, stats=False):
+        super().__init__(
+            maxsize, maxbytes=maxbytes, sizeof=sizeof, name=name, stats=stats
+        )
+        self._sketch = FrequencySketch(maxsize)
+
+        self._window_size = max(1, maxsize // 100)
+        main_size = max(0, maxsize - self._window_size)
+        self._main_size = main_size
+        self._protected_size = int(main_size * 0.8)
+
+        self._window = collections.OrderedDict()
+        self._probation = collections.OrderedDict()
+        self._protected = collections.OrderedDict()
+
+    # Private methods.
+
+    def _touch(self, key):
+        """
+        Move an item to the most recently used position of its segment,
+        promoting it from the probationary into the protected segment.
+        """
+        if key in self._window:
+            self._window.move_to_end(key)
+        elif key in self._protected:
+            self._protected.move_to_end(key)
+        else:
+            del self._probation[key]
+            self._protected[key] = None
+
+            # Demote the least recently used protected item.
+            if len(self._protected) > self._protected_size:
+                demoted, _ = self._protected.popitem(last=False)
+                self._probation[demoted] = None
+
+    def _discard(self, key):
+        """
+        Remove a key from its segment.
+        """
+        for segment in (self._window, self._probation, self._protected):
+            if key in segment:
+                del segment[key]
+                return
+
+    def _victim(self):
+        """
+        Get the segment holding the next item to evict from the main cache.
+        """
+        if self._probation:
+            return self._probation
+        if self._protected:
+            return self._protected
+        return None
+
+    def _evict(self):
+        """
+        Evict the least recently used item of the main cache, or of
+        the window if the main cache is empty.
+        """
+        segment = self._victim() or self._window
+        key, _ = segment.popitem(last=False)
+        del self._data[key]
+        self._removed(key)
+
+        if self._stats is not None:
+            self._stats.record_eviction(CAPACITY)
+
+    def _admit(self):
+        """
+        Move the least recently used item out of the window and decide
+        whether it is admitted into the main cache.
+        """
+        candidate, _ = self._window.popitem(last=False)
+
+        if len(self._probation) + len(self._protected) < self._main_size:
+            self._probation[candidate] = None
+            return
+
+        segment = self._victim()
+        if segment is not None:
+            victim = next(iter(segment))
+            if self._sketch.frequency(candidate) > self._sketch.frequency(victim):
+                del segment[victim]
+                del self._data[victim]
+                self._removed(victim)
+                self._probation[candidate] = None
+            else:
+                del self._data[candidate]
+                self._removed(candidate)
+        else:
+            del self._data[candidate]
+            self._removed(candidate)
+
+        if self._stats is not None:
+            self._stats.record_eviction(CAPACITY)
+
+    # Public methods.
+
+    def get(self, key, fallback=None):
+        self._sketch.increment(key)
+        try:
+            value = self._data[key]
+        except KeyError:
+            if self._stats is not None:
+                self._stats.misses += 1
+            return fallback
+
+        self._touch(key)
+        if self._stats is not None:
+            self._stats.hits += 1
+        return value
+
+    def put(self, key, value, tags=None):
+        self._sketch.increment(key)
+
+        if key in self._data:
+            self._data[key] = value
+            self._touch(key)
+            self._added(key, value, tags)
+            return
+
+        self._data[key] = value
+        self._window[key] = None
+
+        if len(self._window) > self._window_size:
+            self._admit()
+
+        self._added(key, value, tags)
+
+    def get_many(self, keys):
+        data = self._data
+        sketch = self._sketch
+        found = dict()
+        missing = []
+
+        for key in keys:
+            sketch.increment(key)
+            try:
+                found[key] = data[key]
+            except KeyError:
+                missing.append(key)
+            else:
+                self._touch(key)
+
+        self._record_lookups(len(found), len(missing))
+        return found, missing
+
+    def clear(self):
+        super().clear()
+        self._window.clear()
+        self._probation.clear()
+        self._protected.clear()
+
+    def pop(self, key):
+        value = super().pop(key)
+        self._discard(key)
+        return value
+
+    def remove(self, key, fallback=None):
+        try:
+            return self.pop(key)
+        except KeyError:
+            return fallback
+
+    # Magic methods.
+
+    def __getitem__(self, key):
+        self._sketch.increment(key)
+        try:
+            value = self._data[key]
+        except KeyError:
+            if self._stats is not None:
+                self._stats.misses += 1
+            raise
+
+        self._touch(key)
+        if self._stats is not None:
+            self._stats.hits += 1
+        return value
@@ -1,5 +1,8 @@
 import time
+import collections
+
 from .lru import LRUCache
+from .stats import CAPACITY, EXPIRY
 
 
 class TTLCache(LRUCache):
@@ -14,6 +17,18 @@ class TTLCache(LRUCache):
     cache, and no expired items can be evicted, the least recently
     used item is removed instead.
 
+    Since all items share the same time-to-live, the cache keeps
+    track of insertion times in insertion order. Expiring items
+    therefore only touches items that are actually stale, making
+    lookups and insertions run in amortized constant time.
+
+    Items only expire when the cache is accessed. Use a
+    :class:`~utils.caching.CacheReaper` to periodically remove
+    expired items from caches that are rarely accessed.
+
+    Times are taken from a monotonic clock, so changes to the
+    system time do not affect expiry.
+
     Inherits from :class:`~.Cache`.
 
     Parameters
@@ -22,53 +37,155 @@ class TTLCache(LRUCache):
         The maximum size of the cache.
     ttl: float
         The time-to-live of cache items.
+    clock: Optional[Callable[[], float]]
+        A callable that returns the current time in seconds.
+        Defaults to :func:`time.monotonic`.
+    maxbytes: Optional[int]
+        An optional budget for the estimated size of all items in bytes.
+    sizeof: Optional[Callable[[Any, Any], int]]
+        An optional callable that estimates the size of an item in bytes.
+    name: Optional[str]
+        An optional name to register the cache under.
+    stats: Optional[bool]
+        Whether to collect statistics. Defaults to ``False``.
     """
 
-    def __init__(self, maxsize, ttl):
-        super().__init__(maxsize)
+    def __init__(
+        self, maxsize, ttl, *, clock=None, maxbytes=None, sizeof=None, name=None, stats=False
+    ):
+        super().__init__(maxsize, maxbytes=maxbytes, sizeof=sizeof, name=name, stats=stats)
         self._ttl = ttl
+        self._clock = clock or time.monotonic
+        self._times = collections.OrderedDict()
 
     @property
     def size(self):
         self._expire()
         return super().size
 
-    def _expire(self, now=None):
+    @property
+    def ttl(self):
+        """
+        float: The time-to-live of cache items.
+        """
+        return self._ttl
+
+    def _evict(self):
+        key, _ = self._data.popitem(last=False)
+        del self._times[key]
+        self._removed(key)
+
+        if self._stats is not None:
+            self._stats.record_eviction(CAPACITY)
+
+    def _expire(self, now=None, limit=None):
         """
         Remove expired items from the cache.
+
+        Items are stored in the order in which they were last added,
+        so iteration stops at the first item that has not expired.
         """
         if now is None:
-            now = time.time()
+            now = self._clock()
+
+        times = self._times
+        data = self._data
+        ttl = self._ttl
+        expired = 0
+
+        while times and (limit is None or expired < limit):
+            key, added = next(iter(times.items()))
+            if now - added <= ttl:
+                break
+
+            del times[key]
+            del data[key]
+            self._removed(key)
+            expired += 1
+
+        if expired and self._stats is not None:
+            self._stats.record_eviction(EXPIRY, expired)
+
+        return expired
+
+    def expire(self, limit=None):
+        """
+        Remove expired items from the cache.
 
-        items = list(self._data.items())
-        expired = [k for k, v in items if now - v[1] > self._ttl]
-        for k in expired:
-            self._data.pop(k, None)
+        Parameters
+        ----------
+        limit: Optional[int]
+            The maximum number of items to remove. Defaults to ``None``,
+            removing all expired items.
+
+        Returns
+        -------
+        int
+            The number of removed items.
+        """
+        return self._expire(limit=limit)
 
     def get(self, key, fallback=None):
         self._expire()
-        value, _ = super().get(key, fallback=(fallback, 0))
-        return value
+        return super().get(key, fallback)
+
+    def has(self, key):
+        self._expire()
+        return key in self._data
 
-    def put(self, key, value):
-        now = time.time()
+    def put(self, key, value, tags=None):
+        now = self._clock()
         self._expire(now)
 
         if key not in self._data and len(self._data) + 1 > self._maxsize:
             self._evict()
 
-        self._data[key] = (value, now)
+        self._data[key] = value
         self._data.move_to_end(key)
-    
+        self._times[key] = now
+        self._times.move_to_end(key)
+        self._added(key, value, tags)
+
+    def get_many(self, keys):
+        self._expire()
+        return super().get_many(keys)
+
+    def put_many(self, items, tags=None):
+        if hasattr(items, "items"):
+            items = items.items()
+
+        now = self._clock()
+        self._expire(now)
+
+        data = self._data
+        times = self._times
+        for key, value in items:
+            if key not in data and len(data) + 1 > self._maxsize:
+                self._evict()
+
+            data[key] = value
+            data.move_to_end(key)
+            times[key] = now
+            times.move_to_end(key)
+            self._added(key, value, tags)
+
+    def invalidate_many(self, keys):
+        self._expire()
+        return super().invalidate_many(keys)
+
+    def clear(self):
+        super().clear()
+        self._times.clear()
+
     def pop(self, key):
-        value, _ = super().pop(key)
+        value = super().pop(key)
+        del self._times[key]
         return value
 
     def remove(self, key, fallback=None):
-        value, _ = super().remove(key, fallback=(fallback, 0))
-        return value
+        self._times.pop(key, None)
+        return super().remove(key, fallback)
 
     def __getitem__(self, key):
         self._expire()
-        self._data.move_to_end(key)
-        return self._data[key][0]
+        return super().__getitem__(key)
@@ -49,3 +49,57 @@ class maybe_acquire(object):
     async def __aexit__(self, *args):
         if self.acquired:
             await self.pool.release(self.connection)
+
+
+def read_pool(pool, key=None):
+    """
+    Get the pool to run a read-only query on.
+
+    Routes the query to a read replica through :meth:`senko.Pool.read`.
+    Pools without replicas, or without support for them, are returned
+    as they are.
+
+    Examples
+    --------
+
+    .. code-block:: python3
+
+        pool = utils.db.read_pool(self.bot.db, guild.id)
+        async with utils.db.maybe_acquire(pool, connection) as conn:
+            row = await conn.fetchrow(query, guild.id)
+
+    Parameters
+    ----------
+    pool: asyncpg.pool.Pool
+        The database connection pool of the primary.
+    key: Optional[Hashable]
+        The key whose data is read, usually the ID of a guild.
+
+    Returns
+    -------
+    asyncpg.pool.Pool
+        The pool to read from.
+    """
+    read = getattr(pool, "read", None)
+    return pool if read is None else read(key)
+
+
+def pin_reads(pool, *keys):
+    r"""
+    Route reads of written keys to the primary for a while.
+
+    Should be called after data of the keys was written, so that reads
+    through :func:`read_pool` do not return data older than the write
+    while the replicas catch up, see :meth:`senko.Pool.pin`.
+
+    Parameters
+    ----------
+    pool: asyncpg.pool.Pool
+        The database connection pool of the primary.
+    \*keys: Hashable
+        The keys whose data was written, usually the IDs of guilds.
+    """
+    pin = getattr(pool, "pin", None)
+    if pin is not None:
+        for key in keys:
+            pin(key)